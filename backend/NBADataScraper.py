@@ -1,55 +1,47 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
 import re
 import os
 import time
 from datetime import datetime, timedelta
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from rate_limit import TokenBucket
+from http_client import get_default_client
+from game_store import GameStore
+from ingest import write_season_rows
+from teams import TEAM_INDEX
+from team_stats_scraper import fetch_all_team_stats
+from team_stats_store import TeamStatsStore
+
+# Parser for the 'fast' parse mode: lxml when it is installed, else the stdlib parser.
+try:
+    import lxml  # noqa: F401
+    FAST_PARSER = 'lxml'
+except ImportError:
+    FAST_PARSER = 'html.parser'
+
+BASE_URL = "https://www.basketball-reference.com"
 
 class NBADataScraper:
-    def __init__(self, base_url="https://www.basketball-reference.com"):
+    def __init__(self, base_url=BASE_URL, client=None, parse_mode='full', team_stats_store=None):
         self.base_url = base_url
-        self.team_data = {}  # Cache for team data
-        self.game_results = []  # Store game results
-        self.team_abbreviations = {}  # Team names to its abbreviations
-        self.load_team_abbreviations()
+        # 'full' parses whole pages; 'fast' only builds the schedule table
+        self.parse_mode = parse_mode
+        self.client = client or get_default_client()  # Shared pooled HTTP client
+        self.last_fetch_cached = False
+        self.team_stats_store = team_stats_store  # On-disk team stats, created on first use
+        self.game_results = GameStore()  # Store game results
     
-    def load_team_abbreviations(self):
-        """Load NBA team abbreviations for URLs"""
-        self.team_abbreviations = {
-            "Atlanta Hawks": "ATL",
-            "Boston Celtics": "BOS",
-            "Brooklyn Nets": "BRK",
-            "Charlotte Hornets": "CHO",
-            "Chicago Bulls": "CHI",
-            "Cleveland Cavaliers": "CLE",
-            "Dallas Mavericks": "DAL",
-            "Denver Nuggets": "DEN",
-            "Detroit Pistons": "DET",
-            "Golden State Warriors": "GSW",
-            "Houston Rockets": "HOU",
-            "Indiana Pacers": "IND",
-            "Los Angeles Clippers": "LAC",
-            "Los Angeles Lakers": "LAL",
-            "Memphis Grizzlies": "MEM",
-            "Miami Heat": "MIA",
-            "Milwaukee Bucks": "MIL",
-            "Minnesota Timberwolves": "MIN",
-            "New Orleans Pelicans": "NOP",
-            "New York Knicks": "NYK",
-            "Oklahoma City Thunder": "OKC",
-            "Orlando Magic": "ORL",
-            "Philadelphia 76ers": "PHI",
-            "Phoenix Suns": "PHO",
-            "Portland Trail Blazers": "POR",
-            "Sacramento Kings": "SAC",
-            "San Antonio Spurs": "SAS",
-            "Toronto Raptors": "TOR",
-            "Utah Jazz": "UTA",
-            "Washington Wizards": "WAS"
-        }
+    @property
+    def game_results(self):
+        return self._game_results
+
+    @game_results.setter
+    def game_results(self, games):
+        self._game_results = games if isinstance(games, GameStore) else GameStore.from_dicts(games)
 
     def clean_text(self, text):
         if not isinstance(text, str):
@@ -57,25 +49,47 @@ class NBADataScraper:
         return text.replace(',', '').replace('*', '').strip()
     
     def get_team_abbreviation(self, team_name):
+        """basketball-reference code for a team name, e.g. 'Brooklyn Nets' -> 'BRK'"""
         clean_name = team_name.strip()
-        if clean_name in self.team_abbreviations:
-            return self.team_abbreviations[clean_name]
-        for name, abbr in self.team_abbreviations.items():
+        team_id = TEAM_INDEX.id(clean_name)
+        if team_id is not None:
+            return TEAM_INDEX.bbref_code(team_id)
+        for team_id in range(len(TEAM_INDEX)):
+            name = TEAM_INDEX.display_name(team_id)
             if clean_name in name or name in clean_name:
-                return abbr
+                return TEAM_INDEX.bbref_code(team_id)
         print(f"Warning: No abbreviation found for team '{team_name}'")
         return None
 
-    def scrape_nba_month(self, url):
-        print(f"Scraping: {url}")
+    def fetch_page(self, url, limiter=None):
+        """Download a page and return its raw bytes, or None on failure."""
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            response = self.client.get(url, timeout=10, limiter=limiter)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching URL: {e}")
             return None
-        soup = BeautifulSoup(response.content, 'html.parser')
-        schedule_table = soup.find('table', {'id': 'schedule'})
+        # Served from the page cache: no need to be nice to the server afterwards
+        self.last_fetch_cached = getattr(response, 'from_cache', False)
+        return response.content
+
+    def scrape_nba_month(self, url, limiter=None):
+        print(f"Scraping: {url}")
+        content = self.fetch_page(url, limiter=limiter)
+        if content is None:
+            return None
+        return self.parse_month_page(content, url)
+
+    def parse_month_page(self, content, url):
+        """Parse a downloaded schedule page into a DataFrame and record its games."""
+        fast = self.parse_mode == 'fast'
+        schedule_table = None
+        if fast:
+            # Only build the schedule table; the rest of the page is thrown away anyway
+            strainer = SoupStrainer('table', id='schedule')
+            schedule_table = BeautifulSoup(content, FAST_PARSER, parse_only=strainer).find('table', id='schedule')
+        if not schedule_table:
+            soup = BeautifulSoup(content, 'html.parser')
+            schedule_table = soup.find('table', {'id': 'schedule'})
         if not schedule_table:
             tables = soup.find_all('table')
             for table in tables:
@@ -113,16 +127,10 @@ class NBADataScraper:
             if len(cells) < 3:
                 continue
 
-            row_data = []
-            for cell in cells:
-                if cell.find('a'):
-                    team_link = cell.find('a')
-                    if team_link.get('title'):
-                        row_data.append(team_link['title'])
-                    else:
-                        row_data.append(self.clean_text(cell.text))
-                else:
-                    row_data.append(self.clean_text(cell.text))
+            if fast:
+                row_data = self._row_values_fast(row, cells)
+            else:
+                row_data = self._row_values(cells)
 
             # Filter row data to exclude the columns being removed
             filtered_row_data = [data for i, data in enumerate(row_data) if i not in indices_to_remove]
@@ -137,6 +145,41 @@ class NBADataScraper:
             print("No data rows found in the table after filtering")
             return None
 
+        return self._finish_month_frame(rows, filtered_headers, url)
+
+    def _row_values(self, cells):
+        row_data = []
+        for cell in cells:
+            if cell.find('a'):
+                team_link = cell.find('a')
+                if team_link.get('title'):
+                    row_data.append(team_link['title'])
+                else:
+                    row_data.append(self.clean_text(cell.text))
+            else:
+                row_data.append(self.clean_text(cell.text))
+        return row_data
+
+    def _row_values_fast(self, row, cells):
+        """Same values as _row_values, with one link lookup per row instead of two per cell."""
+        first_link = {}
+        for link in row.find_all('a'):
+            parent = link.parent
+            while parent is not None and parent is not row:
+                if parent.name in ('td', 'th'):
+                    first_link.setdefault(id(parent), link)
+                parent = parent.parent
+
+        row_data = []
+        for cell in cells:
+            link = first_link.get(id(cell))
+            if link is not None and link.get('title'):
+                row_data.append(link['title'])
+            else:
+                row_data.append(self.clean_text(cell.get_text()))
+        return row_data
+
+    def _finish_month_frame(self, rows, filtered_headers, url):
         df = pd.DataFrame(rows, columns=filtered_headers)
 
         # Re-calculating visitor and home points based on the new header order that we want
@@ -163,29 +206,80 @@ class NBADataScraper:
             df['Month'] = month
             df['Season'] = f"{int(year)-1}-{year}"
 
-        for _, row in df.iterrows():
-            game_dict = row.to_dict()
+        self.add_month_frame(df)
+        return df
+
+    def add_month_frame(self, df):
+        """Record the games of a parsed month frame (also used to replay checkpointed months)."""
+        if 'Visitor_PTS' in df.columns:
+            self.game_results.add_frame(df)
+            return
+        for values in df.to_numpy(dtype=object):
+            game_dict = dict(zip(df.columns, values))
             # Ensure Visitor_PTS and Home_PTS exists in the data
-            if 'Visitor_PTS' not in game_dict and 'PTS' in game_dict:
+            if 'PTS' in game_dict:
                 game_dict['Visitor_PTS'] = self.parse_pts(game_dict['PTS'])
-            if 'Home_PTS' not in game_dict and 'PTS.1' in game_dict:
+            if 'PTS.1' in game_dict:
                 game_dict['Home_PTS'] = self.parse_pts(game_dict['PTS.1'])
-            self.game_results.append(game_dict)
-
-        return df
+            self.game_results.add(game_dict)
+
+    def month_url(self, season_year, month):
+        return f"{self.base_url}/leagues/NBA_{season_year}_games-{month}.html"
+
+    def fetch_pages_concurrently(self, urls, requests_per_second=1.0, max_in_flight=4, limiter=None):
+        """
+        Download pages on a thread pool, paced by a shared token bucket.
+
+        At most ``max_in_flight`` requests are open at once and no more than
+        ``requests_per_second`` are started per second, unless an existing
+        ``limiter`` is passed in. Results keep the order of ``urls``.
+        """
+        limiter = limiter or TokenBucket(requests_per_second)
+
+        def fetch(url):
+            print(f"Scraping: {url}")
+            return self.fetch_page(url, limiter=limiter)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as pool:
+            return list(pool.map(fetch, urls))
+
+    def iter_season_frames(self, season_year, months, concurrent=False,
+                           requests_per_second=1.0, max_in_flight=4, limiter=None):
+        """
+        Scrape a season's month pages, yielding (month, DataFrame) as each is parsed.
+
+        The default serial mode waits a second between pages. With ``concurrent``
+        pages are downloaded in parallel under a rate limit and then parsed in
+        month order, so ``game_results`` matches the serial mode. A ``limiter``
+        shared with other scrapers replaces both the wait and the per-season limit.
+        """
+        urls = [self.month_url(season_year, month) for month in months]
+
+        if concurrent:
+            pages = self.fetch_pages_concurrently(urls, requests_per_second, max_in_flight, limiter)
+        else:
+            pages = None
 
-    def scrape_full_season(self, season_year, months): # Scraps data for one full season
-        all_data = []
-        for month in months:
-            url = f"{self.base_url}/leagues/NBA_{season_year}_games-{month}.html"
-            month_data = self.scrape_nba_month(url)          
+        for i, (month, url) in enumerate(zip(months, urls)):
+            if pages is None:
+                month_data = self.scrape_nba_month(url, limiter=limiter)
+            else:
+                month_data = self.parse_month_page(pages[i], url) if pages[i] is not None else None
+                pages[i] = None  # Parsed: the raw page is no longer needed
             if month_data is not None and not month_data.empty:
-                all_data.append(month_data)
                 print(f"Successfully scraped {month} {season_year} data: {len(month_data)} rows")
+                yield month, month_data
             else:
                 print(f"Failed to scrape {month} {season_year} data")
             
-            time.sleep(1)
+            if pages is None and limiter is None and not self.last_fetch_cached:
+                time.sleep(1)
+
+    def scrape_full_season(self, season_year, months, concurrent=False,
+                           requests_per_second=1.0, max_in_flight=4): # Scraps data for one full season
+        """Scrape every month page of a season into one DataFrame (see iter_season_frames)."""
+        all_data = [frame for _, frame in self.iter_season_frames(season_year, months, concurrent,
+                                                                  requests_per_second, max_in_flight)]
         
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
@@ -194,58 +288,33 @@ class NBADataScraper:
             return None
 
     def get_team_season_stats(self, team_abbr, season):
-        # Check if we already have this team's data cached
-        cache_key = f"{team_abbr}_{season}"
-        if cache_key in self.team_data:
-            return self.team_data[cache_key]
-        
-        # Changing the season name formatting to 2023-24 instead of 2023-2024
-        season_short = season.replace("-20", "-")
-        
-        url = f"{self.base_url}/teams/{team_abbr}/{season_short}.html"
-        print(f"Fetching team stats: {url}")
-        
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching team stats: {e}")
+        """
+        Record and offensive/defensive ratings of one team-season.
+
+        The first lookup of a season fetches every team's page through
+        fetch_all_team_stats (rate limited, a few requests in flight) into the
+        on-disk TeamStatsStore; later lookups, in this run or the next, are
+        store reads.
+        """
+        if self.team_stats_store is None:
+            self.team_stats_store = TeamStatsStore()
+        stats = self.team_stats_store.get(season, team_abbr)
+        if stats is None:
+            stats = fetch_all_team_stats(season, client=self.client, store=self.team_stats_store,
+                                         base_url=self.base_url).get(team_abbr)
+        if stats is None:
+            print(f"Error fetching team stats: unknown team {team_abbr}")
             return None
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
+        if 'error' in stats:
+            print(f"Error fetching team stats: {stats['error']}")
+            return None
+
         team_stats = {}
-        
-        try:
-            record_div = soup.find('div', {'data-template': 'Partials/Teams/Summary'})
-            if record_div:
-                record_p = record_div.find('p')
-                if record_p:
-                    record_text = record_p.text
-                    record_match = re.search(r'Record:\s+(\d+-\d+)', record_text)
-                    if record_match:
-                        team_stats['record'] = record_match.group(1)
-            
-            advanced_div = soup.find('div', {'id': 'all_team_and_opponent'})
-            if advanced_div:
-                table = advanced_div.find('table')
-                if table:
-                    rows = table.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all(['th', 'td'])
-                        if len(cells) > 1:
-                            if cells[0].text.strip() == 'Team':
-                                team_stats['offensive_rating'] = cells[8].text.strip() if len(cells) > 8 else 'N/A'
-                            if cells[0].text.strip() == 'Opponent':
-                                team_stats['defensive_rating'] = cells[8].text.strip() if len(cells) > 8 else 'N/A'
-        except Exception as e:
-            print(f"Error parsing team stats: {e}")
-        
-        self.team_data[cache_key] = team_stats
-        
-        # Add a small delay to be nice to the server, recommended by peers
-        time.sleep(1)
-        
+        record_match = re.search(r'(\d+-\d+)', stats.get('team_info', {}).get('record', ''))
+        if record_match:
+            team_stats['record'] = record_match.group(1)
+        for key in ('offensive_rating', 'defensive_rating'):
+            team_stats[key] = stats.get(key, 'N/A')
         return team_stats
 
     def calculate_recent_performance(self, team_name, date, season, num_games=5):
@@ -255,40 +324,26 @@ class NBADataScraper:
         
         # Converting date to datetime object if it's not already
         if isinstance(date, str):
-            try:
-                # Trying different date formats
-                try:
-                    date = datetime.strptime(date, '%a %b %d %Y')
-                except ValueError:
-                    date = datetime.strptime(date, '%Y-%m-%d')
-            except ValueError:
+            parsed_date = self.game_results.parse_date(date)
+            if parsed_date is None:
                 print(f"Error parsing date: {date}")
                 return {'recent_wins': 0, 'recent_losses': 0, 'win_percentage': 0.0}
+            date = parsed_date
         
         recent_games = []
         
         for game in self.game_results:
-            game_date_str = game.get('Date', '')
             visitor_team = game.get('Visitor/Neutral', '')
             home_team = game.get('Home/Neutral', '')
             
             if team_name not in visitor_team and team_name not in home_team:
                 continue
                 
-            try:
-                # Try different date formats
-                try:
-                    game_date = datetime.strptime(game_date_str, '%a %b %d %Y')
-                except ValueError:
-                    game_date = datetime.strptime(game_date_str, '%Y-%m-%d')
-                    
-                if game_date < date:
-                    recent_games.append(game)
-            except ValueError:
-                continue
+            # Dates were parsed when the game was stored
+            if game.date is not None and game.date < date:
+                recent_games.append(game)
         
-        recent_games.sort(key=lambda g: datetime.strptime(g.get('Date', ''), '%a %b %d %Y') 
-                         if 'Date' in g and g['Date'] else datetime.now(), reverse=True)
+        recent_games.sort(key=lambda g: g.date, reverse=True)
         recent_games = recent_games[:num_games]
         
         wins, losses = 0, 0
@@ -319,6 +374,70 @@ class NBADataScraper:
             'win_percentage': round(win_percentage, 1)
         }
 
+    def recent_performance_table(self, num_games=5):
+        """
+        Recent form for both teams of every game in game_results, in one pass.
+
+        Gives the same answers as calling calculate_recent_performance for the
+        visitor and home team of each game, without rescanning game_results per
+        call: games are walked once in date order while each team keeps a deque
+        of its last ``num_games`` results. Games sharing a date only count from
+        the next date on. Returns a list aligned with game_results of
+        (visitor_recent, home_recent) dicts.
+        """
+        empty = {'recent_wins': 0, 'recent_losses': 0, 'win_percentage': 0.0}
+        known_teams = {}
+        dated_games = []
+        for index, game in enumerate(self.game_results):
+            if game.date is not None:
+                dated_games.append((game.date, index))
+
+        # Oldest date first; within a date the earliest listed game is appended
+        # last, matching the stable newest-first sort of calculate_recent_performance.
+        dated_games.sort(key=lambda item: (item[0], -item[1]))
+
+        results = [(empty, empty)] * len(self.game_results)
+        team_form = defaultdict(lambda: deque(maxlen=num_games))
+
+        def recent(team_name):
+            if team_name not in known_teams:
+                known_teams[team_name] = isinstance(team_name, str) and self.get_team_abbreviation(team_name) is not None
+            form = team_form.get(team_name) if known_teams[team_name] else None
+            if not form:
+                return empty
+            wins = sum(form)
+            return {
+                'recent_wins': wins,
+                'recent_losses': len(form) - wins,
+                'win_percentage': round((wins / len(form)) * 100, 1),
+            }
+
+        start = 0
+        while start < len(dated_games):
+            game_date = dated_games[start][0]
+            end = start
+            while end < len(dated_games) and dated_games[end][0] == game_date:
+                end += 1
+            same_day = dated_games[start:end]
+
+            for _, index in same_day:
+                game = self.game_results[index]
+                results[index] = (recent(game.get('Visitor/Neutral', '')), recent(game.get('Home/Neutral', '')))
+
+            for _, index in same_day:
+                game = self.game_results[index]
+                visitor_team = game.get('Visitor/Neutral', '')
+                home_team = game.get('Home/Neutral', '')
+                visitor_pts = self.parse_pts(game.get('PTS', 0))
+                home_pts = self.parse_pts(game.get('PTS.1', 0))
+                if isinstance(visitor_team, str) and visitor_team:
+                    team_form[visitor_team].append(1 if visitor_pts > home_pts else 0)
+                if isinstance(home_team, str) and home_team and home_team != visitor_team:
+                    team_form[home_team].append(1 if home_pts > visitor_pts else 0)
+            start = end
+
+        return results
+
     def calculate_head_to_head(self, team1, team2, season):
         h2h_games = []
     
@@ -365,6 +484,61 @@ class NBADataScraper:
             'total_games': team1_wins + team2_wins
         }
         
+    def head_to_head_table(self):
+        """
+        Season head-to-head counts for every game in game_results, in one pass.
+
+        Gives the same answers as calculate_head_to_head(visitor, home, season)
+        for each game: each (season, team pair) keeps per-team wins plus a count
+        of games without a winner (unplayed or level), which that lookup credits
+        to the home side. Returns a list aligned with game_results of dicts with
+        'home_wins', 'visitor_wins' and 'total_games'.
+        """
+        team_index = {}
+        pair_wins = defaultdict(lambda: [0, 0, 0])  # (season, id, id) -> [low id wins, high id wins, no winner]
+        game_keys = []
+
+        for game in self.game_results:
+            visitor_team = game.get('Visitor/Neutral', '')
+            home_team = game.get('Home/Neutral', '')
+            if not isinstance(visitor_team, str) or not isinstance(home_team, str) or not visitor_team or not home_team:
+                game_keys.append(None)
+                continue
+            visitor_id = team_index.setdefault(visitor_team, len(team_index))
+            home_id = team_index.setdefault(home_team, len(team_index))
+            key = (game.get('Season', ''), min(visitor_id, home_id), max(visitor_id, home_id))
+            game_keys.append((key, visitor_id < home_id))
+
+            if 'Visitor_PTS' in game and 'Home_PTS' in game:
+                visitor_pts = self.parse_pts(game.get('Visitor_PTS', 0))
+                home_pts = self.parse_pts(game.get('Home_PTS', 0))
+            else:
+                visitor_pts = self.parse_pts(game.get('PTS', 0))
+                home_pts = self.parse_pts(game.get('PTS.1', 0))
+
+            counts = pair_wins[key]
+            if visitor_pts == home_pts:
+                counts[2] += 1
+            elif (visitor_pts > home_pts) == (visitor_id < home_id):
+                counts[0] += 1
+            else:
+                counts[1] += 1
+
+        results = []
+        for game_key in game_keys:
+            if game_key is None:
+                results.append({'home_wins': 0, 'visitor_wins': 0, 'total_games': 0})
+                continue
+            key, visitor_is_low = game_key
+            low_wins, high_wins, no_winner = pair_wins[key]
+            visitor_wins, home_wins = (low_wins, high_wins) if visitor_is_low else (high_wins, low_wins)
+            results.append({
+                'home_wins': home_wins + no_winner,
+                'visitor_wins': visitor_wins,
+                'total_games': low_wins + high_wins + no_winner,
+            })
+        return results
+
     def parse_pts(self, pts_value):
         if pd.isna(pts_value) or pts_value == '':
             return 0
@@ -384,16 +558,19 @@ class NBADataScraper:
                 return 0
 
     def enhance_game_data(self):
-        enhanced_games = []
+        return pd.DataFrame(list(self._iter_enhanced_games()))
+
+    def _iter_enhanced_games(self):
+        recent_performance = self.recent_performance_table()
+        head_to_head = self.head_to_head_table()
     
-        for game in self.game_results:
+        for game, (visitor_recent, home_recent), h2h in zip(self.game_results, recent_performance, head_to_head):
             if not game.get('Visitor/Neutral') or not game.get('Home/Neutral') or not game.get('Date'):
                 continue
             
             visitor_team = game.get('Visitor/Neutral', '')
             home_team = game.get('Home/Neutral', '')
             date = game.get('Date', '')
-            season = game.get('Season', '')
         
             visitor_pts = 0
             home_pts = 0
@@ -423,11 +600,6 @@ class NBADataScraper:
                 print(f"Warning: Zero points detected for game {date}: {visitor_team} vs {home_team}")
                 print(f"Point-related fields in game data: {[k for k in game.keys() if 'PTS' in k or 'pts' in k.lower()]}")
         
-            visitor_recent = self.calculate_recent_performance(visitor_team, date, season)
-            home_recent = self.calculate_recent_performance(home_team, date, season)
-        
-            h2h = self.calculate_head_to_head(visitor_team, home_team, season)
-        
             enhanced_game = game.copy()
         
             enhanced_game['Visitor_PTS'] = visitor_pts
@@ -440,36 +612,32 @@ class NBADataScraper:
                 'Recent Wins (Visitor)': visitor_recent['recent_wins'],
                 'Recent Losses (Visitor)': visitor_recent['recent_losses'],
                 'Recent Win % (Visitor)': visitor_recent['win_percentage'],
-                'Matchup Wins (Home)': h2h[f"{home_team}_wins"],
-                'Matchup Wins (Visitor)': h2h[f"{visitor_team}_wins"],
+                'Matchup Wins (Home)': h2h['home_wins'],
+                'Matchup Wins (Visitor)': h2h['visitor_wins'],
                 'Total Matchups': h2h['total_games']
             })
         
-            enhanced_games.append(enhanced_game)
-    
-        return pd.DataFrame(enhanced_games)
+            yield enhanced_game
 
     def calculate_days_since_last_match(self, all_game_data):
+        return list(self._iter_days_since_last_match(all_game_data))
+
+    def _iter_days_since_last_match(self, all_game_data, copy=True):
         team_last_played = {}
-        enhanced_data_with_days = []
         for game in all_game_data:
             game_date_str = game.get('Date')
             visitor_team = game.get('Visitor/Neutral')
             home_team = game.get('Home/Neutral')
 
             if not game_date_str or not visitor_team or not home_team:
-                enhanced_data_with_days.append(game)
+                yield game
                 continue
 
-            try:
-                game_date = datetime.strptime(game_date_str, '%Y-%m-%d')
-            except ValueError:
-                try:
-                    game_date = datetime.strptime(game_date_str, '%a %b %d %Y')
-                except ValueError:
-                    print(f"Warning: Could not parse date: {game_date_str}")
-                    enhanced_data_with_days.append(game)
-                    continue
+            game_date = self.game_results.parse_date(game_date_str)
+            if game_date is None:
+                print(f"Warning: Could not parse date: {game_date_str}")
+                yield game
+                continue
 
             days_since_visitor_last = None
             if visitor_team in team_last_played:
@@ -481,19 +649,19 @@ class NBADataScraper:
                 time_difference = game_date - team_last_played[home_team]
                 days_since_home_last = time_difference.days
 
-            game_with_days = game.copy()
+            game_with_days = game.copy() if copy else game
             game_with_days['DSLG (Visitor)'] = days_since_visitor_last
             game_with_days['DSLG (Home)'] = days_since_home_last
-            enhanced_data_with_days.append(game_with_days)
+            yield game_with_days
 
             team_last_played[visitor_team] = game_date
             team_last_played[home_team] = game_date
 
-        return enhanced_data_with_days
-
     def calculate_team_record(self, all_game_data):
+        return list(self._iter_team_records(all_game_data))
+
+    def _iter_team_records(self, all_game_data, copy=True):
         team_records = {}
-        enhanced_data_with_records = []
 
         for game in all_game_data:
             game_date_str = game.get('Date')
@@ -503,30 +671,25 @@ class NBADataScraper:
             home_pts = game.get('Home_PTS')
 
             if not game_date_str or not visitor_team or not home_team or visitor_pts is None or home_pts is None:
-                enhanced_data_with_records.append(game)
+                yield game
                 continue
 
-            try:
-                game_date = datetime.strptime(game_date_str, '%Y-%m-%d')
-            except ValueError:
-                try:
-                    game_date = datetime.strptime(game_date_str, '%a %b %d %Y')
-                except ValueError:
-                    print(f"Warning: Could not parse date: {game_date_str}")
-                    enhanced_data_with_records.append(game)
-                    continue
+            game_date = self.game_results.parse_date(game_date_str)
+            if game_date is None:
+                print(f"Warning: Could not parse date: {game_date_str}")
+                yield game
+                continue
             
             # Create a dictionary for both home and visitor records
             # Key will be the abbreviated team name, value will be another dict
             visitor_record = team_records.get(visitor_team, {'wins':0, 'losses':0}).copy()
             home_record = team_records.get(home_team, {'wins':0, 'losses':0}).copy()
 
-            game_with_records = game.copy()
+            game_with_records = game.copy() if copy else game
             game_with_records['Wins (Home)'] = home_record['wins']
             game_with_records['Losses (Home)'] = home_record['losses']
             game_with_records['Wins (Visitor)'] = visitor_record['wins']
             game_with_records['Losses (Visitor)'] = visitor_record['losses']
-            enhanced_data_with_records.append(game_with_records)
 
             if visitor_pts > home_pts:
                 team_records.setdefault(visitor_team, {'wins':0, 'losses':0})['wins'] += 1
@@ -535,7 +698,23 @@ class NBADataScraper:
                 team_records.setdefault(visitor_team, {'wins':0, 'losses':0})['losses'] += 1
                 team_records.setdefault(home_team, {'wins':0, 'losses':0})['wins'] += 1
 
-        return enhanced_data_with_records
+            yield game_with_records
+
+    def iter_final_rows(self):
+        """
+        Yield finished season CSV rows one game at a time.
+
+        Chains the enhance_game_data, calculate_days_since_last_match and
+        calculate_team_record steps lazily, so no intermediate DataFrame or
+        list of the whole season is built and rows can be written as they come.
+        """
+        for row in self._iter_team_records(
+                self._iter_days_since_last_match(self._iter_enhanced_games(), copy=False), copy=False):
+            # DSLG is stored as a float column: a team's first game has none
+            for key in ('DSLG (Visitor)', 'DSLG (Home)'):
+                if row.get(key) is not None:
+                    row[key] = float(row[key])
+            yield row
     
     def enhance_playoff_data(self, playoff_games):
         """Add playoff-specific fields"""
@@ -556,47 +735,38 @@ class NBADataScraper:
         return pd.DataFrame(enhanced)
 
 def main():
-        scraper = NBADataScraper()
         seasons = ['2022', '2023', '2024'] # Add the seasons you want
         months = ["october", "november", "december", "january", "february", "march", "april"]
 
-        all_season_data = []
+        os.makedirs("data", exist_ok=True)
+        final_file = "data/nba_2021_2024_final_data.csv"
+        client = get_default_client()
+        total_rows = 0
 
         for season in seasons:
+            # A fresh scraper per season: game state never outlives its season
+            scraper = NBADataScraper(client=client)
             print(f"Starting to scrape NBA {int(season)-1}-{season} season data...")
-            basic_data = scraper.scrape_full_season(season, months)
+            games = sum(len(frame) for _, frame in scraper.iter_season_frames(season, months))
 
-            if basic_data is not None and not basic_data.empty:
+            if games:
                 print("Basic game data scraped successfully.")
-                print("Enhancing data with recent performance and head-to-head records...")
-                enhanced_df = scraper.enhance_game_data()
-
-                if not enhanced_df.empty:
-                    print("Calculating days since last match...")
-                    enhanced_data_with_days = scraper.calculate_days_since_last_match(enhanced_df.to_dict('records'))
-                    enhanced_df_with_days = pd.DataFrame(enhanced_data_with_days)
-
-                    final_df = pd.merge(enhanced_df, enhanced_df_with_days[['Date', 'Home/Neutral', 'Visitor/Neutral', 'DSLG (Home)', 'DSLG (Visitor)']],
-                                     on=['Date', 'Home/Neutral', 'Visitor/Neutral'], how='left')
-                    all_season_data.append(final_df) 
-
+                print("Enhancing data with recent performance, head-to-head records, rest days and team records...")
+                written = write_season_rows(final_file, scraper.iter_final_rows(), append=total_rows > 0)
+                if written:
+                    total_rows += written
+                    print(f"Wrote {written} games for {int(season)-1}-{season} to {final_file}")
                 else:
                     print(f"Failed to enhance game data for {int(season)-1}-{season} season.")
             else:
                 print(f"Failed to scrape basic game data for {int(season)-1}-{season} season.")
 
-        if all_season_data:
-            combined_df = pd.concat(all_season_data, ignore_index=True)
-            os.makedirs("data", exist_ok=True)
-            final_file = "data/nba_2021_2024_final_data.csv"
-            combined_df.to_csv(final_file, index=False)
-            print(f"Saved combined data for all seasons to {final_file}")
-
-            print("\nSample of combined data:")
-            display_cols = list(combined_df.columns)
-            print(combined_df[display_cols].head())
+        if total_rows:
+            print(f"Saved {total_rows} games for all seasons to {final_file}")
         else:
             print("No data was scraped for any season")
 
+        client.report()
+
 if __name__ == "__main__":
     main()
@@ -5,12 +5,18 @@ from model_utils import (
     get_team_stats, 
     get_matchup_stats, 
     load_model_and_data, 
-    TEAM_ABBREVIATIONS,
+    ingest_games,
+    enable_online_learning,
     predictor  # The GamePredictor instance
 )
+from ratings import get_season_ratings
+from teams import TEAM_INDEX
+from ingest import prepare_season_frame, season_csv_path, IngestWatcher
+from season_loader import read_season_csvs
 import pandas as pd
 import os
 import datetime
+import threading
 import traceback
 
 app = Flask(__name__)
@@ -36,72 +42,23 @@ CORS(app, resources={r"/api/*": {
     "supports_credentials": True
 }})
 
-TEAM_ABBREVIATION_MAP = {
-    # Eastern Conference
-    "ATL": "ATLANTA HAWKS",
-    "BOS": "BOSTON CELTICS",
-    "BKN": "BROOKLYN NETS",
-    "CHA": "CHARLOTTE HORNETS",
-    "CHI": "CHICAGO BULLS",
-    "CLE": "CLEVELAND CAVALIERS",
-    "DET": "DETROIT PISTONS",
-    "IND": "INDIANA PACERS",
-    "MIA": "MIAMI HEAT",
-    "MIL": "MILWAUKEE BUCKS",
-    "NYK": "NEW YORK KNICKS",
-    "ORL": "ORLANDO MAGIC",
-    "PHI": "PHILADELPHIA 76ERS",
-    "TOR": "TORONTO RAPTORS",
-    "WAS": "WASHINGTON WIZARDS",
-    # Western Conference
-    "DAL": "DALLAS MAVERICKS",
-    "DEN": "DENVER NUGGETS",
-    "GSW": "GOLDEN STATE WARRIORS",
-    "HOU": "HOUSTON ROCKETS",
-    "LAC": "LOS ANGELES CLIPPERS",
-    "LAL": "LOS ANGELES LAKERS",
-    "MEM": "MEMPHIS GRIZZLIES",
-    "MIN": "MINNESOTA TIMBERWOLVES",
-    "NOP": "NEW ORLEANS PELICANS",
-    "OKC": "OKLAHOMA CITY THUNDER",
-    "PHX": "PHOENIX SUNS",
-    "POR": "PORTLAND TRAIL BLAZERS",
-    "SAC": "SACRAMENTO KINGS",
-    "SAS": "SAN ANTONIO SPURS",
-    "UTA": "UTAH JAZZ"
-}
-
 # Dictionary to hold data for different seasons
 season_data = {}
 
+# Cached predictor outputs keyed by (season, home_abbr, away_abbr); entries for
+# a team are dropped whenever new results for it are ingested, and the whole
+# cache is dropped whenever the predictor reloads its model.
+prediction_cache = {}
+_prediction_cache_version = None
+_ingest_lock = threading.Lock()
+
 # Load data with proper column mapping and processing
 try:
-    # Map your actual column names to our expected names
-    column_mapping = {
-        'Home/Neutral': 'home_team',
-        'Visitor/Neutral': 'visitor_team',
-        'Home_PTS': 'home_pts',
-        'Visitor_PTS': 'visitor_pts',
-        'Wins (Home)': 'home_wins',
-        'Losses (Home)': 'home_losses',
-        'Wins (Visitor)': 'visitor_wins',
-        'Losses (Visitor)': 'visitor_losses'
-    }
-    
-    # Load each season's data with column renaming
-    for season in ["2021-2022", "2022-2023", "2023-2024", "2024-2025"]:
-        filename = os.path.join(BASE_DIR, 'data', f'nba_{season.replace("-", "_")}_final_data.csv')
-        df = pd.read_csv(filename)
-        
-        # Clean team names - remove any whitespace and convert to uppercase
-        df['Home/Neutral'] = df['Home/Neutral'].str.strip().str.upper()
-        df['Visitor/Neutral'] = df['Visitor/Neutral'].str.strip().str.upper()
-        
-        # Rename columns
-        df = df.rename(columns=column_mapping)
-        
-        # Add home_win column
-        df['home_win'] = (df['home_pts'] > df['visitor_pts']).astype(int)
+    # Load each season's data (read concurrently, compact dtypes) with column renaming
+    seasons = ["2021-2022", "2022-2023", "2023-2024", "2024-2025"]
+    frames = read_season_csvs([season_csv_path(os.path.join(BASE_DIR, 'data'), season) for season in seasons])
+    for season, frame in zip(seasons, frames):
+        df = prepare_season_frame(frame)
         
         season_data[season] = df
         
@@ -138,25 +95,31 @@ def predict_teams():
             return jsonify({
                 "error": "Missing required fields",
                 "details": "Both home_team and away_team are required",
-                "valid_teams": list(TEAM_ABBREVIATION_MAP.keys())
+                "valid_teams": list(TEAM_INDEX.nba_codes)
             }), 400
             
-        if home_team == away_team:
-            return jsonify({
-                "error": "Invalid team selection",
-                "details": "Home and away teams must be different"
-            }), 400
-            
-        if home_team not in TEAM_ABBREVIATION_MAP or away_team not in TEAM_ABBREVIATION_MAP:
+        home_id = TEAM_INDEX.id(home_team)
+        away_id = TEAM_INDEX.id(away_team)
+        if home_id is None or away_id is None:
             return jsonify({
                 "error": "Invalid team abbreviation",
-                "details": f"Valid abbreviations: {', '.join(TEAM_ABBREVIATION_MAP.keys())}",
+                "details": f"Valid abbreviations: {', '.join(TEAM_INDEX.nba_codes)}",
                 "received": {
                     "home_team": home_team,
                     "away_team": away_team
                 }
             }), 400
 
+        if home_id == away_id:
+            return jsonify({
+                "error": "Invalid team selection",
+                "details": "Home and away teams must be different"
+            }), 400
+
+        # Any accepted spelling (BRK, 'Brooklyn Nets', ...) is served under its NBA code
+        home_team = TEAM_INDEX.nba_code(home_id)
+        away_team = TEAM_INDEX.nba_code(away_id)
+
         # Debug logging
         print(f"\n🔍 Prediction request - {home_team} vs {away_team} | Season: {season}")
         
@@ -178,11 +141,16 @@ def predict_teams():
                 "sample_teams": list(season_data.get(season, {}).get('home_team', []).unique())[:5]
             }), 404
 
-        # Make prediction
+        # Make prediction (reused until new results arrive for either team)
+        cache_key = (season, home_team, away_team)
         try:
-            prediction_result = predictor.predict_game(home_stats, away_stats, matchup_stats)
-            if not prediction_result:
-                raise ValueError("Prediction returned empty result")
+            _sync_prediction_cache()
+            prediction_result = prediction_cache.get(cache_key)
+            if prediction_result is None:
+                prediction_result = predictor.predict_game(home_stats, away_stats, matchup_stats)
+                if not prediction_result:
+                    raise ValueError("Prediction returned empty result")
+                prediction_cache[cache_key] = prediction_result
         except Exception as pred_error:
             print(f"❌ Prediction failed: {str(pred_error)}")
             return jsonify({
@@ -191,8 +159,8 @@ def predict_teams():
             }), 500
 
         # Build response
-        home_team_name = TEAM_ABBREVIATION_MAP[home_team].title()
-        away_team_name = TEAM_ABBREVIATION_MAP[away_team].title()
+        home_team_name = TEAM_INDEX.name(home_id).title()
+        away_team_name = TEAM_INDEX.name(away_id).title()
         
         response = {
             "meta": {
@@ -253,6 +221,62 @@ def predict_teams():
         }), 500
 
 
+def _sync_prediction_cache():
+    """Forget every cached prediction made by a model the predictor has since replaced"""
+    global _prediction_cache_version
+    if _prediction_cache_version != predictor.version:
+        prediction_cache.clear()
+        _prediction_cache_version = predictor.version
+
+
+def apply_ingested_results(payloads):
+    """Ingest finished games and refresh every in-memory view that depends on them"""
+    with _ingest_lock:
+        summary = ingest_games(payloads)
+        frames = summary.pop('frames')
+        
+        for season, new_rows in frames.items():
+            existing = season_data.get(season)
+            season_data[season] = new_rows if existing is None else pd.concat([existing, new_rows], ignore_index=True)
+        
+        # A published online model reloads the predictor; otherwise drop cached
+        # predictions involving any team with a new result
+        _sync_prediction_cache()
+        for season, teams in summary['affected_teams'].items():
+            affected_abbrs = {TEAM_INDEX.nba_code(TEAM_INDEX.id(name)) for name in teams}
+            stale_keys = [key for key in prediction_cache
+                          if key[0] == season and (key[1] in affected_abbrs or key[2] in affected_abbrs)]
+            for key in stale_keys:
+                del prediction_cache[key]
+    
+    return summary
+
+@app.route('/api/ingest-results', methods=['POST'])
+def ingest_results_endpoint():
+    """Append finished game results to the live season store"""
+    try:
+        data = request.get_json(silent=True)
+        games = data.get('games') if isinstance(data, dict) else data
+        if not isinstance(games, list) or not games:
+            return jsonify({
+                "error": "Invalid request",
+                "details": "Provide a non-empty list of games, e.g. {\"games\": [...]}"
+            }), 400
+        
+        summary = apply_ingested_results(games)
+        print(f"📥 Ingested {summary['ingested']} games ({summary['duplicates']} duplicates, {len(summary['errors'])} rejected)")
+        status = 200 if summary['ingested'] or not summary['errors'] else 400
+        return jsonify(summary), status
+        
+    except Exception as e:
+        print(f"🔥 Critical error in /ingest-results: {str(e)}")
+        traceback.print_exc()
+        return jsonify({
+            "error": "Internal server error",
+            "details": str(e)
+        }), 500
+
+
 @app.route("/api/compare-teams", methods=["GET"])
 def compare_teams():
     team1_abbr = request.args.get("team1", "").strip().upper()
@@ -262,21 +286,23 @@ def compare_teams():
     if not team1_abbr or not team2_abbr:
         return jsonify({"error": "Both team1 and team2 must be specified."}), 400
 
-    # Convert abbreviations to full names if needed
-    team1 = TEAM_ABBREVIATION_MAP.get(team1_abbr, team1_abbr)
-    team2 = TEAM_ABBREVIATION_MAP.get(team2_abbr, team2_abbr)
+    # Abbreviations and full names both resolve to team ids
+    team1 = TEAM_INDEX.id(team1_abbr)
+    team2 = TEAM_INDEX.id(team2_abbr)
 
     data = season_data.get(season)
     if data is None:
         return jsonify({"error": f"Data for season {season} not available."}), 400
 
     # Debug: Print the team names being searched
-    print(f"Searching for teams: {team1} and {team2}")
+    print(f"Searching for teams: {team1_abbr} (id {team1}) and {team2_abbr} (id {team2})")
 
     # Get team stats 
     def get_team_stats_comparison(team):
-        home_games = data[data['home_team'] == team]
-        visitor_games = data[data['visitor_team'] == team]
+        if team is None:
+            return None
+        home_games = data[data['home_id'] == team]
+        visitor_games = data[data['visitor_id'] == team]
         
         if home_games.empty and visitor_games.empty:
             return None
@@ -321,15 +347,15 @@ def calculate_head_to_head(data, team1, team2):
     """Calculate head-to-head matchups between two teams"""
     # Filter games where these two teams played each other
     matchups = data[
-        ((data['home_team'] == team1) & (data['visitor_team'] == team2)) |
-        ((data['home_team'] == team2) & (data['visitor_team'] == team1))
+        ((data['home_id'] == team1) & (data['visitor_id'] == team2)) |
+        ((data['home_id'] == team2) & (data['visitor_id'] == team1))
     ]
     
     team1_wins = 0
     team2_wins = 0
     
     for _, row in matchups.iterrows():
-        if row['home_team'] == team1:
+        if row['home_id'] == team1:
             if row['home_win'] == 1:
                 team1_wins += 1
             else:
@@ -345,6 +371,55 @@ def calculate_head_to_head(data, team1, team2):
         team2: team2_wins
     }
 
+@app.route('/api/standings', methods=['GET'])
+def get_standings():
+    """Season standings with margin-of-victory (Massey) and SRS ratings"""
+    season = request.args.get("season", "2024-2025")
+    as_of = request.args.get("as_of")
+
+    data = season_data.get(season)
+    if data is None:
+        return jsonify({"error": f"Data for season {season} not available."}), 400
+
+    try:
+        as_of_date = pd.Timestamp(as_of) if as_of else None
+    except ValueError:
+        return jsonify({"error": f"Invalid as_of date: {as_of}"}), 400
+
+    games = data
+    if as_of_date is not None:
+        game_dates = pd.to_datetime(data['Date'], format='%a %b %d %Y', errors='coerce')
+        games = data[game_dates < as_of_date.normalize()]
+
+    massey = get_season_ratings(season, data, as_of=as_of_date, method='massey')
+    srs = get_season_ratings(season, data, as_of=as_of_date, method='srs')
+
+    standings = []
+    for team_id, name in enumerate(TEAM_INDEX.names):
+        abbr = TEAM_INDEX.nba_code(team_id)
+        home_games = games[games['home_id'] == team_id]
+        visitor_games = games[games['visitor_id'] == team_id]
+        wins = int(home_games['home_win'].sum() + (visitor_games['home_win'] == 0).sum())
+        losses = int(len(home_games) + len(visitor_games) - wins)
+        standings.append({
+            'abbreviation': abbr,
+            'name': name.title(),
+            'wins': wins,
+            'losses': losses,
+            'win_pct': round(wins / max(wins + losses, 1), 3),
+            'rating': round(massey['ratings'].get(name, 0.0), 2),
+            'srs': round(srs['ratings'].get(name, 0.0), 2),
+        })
+
+    standings.sort(key=lambda x: (x['win_pct'], x['rating']), reverse=True)
+    return jsonify({
+        'season': season,
+        'as_of': as_of_date.date().isoformat() if as_of_date is not None else None,
+        'home_advantage': round(massey['home_advantage'], 2),
+        'games': massey['games'],
+        'standings': standings,
+    })
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Enhanced health check endpoint"""
@@ -388,15 +463,11 @@ def health_check():
 def get_teams():
     """Get team list with additional metadata"""
     teams = []
-    for abbr, name in TEAM_ABBREVIATION_MAP.items():
+    for team_id, name in enumerate(TEAM_INDEX.names):
         teams.append({
-            'abbreviation': abbr,
+            'abbreviation': TEAM_INDEX.nba_code(team_id),
             'name': name.title(),
-            'conference': 'Eastern' if abbr in [
-                'ATL', 'BOS', 'BKN', 'CHA', 'CHI', 
-                'CLE', 'DET', 'IND', 'MIA', 'MIL',
-                'NYK', 'ORL', 'PHI', 'TOR', 'WAS'
-            ] else 'Western'
+            'conference': TEAM_INDEX.conferences[team_id]
         })
     return jsonify({'teams': sorted(teams, key=lambda x: x['name'])})
 
@@ -408,12 +479,13 @@ def debug_team(team_abbr, season):
         team_abbr = team_abbr.upper()
         
         # Check if team exists in abbreviation map
-        team_name = TEAM_ABBREVIATION_MAP.get(team_abbr)
-        if not team_name:
+        team_id = TEAM_INDEX.id(team_abbr)
+        if team_id is None:
             return jsonify({
                 "error": f"Team abbreviation {team_abbr} not found",
-                "available_teams": list(TEAM_ABBREVIATION_MAP.keys())
+                "available_teams": list(TEAM_INDEX.nba_codes)
             })
+        team_name = TEAM_INDEX.name(team_id)
         
         # Check if season data exists
         if season not in season_data:
@@ -425,8 +497,8 @@ def debug_team(team_abbr, season):
         df = season_data[season]
         
         # Check if team appears in data
-        home_games = df[df['home_team'] == team_name]
-        away_games = df[df['visitor_team'] == team_name]
+        home_games = df[df['home_id'] == team_id]
+        away_games = df[df['visitor_id'] == team_id]
         
         # Sample team names from data
         sample_home_teams = list(df['home_team'].unique()[:10])
@@ -460,6 +532,19 @@ def debug_team(team_abbr, season):
 print("🚀 Initializing The Bench Prophet...")
 initialize_app()
 
+# Optional online learning: ingested games update the online learner, and with
+# ONLINE_LEARNING=publish each recalibrated version is served
+ONLINE_LEARNING = os.environ.get("ONLINE_LEARNING")
+if ONLINE_LEARNING:
+    enable_online_learning(publish=ONLINE_LEARNING == "publish")
+
+# Optional file-drop ingestion: result files dropped into this directory are ingested
+INGEST_WATCH_DIR = os.environ.get("INGEST_WATCH_DIR")
+if INGEST_WATCH_DIR:
+    ingest_watcher = IngestWatcher(INGEST_WATCH_DIR, apply_ingested_results)
+    ingest_watcher.start()
+    print(f"👀 Watching {INGEST_WATCH_DIR} for new results")
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port, debug=True)
\ No newline at end of file
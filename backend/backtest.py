@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss
+from sklearn.preprocessing import StandardScaler
+
+from feature_store import FeatureStore, build_season_matrix
+from train_model import _calibrated_logit, _resolve_training_files, update_model_metadata
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_METADATA_PATH = os.path.join(BACKEND_DIR, 'model_metadata.json')
+DEFAULT_PARAMS = {'C': 0.1, 'class_weight': None, 'solver': 'lbfgs'}
+
+
+def season_feature_matrices(df, include_ratings=False, include_team_stats=False):
+    """
+    Per-season feature matrices for an in-memory frame with __season_key
+    (see feature_store.build_season_matrix). Backtests over the season CSVs
+    load these from the feature store instead.
+    """
+    return {
+        season: build_season_matrix(group, include_ratings, include_team_stats)
+        for season, group in df.groupby('__season_key')
+    }
+
+
+def walk_forward_folds(matrices, monthly=False, min_train_seasons=1):
+    """
+    Rolling-origin folds: train on seasons <= k, test on season k + 1.
+
+    With ``monthly`` each test season is split by month instead, and every
+    fold also trains on the test season's earlier months.
+    """
+    seasons = sorted(matrices)
+    folds = []
+    for k in range(min_train_seasons, len(seasons)):
+        train_seasons, test_season = seasons[:k], seasons[k]
+        if not monthly:
+            folds.append({'train': [(s, None) for s in train_seasons], 'test': (test_season, None)})
+            continue
+        month_order = matrices[test_season]['month_order']
+        for i, month in enumerate(month_order):
+            folds.append({
+                'train': [(s, None) for s in train_seasons] + [(test_season, m) for m in month_order[:i]],
+                'test': (test_season, month),
+            })
+    return folds
+
+
+def _rows(matrices, season, month):
+    entry = matrices[season]
+    if month is None:
+        return entry['X'].to_numpy(dtype=float), entry['y']
+    mask = entry['months'] == month
+    return entry['X'].to_numpy(dtype=float)[mask], entry['y'][mask]
+
+
+def run_fold(fold, matrices, params):
+    """Fit scaler and calibrated model on a fold's training rows and score its test rows."""
+    start = time.perf_counter()
+    parts = [_rows(matrices, season, month) for season, month in fold['train']]
+    X_train = np.concatenate([X for X, _ in parts])
+    y_train = np.concatenate([y for _, y in parts])
+    X_test, y_test = _rows(matrices, *fold['test'])
+
+    scaler = StandardScaler()
+    model = _calibrated_logit(params)
+    model.fit(scaler.fit_transform(X_train), y_train)
+    prob = model.predict_proba(scaler.transform(X_test))[:, 1]
+
+    test_season, test_month = fold['test']
+    return {
+        'train_seasons': sorted({season for season, _ in fold['train']}),
+        'test_season': test_season,
+        'test_month': test_month,
+        'train_games': int(len(y_train)),
+        'test_games': int(len(y_test)),
+        'accuracy': float(round(accuracy_score(y_test, (prob >= 0.5).astype(int)), 6)),
+        'log_loss': float(round(log_loss(y_test, prob, labels=[0, 1]), 6)),
+        'brier_score': float(round(brier_score_loss(y_test, prob), 6)),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def _load_params(metadata_path):
+    """
+    The logistic baseline's best_params, or DEFAULT_PARAMS when there are none (e.g. chunked training).
+
+    When a family search served another model family, these still describe
+    the logistic baseline, so a warning says the refit differs from what is served.
+    """
+    if os.path.exists(metadata_path):
+        try:
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            metadata = {}
+        family = metadata.get('model_family', 'logistic')
+        params = metadata.get('best_params')
+        if isinstance(params, dict) and 'C' in params:
+            if family != 'logistic':
+                print(f"⚠️ The served model is {family}; refitting the logistic baseline's params {params}")
+            return params
+    return DEFAULT_PARAMS
+
+
+def run_backtest(df=None, params=None, monthly=False, n_jobs=-1, include_ratings=False,
+                 include_team_stats=False, matrices=None, metadata_path=DEFAULT_METADATA_PATH):
+    """
+    Walk-forward backtest over every season, folds running in parallel.
+
+    Season feature matrices come from ``df`` if given, else from the feature
+    store (or are passed in as ``matrices``), and are shared by all folds.
+    ``params`` default to the trained model's best_params from
+    model_metadata.json.
+
+    Returns:
+        dict: params, per-fold metrics and a game-weighted summary.
+    """
+    params = params or _load_params(metadata_path)
+    if matrices is None and df is not None:
+        matrices = season_feature_matrices(df, include_ratings, include_team_stats)
+    elif matrices is None:
+        matrices = FeatureStore().load(_resolve_training_files(BACKEND_DIR), include_ratings=include_ratings,
+                                       include_team_stats=include_team_stats)
+
+    folds = walk_forward_folds(matrices, monthly=monthly)
+    if not folds:
+        raise ValueError("Backtesting needs at least two seasons")
+
+    results = Parallel(n_jobs=n_jobs)(delayed(run_fold)(fold, matrices, params) for fold in folds)
+
+    weights = np.array([r['test_games'] for r in results], dtype=float)
+    summary = {'folds': len(results), 'test_games': int(weights.sum())}
+    for metric in ('accuracy', 'log_loss', 'brier_score'):
+        summary[metric] = float(round(np.average([r[metric] for r in results], weights=weights), 6))
+
+    return {
+        'created_at': datetime.now().isoformat(),
+        'monthly': monthly,
+        'params': params,
+        'folds': results,
+        'summary': summary,
+    }
+
+
+def write_backtest_metadata(backtest, metadata_path=DEFAULT_METADATA_PATH):
+    """Store backtest results under the 'backtest' key, keeping the rest of model_metadata.json."""
+    update_model_metadata({'backtest': backtest}, metadata_path)
+
+
+def print_report(backtest):
+    print(f"\n📈 Walk-forward backtest ({'monthly' if backtest['monthly'] else 'per season'}), params {backtest['params']}")
+    print(f"{'train':<24}{'test':<22}{'games':>7}{'accuracy':>10}{'log loss':>10}{'brier':>8}")
+    for fold in backtest['folds']:
+        train = f"{fold['train_seasons'][0]}..{fold['train_seasons'][-1]}"
+        test = fold['test_season'] + (f" {fold['test_month']}" if fold['test_month'] else '')
+        print(f"{train:<24}{test:<22}{fold['test_games']:>7}{fold['accuracy']:>10.3f}"
+              f"{fold['log_loss']:>10.3f}{fold['brier_score']:>8.3f}")
+    summary = backtest['summary']
+    print(f"{'all folds (game-weighted)':<46}{summary['test_games']:>7}{summary['accuracy']:>10.3f}"
+          f"{summary['log_loss']:>10.3f}{summary['brier_score']:>8.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the game prediction model")
+    parser.add_argument('--monthly', action='store_true',
+                        help="Step through each test season month by month")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Folds run in parallel (-1: all cores)")
+    parser.add_argument('--with-ratings', action='store_true', help="Include pre-game Massey ratings")
+    parser.add_argument('--with-team-stats', action='store_true',
+                        help="Include previous-season offensive/defensive ratings from the stats store")
+    parser.add_argument('--no-write', action='store_true', help="Don't record results in model_metadata.json")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = run_backtest(monthly=args.monthly, n_jobs=args.n_jobs, include_ratings=args.with_ratings,
+                          include_team_stats=args.with_team_stats)
+    print_report(result)
+    print(f"\n⏱️ {result['summary']['folds']} folds in {time.perf_counter() - start:.1f}s")
+    if not args.no_write:
+        write_backtest_metadata(result)
+        print("💾 Results written to model_metadata.json under 'backtest'")
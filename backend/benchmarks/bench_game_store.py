@@ -0,0 +1,96 @@
+"""
+Benchmark the typed game store against the old list of per-row dicts.
+
+Reports ingestion time and retained memory for the scraped games, and the
+time of the enrichment steps (recent form, DSLG, team records) with dates
+parsed once vs. re-parsed in every step.
+
+Usage: python benchmarks/bench_game_store.py [--seasons 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from NBADataScraper import NBADataScraper  # noqa: E402
+from game_store import GameStore, parse_game_date  # noqa: E402
+from benchmarks.fixture_pages import scraped_month_frames  # noqa: E402
+
+SEASONS = [2021, 2022, 2023, 2024, 2025]
+
+
+def _measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, retained
+
+
+def _ingest_dicts(frames):
+    games = []
+    for df in frames:
+        for _, row in df.iterrows():
+            games.append(row.to_dict())
+    return games
+
+
+def _ingest_store(frames):
+    store = GameStore()
+    for df in frames:
+        store.add_frame(df)
+    return store
+
+
+def _enrich(scraper):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        enhanced_df = scraper.enhance_game_data()
+        with_days = scraper.calculate_days_since_last_match(enhanced_df.to_dict('records'))
+        final = scraper.calculate_team_record(with_days)
+    return final, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seasons', type=int, default=5)
+    args = parser.parse_args()
+
+    frames = scraped_month_frames(SEASONS[:args.seasons])
+    dicts, dict_time, dict_bytes = _measure(lambda: _ingest_dicts(frames))
+    store, store_time, store_bytes = _measure(lambda: _ingest_store(frames))
+    assert store == dicts, "game store rows differ from the row dicts"
+
+    print(f"{len(store)} games from {len(frames)} month frames")
+    print(f"ingest  dict rows:  {dict_time * 1000:8.1f} ms  {dict_bytes / 1024:8.0f} KB retained")
+    print(f"ingest  game store: {store_time * 1000:8.1f} ms  {store_bytes / 1024:8.0f} KB retained "
+          f"(x{dict_time / store_time:.1f} faster, {100 * (1 - store_bytes / dict_bytes):.0f}% less memory)")
+
+    scraper = NBADataScraper()
+    scraper.game_results = store
+    parsed_once, parsed_once_time = _enrich(scraper)
+
+    # Same steps with every lookup re-parsing its date string, as before the store
+    original_parse_date = GameStore.parse_date
+    GameStore.parse_date = lambda self, value: parse_game_date(value)
+    try:
+        reparsed, reparsed_time = _enrich(scraper)
+    finally:
+        GameStore.parse_date = original_parse_date
+    assert parsed_once == reparsed
+
+    print(f"enrich  re-parsing dates: {reparsed_time * 1000:8.1f} ms")
+    print(f"enrich  dates parsed once: {parsed_once_time * 1000:7.1f} ms (x{reparsed_time / parsed_once_time:.1f})")
+
+
+if __name__ == "__main__":
+    main()
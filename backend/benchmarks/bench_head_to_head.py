@@ -0,0 +1,62 @@
+"""
+Benchmark head-to-head enrichment: per-game season scans vs. per-pair counters.
+
+Checks that both produce identical Matchup Wins (Home/Visitor) and Total
+Matchups and compares them with the columns stored in the season CSVs.
+
+Usage: python benchmarks/bench_head_to_head.py [--seasons 1 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import pandas as pd  # noqa: E402
+
+from NBADataScraper import NBADataScraper  # noqa: E402
+from benchmarks.fixture_pages import scraped_game_results, season_csv  # noqa: E402
+
+SEASONS = [2021, 2022, 2023, 2024, 2025]
+MATCHUP_COLUMNS = ['Matchup Wins (Home)', 'Matchup Wins (Visitor)', 'Total Matchups']
+
+
+def run(season_count):
+    scraper = NBADataScraper()
+    scraper.game_results = scraped_game_results(SEASONS[:season_count])
+
+    start = time.perf_counter()
+    legacy = []
+    for game in scraper.game_results:
+        visitor, home = game['Visitor/Neutral'], game['Home/Neutral']
+        h2h = scraper.calculate_head_to_head(visitor, home, game['Season'])
+        legacy.append((h2h[f"{home}_wins"], h2h[f"{visitor}_wins"], h2h['total_games']))
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = [(h['home_wins'], h['visitor_wins'], h['total_games']) for h in scraper.head_to_head_table()]
+    table_time = time.perf_counter() - start
+
+    assert legacy == table, "pair counters differ from per-game season scans"
+
+    stored = pd.concat([pd.read_csv(season_csv(year)) for year in SEASONS[:season_count]], ignore_index=True)
+    matches_csv = [tuple(row) for row in stored[MATCHUP_COLUMNS].itertuples(index=False)] == table
+
+    print(f"{season_count} season(s), {len(table):5d} games: per-game scans {legacy_time:7.2f}s, "
+          f"pair counters {table_time * 1000:7.1f} ms (x{legacy_time / table_time:,.0f}), "
+          f"identical; matches stored CSV columns: {matches_csv}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seasons', type=int, nargs='+', default=[1, 5])
+    args = parser.parse_args()
+    for season_count in args.seasons:
+        run(season_count)
+
+
+if __name__ == "__main__":
+    main()
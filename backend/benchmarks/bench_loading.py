@@ -0,0 +1,93 @@
+"""
+Compare the default season CSV load with the typed, column-pruned, parallel loader.
+
+The default load is what train_model used to do: pd.read_csv on every
+season file (all columns, inferred dtypes) one after another, then concat.
+To look at 20+ seasons, the real season CSVs are copied round-robin into a
+temporary data directory under consecutive season names. Reports wall time,
+peak traced memory and the loaded frame's size, and checks both loads build
+the same training features.
+
+Usage: python benchmarks/bench_loading.py [--seasons 25] [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from season_loader import TRAINING_COLUMNS, load_seasons  # noqa: E402
+from train_model import _extract_season_from_path, build_training_dataset  # noqa: E402
+
+
+def default_load(paths):
+    frames = []
+    for path in paths:
+        frame = pd.read_csv(path)
+        frame['__season_key'] = _extract_season_from_path(path)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def typed_load(paths):
+    return load_seasons(paths, [_extract_season_from_path(path) for path in paths], TRAINING_COLUMNS)
+
+
+def measure(loader, paths, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = loader(paths)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    loader(paths)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return df, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, default=25)
+    parser.add_argument('--repeat', type=int, default=3, help="best-of-N timing")
+    args = parser.parse_args()
+
+    sources = sorted(glob.glob(os.path.join(BACKEND_DIR, 'data', 'nba_*_final_data.csv')))
+    with tempfile.TemporaryDirectory() as data_dir:
+        paths = []
+        for i in range(args.seasons):
+            start_year = 2025 - args.seasons + i
+            path = os.path.join(data_dir, f"nba_{start_year}_{start_year + 1}_final_data.csv")
+            shutil.copyfile(sources[i % len(sources)], path)
+            paths.append(path)
+
+        default_df, default_time, default_peak = measure(default_load, paths, args.repeat)
+        typed_df, typed_time, typed_peak = measure(typed_load, paths, args.repeat)
+
+    X_default, y_default = build_training_dataset(default_df)
+    X_typed, y_typed = build_training_dataset(typed_df)
+
+    print(f"{args.seasons} seasons, {len(typed_df)} rows, best of {args.repeat}")
+    print(f"{'loader':<10}{'wall s':>9}{'peak MiB':>10}{'frame MiB':>11}{'columns':>9}")
+    for name, df, wall, peak in (('default', default_df, default_time, default_peak),
+                                 ('typed', typed_df, typed_time, typed_peak)):
+        size = df.memory_usage(deep=True).sum()
+        print(f"{name:<10}{wall:9.3f}{peak / 2**20:10.1f}{size / 2**20:11.1f}{df.shape[1]:>9}")
+    print(f"speedup {default_time / typed_time:.2f}x, frame {default_df.memory_usage(deep=True).sum() / typed_df.memory_usage(deep=True).sum():.1f}x smaller")
+
+    assert np.array_equal(X_default.to_numpy(dtype=float), X_typed.to_numpy(dtype=float)), "features differ"
+    assert (y_default == y_typed).all(), "labels differ"
+
+
+if __name__ == "__main__":
+    main()
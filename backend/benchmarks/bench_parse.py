@@ -0,0 +1,78 @@
+"""
+Benchmark schedule page parsing: full-page html.parser vs. the fast parse mode.
+
+Usage: python benchmarks/bench_parse.py [--season 2024] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import NBADataScraper as scraper_module  # noqa: E402
+from NBADataScraper import NBADataScraper  # noqa: E402
+from benchmarks.fixture_pages import render_season_schedule  # noqa: E402
+
+
+def _parse_all(pages, season_end_year, parse_mode, parser=None):
+    scraper = NBADataScraper(parse_mode=parse_mode)
+    previous_parser = scraper_module.FAST_PARSER
+    if parser:
+        scraper_module.FAST_PARSER = parser
+    try:
+        frames = []
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for month, html in pages.items():
+                url = f"{scraper.base_url}/leagues/NBA_{season_end_year}_games-{month}.html"
+                frames.append(scraper.parse_month_page(html.encode(), url))
+        elapsed = time.perf_counter() - start
+    finally:
+        scraper_module.FAST_PARSER = previous_parser
+    return frames, scraper.game_results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--season', type=int, default=2024, help="Season end year to render pages for")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = render_season_schedule(args.season)
+    total_kb = sum(len(html) for html in pages.values()) / 1024
+    print(f"Fixture: {len(pages)} schedule pages, {total_kb:.0f} KB")
+
+    modes = [('full (html.parser)', 'full', None), ('fast (html.parser)', 'fast', 'html.parser')]
+    try:
+        import lxml  # noqa: F401
+        modes.append(('fast (lxml)', 'fast', 'lxml'))
+    except ImportError:
+        print("lxml not installed: skipping the lxml fast mode")
+
+    baseline = None
+    for label, parse_mode, fast_parser in modes:
+        best = None
+        for _ in range(args.repeat):
+            frames, games, elapsed = _parse_all(pages, args.season, parse_mode, fast_parser)
+            best = elapsed if best is None else min(best, elapsed)
+
+        if baseline is None:
+            baseline = (frames, games, best)
+        else:
+            for expected, actual in zip(baseline[0], frames):
+                pd.testing.assert_frame_equal(expected, actual)
+            assert games == baseline[1], f"{label}: game_results differ from the full parser"
+
+        print(f"{label:<20} {len(pages) / best:8.1f} pages/s  {best * 1000:8.1f} ms  "
+              f"x{baseline[2] / best:.1f}  outputs identical")
+
+
+if __name__ == "__main__":
+    main()
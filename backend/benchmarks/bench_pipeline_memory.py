@@ -0,0 +1,88 @@
+"""
+Compare peak memory of the batch pipeline with the streaming one.
+
+The batch pipeline is what NBADataScraper.main used to do: one scraper for
+every season, each season enhanced into DataFrames and all seasons combined
+before writing. The streaming pipeline uses a scraper per season and writes
+rows as they are produced. Both outputs are checked to hold the same games.
+
+Usage: python benchmarks/bench_pipeline_memory.py [--seasons 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import pandas as pd  # noqa: E402
+
+from NBADataScraper import NBADataScraper  # noqa: E402
+from ingest import write_season_rows  # noqa: E402
+from benchmarks.fixture_pages import scraped_month_frames  # noqa: E402
+
+SEASONS = [2021, 2022, 2023, 2024, 2025]
+
+
+def batch(season_end_years, path):
+    scraper = NBADataScraper()
+    all_season_data = []
+    for year in season_end_years:
+        for frame in scraped_month_frames([year]):
+            scraper.game_results.add_frame(frame)
+        enhanced_df = scraper.enhance_game_data()
+        with_days = scraper.calculate_days_since_last_match(enhanced_df.to_dict('records'))
+        all_season_data.append(pd.DataFrame(scraper.calculate_team_record(with_days)))
+    pd.concat(all_season_data, ignore_index=True).to_csv(path, index=False)
+
+
+def streaming(season_end_years, path):
+    total = 0
+    for year in season_end_years:
+        scraper = NBADataScraper()
+        for frame in scraped_month_frames([year]):
+            scraper.game_results.add_frame(frame)
+        total += write_season_rows(path, scraper.iter_final_rows(), append=total > 0)
+
+
+def measure(pipeline, season_end_years, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline(season_end_years, path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seasons', type=int, default=5)
+    args = parser.parse_args()
+    years = SEASONS[:args.seasons]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batch_path, stream_path = os.path.join(tmp, 'batch.csv'), os.path.join(tmp, 'stream.csv')
+        batch_time, batch_peak = measure(batch, years, batch_path)
+        stream_time, stream_peak = measure(streaming, years, stream_path)
+
+        batch_df, stream_df = pd.read_csv(batch_path), pd.read_csv(stream_path)
+        keys = ['Date', 'Visitor/Neutral', 'Home/Neutral', 'Visitor_PTS', 'Home_PTS']
+        # The batch pipeline re-emits earlier seasons every time it enhances the grown game list
+        batch_games = batch_df[keys].drop_duplicates(ignore_index=True)
+        assert batch_games.equals(stream_df[keys]), "pipelines wrote different games"
+
+    print(f"{len(stream_df)} games over {len(years)} seasons (batch output: {len(batch_df)} rows with repeats)")
+    print(f"batch (all seasons in memory): {batch_time:6.2f}s  peak {batch_peak / 2**20:7.1f} MiB")
+    print(f"streaming (per season):        {stream_time:6.2f}s  peak {stream_peak / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
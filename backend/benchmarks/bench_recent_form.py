@@ -0,0 +1,72 @@
+"""
+Benchmark recent-form enrichment: per-game rescans vs. the single date-ordered pass.
+
+Checks that both produce identical Recent Wins/Losses/Win % and compares them
+with the columns stored in the season CSVs.
+
+Usage: python benchmarks/bench_recent_form.py [--seasons 1 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import pandas as pd  # noqa: E402
+
+from NBADataScraper import NBADataScraper  # noqa: E402
+from benchmarks.fixture_pages import scraped_game_results, season_csv  # noqa: E402
+
+SEASONS = [2021, 2022, 2023, 2024, 2025]
+RECENT_COLUMNS = ['Recent Wins (Visitor)', 'Recent Losses (Visitor)', 'Recent Win % (Visitor)',
+                  'Recent Wins (Home)', 'Recent Losses (Home)', 'Recent Win % (Home)']
+
+
+def _rows(pairs):
+    return [
+        (v['recent_wins'], v['recent_losses'], v['win_percentage'],
+         h['recent_wins'], h['recent_losses'], h['win_percentage'])
+        for v, h in pairs
+    ]
+
+
+def run(season_count):
+    scraper = NBADataScraper()
+    scraper.game_results = scraped_game_results(SEASONS[:season_count])
+
+    start = time.perf_counter()
+    legacy = [
+        (scraper.calculate_recent_performance(g['Visitor/Neutral'], g['Date'], g['Season']),
+         scraper.calculate_recent_performance(g['Home/Neutral'], g['Date'], g['Season']))
+        for g in scraper.game_results
+    ]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = scraper.recent_performance_table()
+    table_time = time.perf_counter() - start
+
+    assert _rows(legacy) == _rows(table), "single-pass recent form differs from per-game scans"
+
+    stored = pd.concat([pd.read_csv(season_csv(year)) for year in SEASONS[:season_count]], ignore_index=True)
+    stored_rows = [tuple(row) for row in stored[RECENT_COLUMNS].itertuples(index=False)]
+    matches_csv = stored_rows == _rows(table)
+
+    print(f"{season_count} season(s), {len(table):5d} games: per-game scans {legacy_time:7.2f}s, "
+          f"single pass {table_time * 1000:7.1f} ms (x{legacy_time / table_time:,.0f}), "
+          f"identical; matches stored CSV columns: {matches_csv}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seasons', type=int, nargs='+', default=[1, 5])
+    args = parser.parse_args()
+    for season_count in args.seasons:
+        run(season_count)
+
+
+if __name__ == "__main__":
+    main()
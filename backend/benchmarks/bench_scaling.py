@@ -0,0 +1,104 @@
+"""
+Measure how training time and memory grow with the number of games.
+
+Each size runs in its own process so peak RSS isn't inherited from a
+larger run. The process generates that many synthetic games with
+synthetic_games.synthetic_seasons (one season at a time, then concatenated
+as load_training_frame does), builds features with build_training_dataset,
+scales them and fits the production calibrated logistic model with fixed
+params, reporting wall time, CPU time and peak RSS per stage
+(training_profile.StageProfiler). A size that runs out of memory or time is
+reported as such instead of stopping the sweep.
+
+Usage: python benchmarks/bench_scaling.py [--sizes 10000 100000 1000000 10000000] [--timeout 1800]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import pandas as pd  # noqa: E402
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+
+from synthetic_games import synthetic_seasons  # noqa: E402
+from train_model import _calibrated_logit, build_training_dataset  # noqa: E402
+from training_profile import StageProfiler  # noqa: E402
+
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+# Skip the grid search: the fit at each size is the production model with typical params
+FIT_PARAMS = {'C': 1.0, 'class_weight': None, 'solver': 'lbfgs'}
+
+
+def measure(n_rows):
+    profiler = StageProfiler()
+    with profiler.stage('generate'):
+        df = pd.concat([frame for _, frame in synthetic_seasons(n_rows)], ignore_index=True)
+    with profiler.stage('build_training_dataset'):
+        X, y = build_training_dataset(df)
+    with profiler.stage('scale'):
+        X_scaled = StandardScaler().fit_transform(X)
+    with profiler.stage('fit'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            _calibrated_logit(FIT_PARAMS).fit(X_scaled, y)
+    return {
+        'rows': n_rows,
+        'frame_mb': round(df.memory_usage(deep=True).sum() / 2**20, 1),
+        'features_mb': round(X.memory_usage(deep=True).sum() / 2**20, 1),
+        **profiler.report(),
+    }
+
+
+def run_size(n_rows, timeout):
+    try:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(n_rows)],
+                              capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'rows': n_rows, 'failed': f'over {timeout:.0f}s'}
+    if proc.returncode != 0:
+        # SIGKILL is what the kernel's OOM killer sends
+        reason = 'killed (out of memory)' if proc.returncode == -9 else proc.stderr.strip().splitlines()[-1]
+        return {'rows': n_rows, 'failed': reason}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--timeout', type=float, default=1800, help="seconds allowed per size")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.worker)))
+        return
+
+    stages = ['generate', 'build_training_dataset', 'scale', 'fit']
+    print(f"{'rows':>10}{'frame MiB':>11}{'X MiB':>8}{'generate s':>12}{'build s':>9}{'scale s':>9}{'fit s':>9}"
+          + f"{'build us/row':>14}{'fit us/row':>12}{'peak MiB':>10}")
+    previous = None
+    for n_rows in args.sizes:
+        result = run_size(n_rows, args.timeout)
+        if 'failed' in result:
+            print(f"{n_rows:>10}  failed: {result['failed']}")
+            continue
+        wall = {record['stage']: record['wall_seconds'] for record in result['stages']}
+        peak = max(record['peak_rss_mb'] for record in result['stages'])
+        print(f"{n_rows:>10}{result['frame_mb']:>11.1f}{result['features_mb']:>8.1f}"
+              + ''.join(f"{wall[stage]:>{width}.2f}" for stage, width in zip(stages, (12, 9, 9, 9)))
+              + f"{wall['build_training_dataset'] / n_rows * 1e6:>14.2f}{wall['fit'] / n_rows * 1e6:>12.2f}{peak:>10.0f}")
+        if previous is not None:
+            growth = n_rows / previous['rows']
+            fit_growth = wall['fit'] / max(previous['wall']['fit'], 1e-9)
+            print(f"{'':>10}  {growth:.0f}x rows: fit {fit_growth:.1f}x slower, peak RSS {peak / previous['peak']:.1f}x")
+        previous = {'rows': n_rows, 'wall': wall, 'peak': peak}
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+End-to-end scraper benchmark against a local stand-in for basketball-reference.
+
+Renders schedule and team pages for whole seasons from the season CSVs,
+serves them with configurable latency and error rates, and times
+scrape_full_season -> enhance_game_data -> calculate_days_since_last_match
+-> calculate_team_record (plus, optionally, every team page). Reports wall
+time, pages per second and peak traced memory per stage. Tracing memory
+slows parsing several times over, so timings come from an untraced run and
+peaks from a second, traced one.
+
+Usage: python benchmarks/bench_scraper_e2e.py [--seasons 2024] [--latency 0.05]
+       [--error-rate 0.05] [--serial] [--team-pages] [--corpus-dir DIR] [--no-memory]
+"""
+import argparse
+import contextlib
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import pandas as pd  # noqa: E402
+
+from NBADataScraper import NBADataScraper  # noqa: E402
+from http_client import FetchClient  # noqa: E402
+from team_stats_scraper import fetch_all_team_stats  # noqa: E402
+from benchmarks.fixture_pages import MONTHS, season_csv, write_fixture_corpus  # noqa: E402
+from benchmarks.stand_in_server import StandInServer  # noqa: E402
+
+
+class StageTimer:
+    """Collects wall time, CPU time and (while tracemalloc runs) peak traced memory for named stages."""
+
+    def __init__(self):
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name, pages=None):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        record = {'stage': name, 'pages': pages, 'peak': None}
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield record
+        record['wall'] = time.perf_counter() - wall
+        record['cpu'] = time.process_time() - cpu
+        if tracing:
+            record['peak'] = tracemalloc.get_traced_memory()[1]
+        self.stages.append(record)
+
+    def report(self, peaks=None):
+        print(f"{'stage':<34}{'wall s':>9}{'cpu s':>9}{'pages':>7}{'pages/s':>9}{'peak MiB':>10}")
+        for i, record in enumerate(self.stages):
+            pages = record['pages']
+            rate = f"{pages / record['wall']:9.1f}" if pages else f"{'':>9}"
+            peak = peaks[i]['peak'] if peaks else None
+            peak = f"{peak / 2**20:10.1f}" if peak is not None else f"{'-':>10}"
+            print(f"{record['stage']:<34}{record['wall']:9.3f}{record['cpu']:9.3f}"
+                  f"{pages if pages is not None else '':>7}{rate}{peak}")
+
+
+def run(base_url, seasons, args):
+    client = FetchClient(backoff_base=0.05)
+    scraper = NBADataScraper(base_url=base_url, client=client, parse_mode=args.parse_mode)
+    timer = StageTimer()
+
+    for year in seasons:
+        with timer.stage(f"scrape_full_season {year}") as record:
+            season_df = scraper.scrape_full_season(
+                str(year), MONTHS, concurrent=not args.serial,
+                requests_per_second=args.rps, max_in_flight=args.max_in_flight)
+            record['pages'] = season_df['Month'].nunique() if season_df is not None else 0
+
+    with timer.stage("enhance_game_data"):
+        enhanced_df = scraper.enhance_game_data()
+    with timer.stage("calculate_days_since_last_match"):
+        with_days = scraper.calculate_days_since_last_match(enhanced_df.to_dict('records'))
+    with timer.stage("calculate_team_record"):
+        final_df = pd.DataFrame(scraper.calculate_team_record(with_days))
+
+    if args.team_pages:
+        for year in seasons:
+            with timer.stage(f"fetch_all_team_stats {year}") as record:
+                stats = fetch_all_team_stats(year, client=client, requests_per_second=args.rps,
+                                             max_in_flight=args.max_in_flight, base_url=base_url)
+                record['pages'] = sum(1 for entry in stats.values() if 'error' not in entry)
+
+    return timer, final_df, client.connection_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', type=int, nargs='+', default=[2024])
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--serial', action='store_true',
+                        help="serial fetching, including the scraper's 1s wait between pages")
+    parser.add_argument('--rps', type=float, default=20.0)
+    parser.add_argument('--max-in-flight', type=int, default=4)
+    parser.add_argument('--parse-mode', choices=['full', 'fast'], default='full')
+    parser.add_argument('--team-pages', action='store_true', help="also fetch and parse every team page")
+    parser.add_argument('--corpus-dir', help="write (or reuse) the fixture corpus here instead of a temp dir")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced run that measures peak memory")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        corpus_dir = args.corpus_dir or stack.enter_context(tempfile.TemporaryDirectory())
+        start = time.perf_counter()
+        if not os.path.isdir(os.path.join(corpus_dir, 'leagues')):
+            pages = write_fixture_corpus(corpus_dir, args.seasons)
+            print(f"Wrote {pages} fixture pages to {corpus_dir} in {time.perf_counter() - start:.1f}s")
+
+        server = StandInServer(corpus_dir, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, seed=args.seed)
+        base_url = stack.enter_context(server)
+
+        total_start = time.perf_counter()
+        timer, final_df, client_stats = run(base_url, args.seasons, args)
+        total = time.perf_counter() - total_start
+        server_stats = server.stats()
+
+        traced = None
+        if not args.no_memory:
+            tracemalloc.start()
+            traced, _, _ = run(base_url, args.seasons, args)
+            tracemalloc.stop()
+
+    expected = sum(len(pd.read_csv(season_csv(year))) for year in args.seasons)
+    print(f"latency {args.latency * 1000:.0f}ms (+{args.jitter * 1000:.0f}ms jitter), "
+          f"error rate {args.error_rate:.0%}, {'serial' if args.serial else 'concurrent'}, "
+          f"parse mode {args.parse_mode}")
+    timer.report(traced.stages if traced else None)
+    print(f"total {total:.2f}s; {len(final_df)} rows (season CSVs: {expected})")
+    print(f"server: {server_stats['requests']} requests, {server_stats['errors']} injected errors, "
+          f"{server_stats['not_found']} not found, {server_stats['bytes'] / 2**20:.1f} MiB served")
+    print(f"client: {client_stats['retries']} retries, {client_stats['failures']} failures, "
+          f"{client_stats['connections_opened']} connections opened, {client_stats['connections_reused']} reused")
+    # ru_maxrss is KiB on Linux
+    print(f"process peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare train_model's standard (cold grid search) and fast (warm-started path) modes.
+
+Both modes train on the season CSVs without writing artifacts. The script
+reports per-stage wall time and checks that the fast mode picks the same
+params and gives the same probabilities and coefficients within tolerance.
+
+Usage: python benchmarks/bench_training.py [--repeat 3] [--with-ratings]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+
+from train_model import fit_models, load_training_matrices  # noqa: E402
+
+PROBA_TOLERANCE = 1e-3
+# Both coefficient fits stop at lbfgs' default tol from different starting points
+COEF_PROBA_TOLERANCE = 1e-2
+
+
+def run(X, y, seasons, fast, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fitted = fit_models(X, y, seasons, fast=fast)
+        fitted['total'] = time.perf_counter() - start
+        if best is None or fitted['total'] < best['total']:
+            best = fitted
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3, help="best-of-N timing")
+    parser.add_argument('--with-ratings', action='store_true')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        X, y, seasons = load_training_matrices(BACKEND_DIR, use_ratings=args.with_ratings)
+
+    standard = run(X, y, seasons, False, args.repeat)
+    fast = run(X, y, seasons, True, args.repeat)
+
+    print(f"{len(X)} samples, {X.shape[1]} features, best of {args.repeat}")
+    print(f"{'stage':<14}{'standard s':>12}{'fast s':>10}")
+    for stage in standard['timings']:
+        print(f"{stage:<14}{standard['timings'][stage]:12.3f}{fast['timings'][stage]:10.3f}")
+    print(f"{'total':<14}{standard['total']:12.3f}{fast['total']:10.3f}  ({standard['total'] / fast['total']:.2f}x)")
+
+    proba_diff = np.abs(standard['model'].predict_proba(standard['X_test_scaled'])[:, 1]
+                        - fast['model'].predict_proba(fast['X_test_scaled'])[:, 1]).max()
+    coef_diff = np.abs(standard['coef_model'].coef_ - fast['coef_model'].coef_).max()
+    # Several features are exact linear combinations of others, so the optimum is flat and
+    # coefficients wander within solver tolerance; compare what the models predict as well
+    coef_proba_diff = np.abs(standard['coef_model'].predict_proba(standard['X_test_scaled'])[:, 1]
+                             - fast['coef_model'].predict_proba(fast['X_test_scaled'])[:, 1]).max()
+    print(f"best params: standard {standard['best_params']}, fast {fast['best_params']}")
+    print(f"max |probability difference| on the test split: {proba_diff:.2e}")
+    print(f"max |coefficient difference|: {coef_diff:.2e} "
+          f"(coefficient models' probabilities differ by at most {coef_proba_diff:.2e})")
+    for split in ('random_split_metrics', 'time_split_metrics'):
+        if standard[split] and fast[split]:
+            deltas = {key: abs(standard[split][key] - fast[split][key]) for key in standard[split]}
+            print(f"{split}: max metric difference {max(deltas.values()):.2e}")
+
+    assert standard['best_params'] == fast['best_params'], "modes picked different params"
+    assert proba_diff < PROBA_TOLERANCE, "calibrated probabilities differ"
+    assert coef_proba_diff < COEF_PROBA_TOLERANCE, "coefficient models differ"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Render basketball-reference style pages from the season CSVs for offline benchmarks."""
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from teams import TEAM_INDEX  # noqa: E402
+
+# basketball-reference code by scraped team name ('Brooklyn Nets' -> 'BRK')
+TEAM_CODES = {TEAM_INDEX.display_name(team_id): TEAM_INDEX.bbref_code(team_id) for team_id in range(len(TEAM_INDEX))}
+
+MONTHS = ["october", "november", "december", "january", "february", "march", "april"]
+
+_SCHEDULE_HEAD = (
+    '<thead>\n<tr>'
+    '<th aria-label="Date" data-stat="date_game" scope="col" class=" poptip sort_default_asc center" >Date</th>'
+    '<th aria-label="Start (ET)" data-stat="game_start_time" scope="col" class=" poptip center" >Start (ET)</th>'
+    '<th aria-label="Visitor/Neutral" data-stat="visitor_team_name" scope="col" class=" poptip sort_default_asc center" >Visitor/Neutral</th>'
+    '<th aria-label="Points" data-stat="visitor_pts" scope="col" class=" poptip center" data-tip="Points" >PTS</th>'
+    '<th aria-label="Home/Neutral" data-stat="home_team_name" scope="col" class=" poptip sort_default_asc center" >Home/Neutral</th>'
+    '<th aria-label="Points" data-stat="home_pts" scope="col" class=" poptip center" data-tip="Points" >PTS</th>'
+    '<th aria-label="&nbsp;" data-stat="box_score_text" scope="col" class=" poptip center" >&nbsp;</th>'
+    '<th aria-label="&nbsp;" data-stat="overtimes" scope="col" class=" poptip center" >&nbsp;</th>'
+    '<th aria-label="Attendance" data-stat="attendance" scope="col" class=" poptip center" >Attend.</th>'
+    '<th aria-label="Length of Game" data-stat="game_duration" scope="col" class=" poptip center" >LOG</th>'
+    '<th aria-label="Arena" data-stat="arena_name" scope="col" class=" poptip center" >Arena</th>'
+    '<th aria-label="Notes" data-stat="game_remarks" scope="col" class=" poptip center" >Notes</th>'
+    '</tr>\n</thead>\n'
+)
+
+
+def _page_chrome(title, body, season_end_year, info=None):
+    """Wrap a table in the header, navigation, scripts and footer a real page carries."""
+    nav = ''.join(
+        f'<li><a href="/teams/{code}/{season_end_year}.html" title="{name}">{name}</a></li>'
+        for name, code in TEAM_CODES.items()
+    )
+    leaders = ''.join(
+        f'<div class="leader"><a href="/players/x/player{i:02d}.html">Player {i}</a> <span>{20 + i % 9}.{i % 10}</span></div>'
+        for i in range(120)
+    )
+    script = '<script>' + 'window.sr_data=window.sr_data||[];' * 400 + '</script>'
+    return f'''<!DOCTYPE html>
+<html data-version="klecko-" lang="en" class="no-js" >
+<head>
+<meta charset="UTF-8" />
+<title>{title} | Basketball-Reference.com</title>
+<link rel="stylesheet" href="https://cdn.ssref.net/req/202401011/css/sr/sr-min.css" />
+{script}
+</head>
+<body class="bbr">
+<div id="wrap">
+<div id="header" role="banner"><div class="logo"><a href="/">Basketball-Reference.com</a></div>
+<nav id="nav"><ul>{nav}</ul></nav></div>
+<div id="info">{info or f'<h1>{title}</h1>'}</div>
+<div id="content" role="main" class="box">
+<div class="filter">{''.join(f'<div><a href="/leagues/NBA_{season_end_year}_games-{m}.html">{m.capitalize()}</a></div>' for m in MONTHS)}</div>
+{body}
+<div id="leaders">{leaders}</div>
+</div>
+<div id="footer"><p>Copyright &copy; 2000-{season_end_year} Sports Reference LLC.</p>{script}</div>
+</div>
+</body>
+</html>
+'''
+
+
+def _schedule_row(game, season_end_year):
+    date = datetime.strptime(game['Date'], '%a %b %d %Y')
+    date_label = f"{date.strftime('%a, %b')} {date.day}, {date.year}"
+    visitor, home = game['Visitor/Neutral'], game['Home/Neutral']
+    visitor_code, home_code = TEAM_CODES[visitor], TEAM_CODES[home]
+    overtime = game['Unnamed: 4'] if isinstance(game['Unnamed: 4'], str) else ''
+    game_id = f"{date.strftime('%Y%m%d')}0{home_code}"
+    return (
+        f'<tr ><th scope="row" class="left " data-stat="date_game" csk="{game_id[:9]}">'
+        f'<a href="/boxscores/index.fcgi?month={date.month}&amp;day={date.day}&amp;year={date.year}">{date_label}</a></th>'
+        f'<td class="right " data-stat="game_start_time" >7:30p</td>'
+        f'<td class="left " data-stat="visitor_team_name" csk="{visitor_code}.{game_id}">'
+        f'<a href="/teams/{visitor_code}/{season_end_year}.html">{visitor}</a></td>'
+        f'<td class="right " data-stat="visitor_pts" >{game["Visitor_PTS"]}</td>'
+        f'<td class="left " data-stat="home_team_name" csk="{home_code}.{game_id}">'
+        f'<a href="/teams/{home_code}/{season_end_year}.html">{home}</a></td>'
+        f'<td class="right " data-stat="home_pts" >{game["Home_PTS"]}</td>'
+        f'<td class="center " data-stat="box_score_text" ><a href="/boxscores/{game_id}.html">Box Score</a></td>'
+        f'<td class="center " data-stat="overtimes" >{overtime}</td>'
+        f'<td class="right " data-stat="attendance" >18,064</td>'
+        f'<td class="right " data-stat="game_duration" >2:14</td>'
+        f'<td class="left " data-stat="arena_name" >Arena</td>'
+        f'<td class="left " data-stat="game_remarks" ></td></tr>\n'
+    )
+
+
+def render_schedule_page(games, season_end_year, month):
+    """Render one month's schedule page from rows of a season CSV."""
+    rows = [_schedule_row(game, season_end_year) for _, game in games.iterrows()]
+    # Long tables repeat their header inside tbody every 20 rows.
+    for i in range(20, len(rows), 21):
+        rows.insert(i, '<tr class="thead"><th>Date</th><th>Start (ET)</th><th>Visitor/Neutral</th>'
+                       '<th>PTS</th><th>Home/Neutral</th><th>PTS</th></tr>\n')
+    table = (
+        '<div id="all_schedule" class="table_wrapper">'
+        f'<div class="section_heading"><h2>{month.capitalize()} Schedule</h2></div>'
+        '<div class="table_container" id="div_schedule">'
+        '<table class="suppress_glossary sortable stats_table" id="schedule" data-cols-to-freeze=",1">'
+        f'<caption>{month.capitalize()} Schedule Table</caption>\n'
+        f'{_SCHEDULE_HEAD}<tbody>\n{"".join(rows)}</tbody>\n</table>\n</div>\n</div>'
+    )
+    title = f"{season_end_year - 1}-{str(season_end_year)[2:]} NBA Schedule"
+    return _page_chrome(title, table, season_end_year)
+
+
+def season_csv(season_end_year):
+    return os.path.join(BACKEND_DIR, 'data', f'nba_{season_end_year - 1}_{season_end_year}_final_data.csv')
+
+
+def render_season_schedule(season_end_year):
+    """Return {month: html} for every month in a season CSV."""
+    df = pd.read_csv(season_csv(season_end_year))
+    return {
+        month: render_schedule_page(df[df['Month'] == month], season_end_year, month)
+        for month in MONTHS
+        if (df['Month'] == month).any()
+    }
+
+
+def scraped_month_frames(season_end_years):
+    """Month frames shaped like NBADataScraper.parse_month_page output, rebuilt from the CSVs."""
+    frames = []
+    for season_end_year in season_end_years:
+        df = pd.read_csv(season_csv(season_end_year), keep_default_na=False)
+        for _, games in df.groupby('Month', sort=False):
+            frame = pd.DataFrame({
+                'Date': games['Date'],
+                'Visitor/Neutral': games['Visitor/Neutral'],
+                'PTS': games['Visitor_PTS'].astype(str),
+                'Home/Neutral': games['Home/Neutral'],
+                'PTS ': games['Home_PTS'].astype(str),
+                '': 'Box Score',
+                'OT': games['Unnamed: 4'],
+                'Visitor_PTS': games['Visitor_PTS'],
+                'Home_PTS': games['Home_PTS'],
+                'Month': games['Month'],
+                'Season': games['Season'],
+            }).reset_index(drop=True)
+            # The schedule table repeats the 'PTS' and blank headers
+            frame.columns = ['Date', 'Visitor/Neutral', 'PTS', 'Home/Neutral', 'PTS', '', '',
+                             'Visitor_PTS', 'Home_PTS', 'Month', 'Season']
+            frames.append(frame)
+    return frames
+
+
+def scraped_game_results(season_end_years):
+    """Rebuild NBADataScraper.game_results, as scraping these seasons in order leaves it, from the CSVs."""
+    # Both PTS cells share one key in the scraped dicts, so the home score wins.
+    return [
+        dict(zip(frame.columns, values))
+        for frame in scraped_month_frames(season_end_years)
+        for values in frame.to_numpy(dtype=object)
+    ]
+
+
+# Possessions per 48 minutes used to turn points per game into ratings
+FIXTURE_PACE = 99.0
+
+
+def team_season_totals(season_end_year):
+    """Per-team record and points for/against of a finished season, from its CSV."""
+    df = pd.read_csv(season_csv(season_end_year))
+    played = df[(df['Home_PTS'] > 0) & (df['Visitor_PTS'] > 0)]
+    totals = {}
+    for team_col, pts_col, opp_col, won in (
+            ('Home/Neutral', 'Home_PTS', 'Visitor_PTS', played['Home_PTS'] > played['Visitor_PTS']),
+            ('Visitor/Neutral', 'Visitor_PTS', 'Home_PTS', played['Visitor_PTS'] > played['Home_PTS'])):
+        grouped = pd.DataFrame({'team': played[team_col], 'pts': played[pts_col],
+                                'opp': played[opp_col], 'won': won}).groupby('team')
+        for team, games in grouped:
+            entry = totals.setdefault(team, {'wins': 0, 'losses': 0, 'pts': 0, 'opp': 0})
+            entry['wins'] += int(games['won'].sum())
+            entry['losses'] += int((~games['won']).sum())
+            entry['pts'] += int(games['pts'].sum())
+            entry['opp'] += int(games['opp'].sum())
+    return totals
+
+
+def render_team_page(team_name, season_end_year, totals):
+    """Render a team-season page with the #info ratings and commented team_misc table the scraper reads."""
+    code = TEAM_CODES[team_name]
+    games = max(totals['wins'] + totals['losses'], 1)
+    ppg, opp_ppg = totals['pts'] / games, totals['opp'] / games
+    off_rtg, def_rtg = round(ppg / FIXTURE_PACE * 100, 1), round(opp_ppg / FIXTURE_PACE * 100, 1)
+    season_label = f"{season_end_year - 1}-{str(season_end_year)[2:]}"
+    info = (
+        '<div id="meta"><div>'
+        f'<h1><span>{season_label}</span> <span>{team_name}</span> Roster and Stats</h1>'
+        f'<p><strong>Last Season:</strong> {season_end_year - 2}-{str(season_end_year - 1)[2:]}</p>'
+        f'<p><strong>Record:</strong> {totals["wins"]}-{totals["losses"]}</p>'
+        f'<p><strong>PTS/G:</strong> {ppg:.1f} <strong>Opp PTS/G:</strong> {opp_ppg:.1f}</p>'
+        f'<p><strong>Off Rtg</strong>: {off_rtg} <strong>Def Rtg</strong>: {def_rtg}</p>'
+        '</div></div>'
+    )
+    roster = ''.join(
+        f'<tr><th data-stat="number">{i}</th><td data-stat="player"><a href="/players/x/{code.lower()}{i:02d}.html">'
+        f'Player {i}</a></td><td data-stat="pos">G</td><td data-stat="height">6-5</td></tr>\n'
+        for i in range(15)
+    )
+    body = (
+        '<div id="all_roster" class="table_wrapper"><table class="sortable stats_table" id="roster">'
+        f'<tbody>\n{roster}</tbody></table></div>\n'
+        '<div id="all_team_misc" class="table_wrapper">\n<!--\n'
+        '<table class="suppress_all stats_table" id="team_misc">'
+        '<thead><tr><th data-stat="player">Team</th><th data-stat="wins">W</th><th data-stat="losses">L</th>'
+        '<th data-stat="off_rtg">ORtg</th><th data-stat="def_rtg">DRtg</th></tr></thead>'
+        f'<tbody><tr><th data-stat="player">Team</th><td data-stat="wins">{totals["wins"]}</td>'
+        f'<td data-stat="losses">{totals["losses"]}</td><td data-stat="off_rtg">{off_rtg}</td>'
+        f'<td data-stat="def_rtg">{def_rtg}</td></tr></tbody>\n</table>\n-->\n</div>'
+    )
+    return _page_chrome(f"{season_label} {team_name} Roster and Stats", body, season_end_year, info=info)
+
+
+def write_fixture_corpus(directory, season_end_years):
+    """
+    Write schedule and team pages for whole seasons under ``directory``,
+    laid out like the site (leagues/NBA_<year>_games-<month>.html and
+    teams/<code>/<year>.html). Returns the number of pages written.
+    """
+    pages = 0
+    for season_end_year in season_end_years:
+        leagues_dir = os.path.join(directory, 'leagues')
+        os.makedirs(leagues_dir, exist_ok=True)
+        for month, html in render_season_schedule(season_end_year).items():
+            with open(os.path.join(leagues_dir, f'NBA_{season_end_year}_games-{month}.html'), 'w', encoding='utf-8') as f:
+                f.write(html)
+            pages += 1
+
+        for team_name, totals in team_season_totals(season_end_year).items():
+            team_dir = os.path.join(directory, 'teams', TEAM_CODES[team_name])
+            os.makedirs(team_dir, exist_ok=True)
+            with open(os.path.join(team_dir, f'{season_end_year}.html'), 'w', encoding='utf-8') as f:
+                f.write(render_team_page(team_name, season_end_year, totals))
+            pages += 1
+    return pages
@@ -0,0 +1,114 @@
+"""Local HTTP stand-in for basketball-reference that serves a fixture corpus."""
+import functools
+import multiprocessing
+import random
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StandInHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+    def __init__(self, *args, server_config=None, counters=None, **kwargs):
+        self.server_config = server_config
+        self.counters = counters
+        super().__init__(*args, **kwargs)
+
+    def _count(self, key, amount=1):
+        counter = self.counters[key]
+        with counter.get_lock():
+            counter.value += amount
+
+    def do_GET(self):
+        config = self.server_config
+        self._count('requests')
+        delay = config['latency'] + config['rng'].uniform(0, config['jitter'])
+        if delay > 0:
+            time.sleep(delay)
+
+        if config['rng'].random() < config['error_rate']:
+            self._count('errors')
+            self.send_response(config['error_status'])
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        f = self.send_head()
+        if f is None:
+            self._count('not_found')
+            return
+        try:
+            body = f.read()
+            self.wfile.write(body)
+            self._count('bytes', len(body))
+        finally:
+            f.close()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(directory, latency, jitter, error_rate, error_status, seed, counters, port_pipe):
+    config = {
+        'latency': latency,
+        'jitter': jitter,
+        'error_rate': error_rate,
+        'error_status': error_status,
+        'rng': random.Random(seed),
+    }
+    handler = functools.partial(_StandInHandler, directory=directory, server_config=config, counters=counters)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    port_pipe.send(server.server_address[1])
+    port_pipe.close()
+    server.serve_forever()
+
+
+class StandInServer:
+    """
+    Serve a directory laid out like the site (see fixture_pages.write_fixture_corpus).
+
+    Every request waits ``latency`` seconds plus up to ``jitter`` more, and a
+    ``error_rate`` fraction of them fail with ``error_status`` and
+    ``Retry-After: 0``. The server runs in its own process so it doesn't
+    share the GIL or the traced heap with the code being measured. Use as a
+    context manager; it yields the base URL.
+    """
+
+    def __init__(self, directory, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=0):
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.seed = seed
+        self.counters = {key: multiprocessing.Value('q', 0) for key in ('requests', 'errors', 'not_found', 'bytes')}
+        self._process = None
+        self.base_url = None
+
+    def start(self):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(self.directory, self.latency, self.jitter, self.error_rate, self.error_status,
+                  self.seed, self.counters, sender),
+            daemon=True,
+        )
+        self._process.start()
+        self.base_url = f"http://127.0.0.1:{receiver.recv()}"
+        return self.base_url
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def stats(self):
+        return {key: counter.value for key, counter in self.counters.items()}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
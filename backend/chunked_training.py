@@ -0,0 +1,187 @@
+import argparse
+import glob
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.frozen import FrozenEstimator
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from feature_store import build_season_matrix
+from season_loader import TRAINING_COLUMNS, read_season_csv
+from train_model import (
+    _extract_season_from_path,
+    _print_metrics,
+    _resolve_training_files,
+    build_training_dataset,
+    prefetch_team_stats,
+    print_saved_artifacts,
+    save_model_artifacts,
+    write_retrained_metadata,
+)
+from training_profile import StageProfiler
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+CHUNK_ROWS = 100_000
+# Rows held out at random, as train_test_split does for in-memory training;
+# up to HOLDOUT_ROWS of them are kept, half to calibrate and half to score.
+TEST_FRACTION = 0.2
+HOLDOUT_ROWS = 200_000
+
+
+def iter_feature_chunks(season_files, chunk_rows=CHUNK_ROWS, use_ratings=False, use_team_stats=False):
+    """
+    Yield (season, X, y) for at most ``chunk_rows`` games at a time, file by file.
+
+    Features are row-wise, so plain files are read ``chunk_rows`` at a time.
+    Ratings and team stats are computed over a whole season, so with either
+    one a chunk is one season.
+    """
+    for path in season_files:
+        season = _extract_season_from_path(path)
+        if use_ratings or use_team_stats:
+            matrix = build_season_matrix(read_season_csv(path, TRAINING_COLUMNS), use_ratings, use_team_stats)
+            yield season, matrix['X'], matrix['y']
+            continue
+        for frame in read_season_csv(path, TRAINING_COLUMNS, chunksize=chunk_rows):
+            X, y = build_training_dataset(frame)
+            yield season, X, y.to_numpy()
+
+
+class _Holdout:
+    """A uniform sample of at most ``capacity`` held-out rows, kept by smallest random key."""
+
+    def __init__(self, capacity, rng):
+        self.capacity, self.rng = capacity, rng
+        self.X = self.y = self.keys = None
+
+    def add(self, X, y):
+        keys = self.rng.random(len(y))
+        if self.X is not None:
+            X, y, keys = np.concatenate([self.X, X]), np.concatenate([self.y, y]), np.concatenate([self.keys, keys])
+        if len(y) > self.capacity:
+            keep = np.argpartition(keys, self.capacity)[:self.capacity]
+            X, y, keys = X[keep], y[keep], keys[keep]
+        self.X, self.y, self.keys = X, y, keys
+
+
+def train_chunked(season_files, base_dir=BACKEND_DIR, chunk_rows=CHUNK_ROWS, epochs=1, alpha=1e-3,
+                  use_ratings=False, use_team_stats=False, seed=42):
+    """
+    Train on season files that don't fit in memory together.
+
+    The first pass over the files fits the StandardScaler with partial_fit
+    and samples the held-out rows. The second pass (``epochs`` of them)
+    trains an averaged SGD logistic regression with partial_fit on the
+    scaled training rows, a chunk at a time. Each row's train/holdout draw
+    comes from a per-pass generator seeded alike, so every pass splits the
+    same way. The model is then sigmoid-calibrated on half the holdout
+    sample and scored on the other half. Memory is bounded by
+    ``chunk_rows`` and HOLDOUT_ROWS, not by the number of games.
+
+    Artifacts and model_metadata.json are written like train_model's, so
+    GamePredictor.load_model serves the result.
+
+    Returns:
+        (model, scaler)
+    """
+    if use_team_stats:
+        prefetch_team_stats(season_files)
+    profiler = StageProfiler()
+
+    def chunks():
+        rng = np.random.default_rng(seed)
+        for _, X, y in iter_feature_chunks(season_files, chunk_rows, use_ratings, use_team_stats):
+            yield X, y, rng.random(len(y)) < TEST_FRACTION
+
+    scaler = StandardScaler()
+    holdout = _Holdout(HOLDOUT_ROWS, np.random.default_rng(seed + 1))
+    n_chunks = n_train = n_test = 0
+    with profiler.stage('scaler_pass'):
+        for X, y, test in chunks():
+            if (~test).any():
+                scaler.partial_fit(X[~test])
+            holdout.add(X[test].to_numpy(dtype=float), y[test])
+            n_chunks, n_train, n_test = n_chunks + 1, n_train + int((~test).sum()), n_test + int(test.sum())
+    if n_train == 0:
+        raise ValueError("No training rows in the season files")
+    feature_names = list(scaler.feature_names_in_)
+    print(f"Scaler fitted on {n_train} rows in {n_chunks} chunks; {n_test} rows held out")
+
+    sgd = SGDClassifier(loss='log_loss', alpha=alpha, average=True, random_state=seed)
+    with profiler.stage('training_pass'):
+        for _ in range(epochs):
+            for X, y, test in chunks():
+                if (~test).any():
+                    sgd.partial_fit(scaler.transform(X[~test]), y[~test], classes=np.array([0, 1]))
+
+    with profiler.stage('calibrate'):
+        X_holdout = scaler.transform(pd.DataFrame(holdout.X, columns=feature_names))
+        half = len(holdout.y) // 2
+        model = CalibratedClassifierCV(FrozenEstimator(sgd), method='sigmoid')
+        model.fit(X_holdout[:half], holdout.y[:half])
+        y_prob = model.predict_proba(X_holdout[half:])[:, 1]
+        random_split_metrics = _print_metrics("Holdout Sample Performance", holdout.y[half:],
+                                              (y_prob >= 0.5).astype(int), y_prob)
+
+    with profiler.stage('save_artifacts'):
+        files = save_model_artifacts(base_dir, model, scaler, feature_names)
+
+    metadata = {
+        'created_at': datetime.now().isoformat(),
+        **files,
+        'feature_count': len(feature_names),
+        'feature_names': feature_names,
+        'samples': n_train + n_test,
+        # best_params keeps the logistic schema backtest and online_model refit with; SGD settings are under 'chunked'
+        'best_params': None,
+        'training_mode': 'chunked',
+        'model_family': 'sgd_logistic',
+        'random_split_metrics': random_split_metrics,
+        # A season holdout would take another full pass to retrain without it
+        'time_split_metrics': None,
+        'chunked': {
+            'alpha': alpha,
+            'chunk_rows': chunk_rows,
+            'chunks': n_chunks,
+            'epochs': epochs,
+            'train_rows': n_train,
+            'holdout_rows': n_test,
+            'calibration_rows': half,
+            'scored_rows': len(holdout.y) - half,
+        },
+        'profile': profiler.report(),
+    }
+    write_retrained_metadata(metadata, os.path.join(base_dir, 'model_metadata.json'))
+    print_saved_artifacts(base_dir, files)
+    profiler.print_report()
+    return model, scaler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train on season CSVs a chunk at a time with bounded memory")
+    parser.add_argument('--data-dir', help="Directory of nba_*_final_data.csv files (default: backend/data)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--epochs', type=int, default=1, help="Training passes over the files")
+    parser.add_argument('--alpha', type=float, default=1e-3, help="SGD regularization strength")
+    parser.add_argument('--with-ratings', action='store_true')
+    parser.add_argument('--with-team-stats', action='store_true')
+    args = parser.parse_args()
+
+    if args.data_dir:
+        season_files = sorted(glob.glob(os.path.join(args.data_dir, 'nba_*_final_data.csv')))
+    else:
+        season_files = _resolve_training_files(BACKEND_DIR)
+    if not season_files:
+        parser.error("no season files found")
+    print(f"🤖 Chunked training on {len(season_files)} season files...")
+    train_chunked(season_files, chunk_rows=args.chunk_rows, epochs=args.epochs, alpha=args.alpha,
+                  use_ratings=args.with_ratings, use_team_stats=args.with_team_stats)
+    print("\n✅ Chunked training completed successfully!")
+
+
+if __name__ == '__main__':
+    main()
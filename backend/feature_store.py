@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from model_bundle import file_sha256
+from ratings import add_rating_features
+from season_loader import TRAINING_COLUMNS, read_season_csv
+from team_stats_store import TeamStatsStore, add_team_stat_features, season_end_year
+from train_model import _extract_season_from_path, build_training_dataset
+
+DEFAULT_FEATURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'features')
+
+# Bump whenever build_training_dataset (or a feature it appends) changes meaning
+FEATURE_SCHEMA_VERSION = 2
+
+
+def build_season_matrix(season_df, include_ratings=False, include_team_stats=False, stats_store=None):
+    """
+    Feature matrix, labels and month layout for one season's rows.
+
+    Returns:
+        dict: {'X': DataFrame, 'y': ndarray, 'months': ndarray of month
+        labels, 'month_order': months in the order they were played}.
+    """
+    season_df = season_df.reset_index(drop=True)
+    if include_ratings and 'Date' in season_df.columns:
+        season_df = add_rating_features(season_df)
+    if include_team_stats:
+        season_df = add_team_stat_features(season_df, stats_store or TeamStatsStore())
+    X, y = build_training_dataset(season_df, include_ratings=include_ratings, include_team_stats=include_team_stats)
+
+    months = season_df['Month'].fillna('').astype(str).to_numpy() \
+        if 'Month' in season_df.columns else np.full(len(season_df), '')
+    dates = pd.to_datetime(season_df['Date'], format='%a %b %d %Y', errors='coerce') \
+        if 'Date' in season_df.columns else pd.Series(pd.NaT, index=season_df.index)
+    first_played = dates.groupby(months).min().sort_values()
+    return {
+        'X': X,
+        'y': y.to_numpy(),
+        'months': months,
+        'month_order': list(first_played.index),
+    }
+
+
+class FeatureStore:
+    """
+    On-disk per-season feature matrices, one .npz file per season and feature set.
+
+    Each file records the key it was built from: the season CSV's SHA-256,
+    FEATURE_SCHEMA_VERSION, the optional feature flags and, with team stats,
+    a hash of the ratings joined in. A season is rebuilt only when that key
+    changes; otherwise loading it is a single array read.
+    """
+
+    def __init__(self, directory=DEFAULT_FEATURE_DIR, stats_store=None):
+        self.directory = directory
+        self.stats_store = stats_store
+        self.hits = 0
+        self.rebuilt = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, season, include_ratings, include_team_stats):
+        suffix = ('_ratings' if include_ratings else '') + ('_team_stats' if include_team_stats else '')
+        return os.path.join(self.directory, f"{season}{suffix}.npz")
+
+    def _key(self, csv_path, season, include_ratings, include_team_stats):
+        key = {
+            'csv_sha256': file_sha256(csv_path),
+            'schema_version': FEATURE_SCHEMA_VERSION,
+            'ratings': include_ratings,
+            'team_stats': include_team_stats,
+        }
+        if include_team_stats:
+            # Team-stat features come from the previous season's stored ratings
+            store = self.stats_store or TeamStatsStore()
+            table = store.ratings_table(season_end_year(season) - 1)
+            key['team_stats_sha256'] = hashlib.sha256(table.to_json().encode('utf-8')).hexdigest()
+        return json.dumps(key, sort_keys=True)
+
+    def _read(self, path, key):
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data['key']) != key:
+                    return None
+                columns = [str(c) for c in data['columns']]
+                X = pd.DataFrame(data['X'], columns=columns).astype(dict(zip(columns, data['dtypes'].astype(str))))
+                return {
+                    'X': X,
+                    'y': data['y'].astype(int),
+                    'months': data['months'].astype(str),
+                    'month_order': [str(m) for m in data['month_order']],
+                }
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _write(self, path, key, entry):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            key=np.array(key),
+            X=entry['X'].to_numpy(dtype='float64'),
+            columns=np.array(list(entry['X'].columns)),
+            dtypes=np.array([str(dtype) for dtype in entry['X'].dtypes]),
+            y=entry['y'].astype('int8'),
+            months=np.asarray(entry['months'], dtype=str),
+            month_order=np.array(entry['month_order'], dtype=str),
+        )
+        os.replace(tmp_path, path)
+
+    def lookup(self, csv_path, include_ratings=False, include_team_stats=False):
+        """The stored matrix for one season CSV, or None when it is missing or stale."""
+        season = _extract_season_from_path(csv_path)
+        path = self._path(season, include_ratings, include_team_stats)
+        key = self._key(csv_path, season, include_ratings, include_team_stats)
+
+        entry = self._read(path, key) if os.path.exists(path) else None
+        if entry is not None:
+            with self._lock:
+                self.hits += 1
+        return entry
+
+    def build(self, csv_path, season_df, include_ratings=False, include_team_stats=False):
+        """Build and store the matrix for one season CSV from its rows, already read."""
+        season = _extract_season_from_path(csv_path)
+        path = self._path(season, include_ratings, include_team_stats)
+        key = self._key(csv_path, season, include_ratings, include_team_stats)
+
+        season_df['__season_key'] = season
+        entry = build_season_matrix(season_df, include_ratings, include_team_stats, self.stats_store)
+        self._write(path, key, entry)
+        with self._lock:
+            self.rebuilt += 1
+        return entry
+
+    def load_season(self, csv_path, include_ratings=False, include_team_stats=False):
+        """Matrix for one season CSV (see build_season_matrix), rebuilt only if stale."""
+        entry = self.lookup(csv_path, include_ratings, include_team_stats)
+        if entry is None:
+            entry = self.build(csv_path, read_season_csv(csv_path, TRAINING_COLUMNS), include_ratings, include_team_stats)
+        return entry
+
+    def load(self, csv_paths, include_ratings=False, include_team_stats=False):
+        """Matrices for several season CSVs, keyed by season ('2023-2024')."""
+        return {
+            _extract_season_from_path(path): self.load_season(path, include_ratings, include_team_stats)
+            for path in csv_paths
+        }
+
+
+def stack_seasons(matrices):
+    """Concatenate season matrices into (X, y, season per row), in season order."""
+    seasons = sorted(matrices)
+    X = pd.concat([matrices[s]['X'] for s in seasons], ignore_index=True)
+    y = pd.Series(np.concatenate([matrices[s]['y'] for s in seasons]), name='home_win')
+    season_keys = np.concatenate([np.full(len(matrices[s]['y']), s) for s in seasons])
+    return X, y, season_keys
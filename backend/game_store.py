@@ -0,0 +1,104 @@
+from collections.abc import Mapping
+from datetime import datetime
+
+DATE_FORMATS = ('%a %b %d %Y', '%Y-%m-%d')
+
+
+def parse_game_date(value):
+    """Parse a scraped 'Tue Oct 24 2023' (or ISO) date; None when unparseable."""
+    if not isinstance(value, str):
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+class GameRecord(Mapping):
+    """
+    One scraped schedule row, read like the dict ``row.to_dict()`` used to give.
+
+    Rows from the same page share one column layout and keep their values in a
+    tuple; the game date is parsed once when the row is stored.
+    """
+
+    __slots__ = ('_layout', '_values', 'date')
+
+    def __init__(self, layout, values, date):
+        self._layout = layout  # column -> position in values, shared per page
+        self._values = values
+        self.date = date
+
+    def __getitem__(self, key):
+        return self._values[self._layout[key]]
+
+    def __iter__(self):
+        return iter(self._layout)
+
+    def __len__(self):
+        return len(self._layout)
+
+    def copy(self):
+        return {key: self._values[position] for key, position in self._layout.items()}
+
+    def __repr__(self):
+        return f"GameRecord({self.copy()!r})"
+
+
+class GameStore:
+    """
+    Scraped games in the order they were parsed.
+
+    Replaces the scraper's list of per-row dicts: whole month frames are added
+    at once and every distinct date string is parsed a single time, both for
+    the stored games and for later lookups through ``parse_date``.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._dates = {}
+
+    @classmethod
+    def from_dicts(cls, games):
+        store = cls()
+        for game in games:
+            store.add(game)
+        return store
+
+    def parse_date(self, value):
+        if not isinstance(value, str):
+            return None
+        if value not in self._dates:
+            self._dates[value] = parse_game_date(value)
+        return self._dates[value]
+
+    def add(self, game):
+        layout = {key: position for position, key in enumerate(game)}
+        self.records.append(GameRecord(layout, tuple(game.values()), self.parse_date(game.get('Date'))))
+
+    def add_frame(self, df):
+        """Store every row of a month frame; duplicate column names keep the last value."""
+        layout = {}
+        for position, column in enumerate(df.columns):
+            layout[column] = position
+        date_position = layout.get('Date')
+        for values in df.to_numpy(dtype=object):
+            values = tuple(values)
+            date = self.parse_date(values[date_position]) if date_position is not None else None
+            self.records.append(GameRecord(layout, values, date))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def __eq__(self, other):
+        if isinstance(other, GameStore):
+            other = other.records
+        return list(self.records) == list(other)
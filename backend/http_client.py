@@ -0,0 +1,204 @@
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from page_cache import finished_season_policy
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class FetchClient:
+    """
+    Shared HTTP client for the scrapers.
+
+    Wraps one ``requests.Session`` so connections are kept alive and reused,
+    retries 429/5xx responses and connection errors with exponential backoff
+    and full jitter (honouring ``Retry-After``), and caps how many requests
+    may be in flight to any single host.
+    """
+
+    def __init__(self, pool_size=10, per_host_limit=4, max_retries=4,
+                 backoff_base=1.0, backoff_max=30.0, timeout=10, user_agent="Mozilla/5.0",
+                 cache=None, cache_policy=finished_season_policy):
+        self.cache = cache  # Optional PageCache for conditional/immutable reuse
+        self.cache_policy = cache_policy
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        self.stats = Counter()
+
+    def _slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _retry_delay(self, attempt, response=None):
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(self.backoff_max, max(0.0, float(retry_after)))
+                except ValueError:
+                    try:
+                        retry_at = parsedate_to_datetime(retry_after)
+                        wait = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                        return min(self.backoff_max, max(0.0, wait))
+                    except (TypeError, ValueError):
+                        pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url, headers=None, timeout=None, limiter=None):
+        """
+        GET a URL, retrying transient failures.
+
+        With a cache, pages the policy marks immutable are served without
+        touching the network and others are revalidated with If-None-Match /
+        If-Modified-Since. ``limiter`` (a TokenBucket) is only consulted when a
+        request actually goes out. The response has ``from_cache`` set.
+
+        Returns the successful response. Raises ``requests.exceptions.RequestException``
+        for non-retryable errors or once retries are exhausted.
+        """
+        entry, cached_body = self.cache.lookup(url) if self.cache is not None else (None, None)
+        if entry is not None and self.cache_policy(url) == 'immutable':
+            self.cache.touch(url)
+            self._count("cache_hits")
+            return self._cached_response(url, cached_body)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._fetch(url, request_headers, timeout, limiter)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            self._count("cache_revalidated")
+            return self._cached_response(url, cached_body)
+
+        if self.cache is not None:
+            self.cache.store(url, response.content,
+                             etag=response.headers.get('ETag'),
+                             last_modified=response.headers.get('Last-Modified'))
+        response.from_cache = False
+        return response
+
+    def _cached_response(self, url, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        response.from_cache = True
+        return response
+
+    def _fetch(self, url, headers, timeout, limiter):
+        slot = self._slot(url)
+        attempt = 0
+        while True:
+            response = None
+            error = None
+            if limiter is not None:
+                limiter.acquire()
+            with slot:
+                self._count("requests")
+                try:
+                    response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error = e
+
+            if error is None and response.status_code not in RETRYABLE_STATUS_CODES:
+                response.raise_for_status()
+                return response
+
+            if attempt >= self.max_retries:
+                self._count("failures")
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+
+            delay = self._retry_delay(attempt, response)
+            status = error if error is not None else f"HTTP {response.status_code}"
+            print(f"Retrying {url} in {delay:.1f}s ({status})")
+            self._count("retries")
+            attempt += 1
+            time.sleep(delay)
+
+    def connection_stats(self):
+        """Request counts plus how many connections were opened vs. reused."""
+        opened = 0
+        pooled_requests = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    pooled_requests += pool.num_requests
+        return {
+            "requests": self.stats["requests"],
+            "retries": self.stats["retries"],
+            "failures": self.stats["failures"],
+            "cache_hits": self.stats["cache_hits"],
+            "cache_revalidated": self.stats["cache_revalidated"],
+            "connections_opened": opened,
+            "connections_reused": max(0, pooled_requests - opened),
+        }
+
+    def report(self):
+        return report_connection_stats(self.connection_stats(), self.cache)
+
+    def close(self):
+        self.session.close()
+
+
+def report_connection_stats(stats, cache=None):
+    """Print connection_stats() counts, possibly summed over several clients, and the cache size."""
+    print(f"🌐 HTTP: {stats['requests']} requests, {stats['retries']} retries, "
+          f"{stats['failures']} failures, {stats['connections_opened']} connections opened, "
+          f"{stats['connections_reused']} reused")
+    if cache is not None:
+        print(f"🗄️ Page cache: {stats['cache_hits']} served offline, "
+              f"{stats['cache_revalidated']} revalidated (304), "
+              f"{len(cache)} pages / {cache.total_bytes() / 1024:.0f} KB stored")
+    return stats
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """Process-wide FetchClient shared by every scraper that isn't given one."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = FetchClient()
+        return _default_client
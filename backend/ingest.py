@@ -0,0 +1,318 @@
+import csv
+import json
+import os
+import shutil
+import threading
+from collections import defaultdict
+from datetime import datetime
+from itertools import chain
+
+import pandas as pd
+
+from season_state import SeasonState
+from teams import TEAM_INDEX
+
+# Column order of backend/data/nba_*_final_data.csv ('' is the overtime column).
+SEASON_CSV_COLUMNS = [
+    'Date', 'Visitor/Neutral', 'PTS', 'Home/Neutral', '', 'Visitor_PTS', 'Home_PTS', 'Month', 'Season',
+    'Recent Wins (Home)', 'Recent Losses (Home)', 'Recent Win % (Home)',
+    'Recent Wins (Visitor)', 'Recent Losses (Visitor)', 'Recent Win % (Visitor)',
+    'Matchup Wins (Home)', 'Matchup Wins (Visitor)', 'Total Matchups',
+    'DSLG (Visitor)', 'DSLG (Home)',
+    'Wins (Home)', 'Losses (Home)', 'Wins (Visitor)', 'Losses (Visitor)',
+]
+
+# Raw CSV columns renamed for serving.
+SEASON_COLUMN_MAPPING = {
+    'Home/Neutral': 'home_team',
+    'Visitor/Neutral': 'visitor_team',
+    'Home_PTS': 'home_pts',
+    'Visitor_PTS': 'visitor_pts',
+    'Wins (Home)': 'home_wins',
+    'Losses (Home)': 'home_losses',
+    'Wins (Visitor)': 'visitor_wins',
+    'Losses (Visitor)': 'visitor_losses'
+}
+
+
+def _upper_team_names(names):
+    """Strip and upper-case team names; categoricals are renamed per category, staying categorical."""
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        categories = names.cat.categories.str.strip().str.upper()
+        if categories.is_unique:
+            return names.cat.rename_categories(categories)
+        # Spellings differing only in case or spacing merge into one category
+        return names.astype(str).str.strip().str.upper().astype('category')
+    return names.str.strip().str.upper()
+
+
+def prepare_season_frame(df):
+    """Clean team names, rename columns and add int8 team ids and the home_win label for serving."""
+    df['Home/Neutral'] = _upper_team_names(df['Home/Neutral'])
+    df['Visitor/Neutral'] = _upper_team_names(df['Visitor/Neutral'])
+    df = df.rename(columns=SEASON_COLUMN_MAPPING)
+    df['home_id'] = TEAM_INDEX.ids(df['home_team'])
+    df['visitor_id'] = TEAM_INDEX.ids(df['visitor_team'])
+    # Nullable scores compare to <NA> for unplayed games, which are not home wins
+    df['home_win'] = (df['home_pts'] > df['visitor_pts']).fillna(False).astype(int)
+    return df
+
+
+def season_csv_path(data_dir, season):
+    return os.path.join(data_dir, f'nba_{season.replace("-", "_")}_final_data.csv')
+
+
+def season_for_date(date):
+    """NBA seasons start in October, so Aug-Dec games belong to the season ending next year."""
+    if date.month >= 8:
+        return f"{date.year}-{date.year + 1}"
+    return f"{date.year - 1}-{date.year}"
+
+
+def _parse_date(value):
+    if isinstance(value, str):
+        try:
+            return pd.Timestamp(datetime.strptime(value.strip(), '%a %b %d %Y'))
+        except ValueError:
+            pass
+    try:
+        return pd.Timestamp(value).normalize()
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid date: {value}")
+
+
+def normalize_result(payload, team_lookup):
+    """
+    Validate one finished game from an ingest payload.
+
+    Accepts ``date`` (YYYY-MM-DD or 'Tue Oct 22 2024'), ``home_team`` and
+    ``visitor_team`` (abbreviation or full name), ``home_pts``, ``visitor_pts``
+    and optional ``season`` and ``overtime`` (e.g. 'OT').
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Each result must be a JSON object")
+
+    missing = [key for key in ('date', 'home_team', 'visitor_team', 'home_pts', 'visitor_pts')
+               if payload.get(key) in (None, '')]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+    date = _parse_date(payload['date'])
+    home = team_lookup.get(str(payload['home_team']).strip().upper())
+    visitor = team_lookup.get(str(payload['visitor_team']).strip().upper())
+    if not home or not visitor:
+        raise ValueError(f"Unknown team: {payload['home_team'] if not home else payload['visitor_team']}")
+    if home == visitor:
+        raise ValueError("Home and visitor teams must be different")
+
+    try:
+        home_pts = int(payload['home_pts'])
+        visitor_pts = int(payload['visitor_pts'])
+    except (ValueError, TypeError):
+        raise ValueError("Points must be integers")
+    if home_pts <= 0 or visitor_pts <= 0 or home_pts == visitor_pts:
+        raise ValueError("Only finished games with a winner can be ingested")
+
+    return {
+        'date': date,
+        'season': payload.get('season') or season_for_date(date),
+        'home': home,
+        'visitor': visitor,
+        'home_pts': home_pts,
+        'visitor_pts': visitor_pts,
+        'overtime': payload.get('overtime') or '',
+    }
+
+
+def build_csv_row(game, state):
+    """Apply a game to the season state and return its row in the season CSV schema."""
+    date, home, visitor = game['date'], game['home'], game['visitor']
+    derived = state.derived_columns(date, home, visitor)
+    state.apply_game(date, home, visitor, game['home_pts'], game['visitor_pts'])
+    matchup = state.matchup(home, visitor)
+
+    row = {
+        'Date': date.strftime('%a %b %d %Y'),
+        'Visitor/Neutral': TEAM_INDEX.display_name(TEAM_INDEX.id(visitor)),
+        'PTS': game['home_pts'],
+        'Home/Neutral': TEAM_INDEX.display_name(TEAM_INDEX.id(home)),
+        '': game['overtime'],
+        'Visitor_PTS': game['visitor_pts'],
+        'Home_PTS': game['home_pts'],
+        'Month': date.strftime('%B').lower(),
+        'Season': game['season'],
+        'Matchup Wins (Home)': matchup['home_wins'],
+        'Matchup Wins (Visitor)': matchup['away_wins'],
+        'Total Matchups': matchup['total_games'],
+    }
+    row.update(derived)
+    return row
+
+
+def write_season_rows(csv_path, rows, fieldnames=None, append=False, chunk_size=500):
+    """
+    Stream rows into a season CSV without holding them all in memory.
+
+    A new file is written under a temporary name and renamed into place when
+    complete, so readers never see half a season. With ``append`` the rows go
+    after the existing ones, keeping the file's column order. Columns default
+    to the first row's keys. Returns the number of rows written.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    exists = os.path.exists(csv_path) and os.path.getsize(csv_path) > 0
+    if append and exists:
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f))
+    fieldnames = fieldnames or list(first)
+
+    os.makedirs(os.path.dirname(csv_path) or '.', exist_ok=True)
+    target = csv_path if append else f"{csv_path}.tmp"
+    written = 0
+    with open(target, 'a' if append else 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        if not (append and exists):
+            writer.writeheader()
+        for row in chain([first], rows):
+            writer.writerow(row)
+            written += 1
+            if written % chunk_size == 0:
+                f.flush()
+        f.flush()
+        os.fsync(f.fileno())
+
+    if not append:
+        os.replace(target, csv_path)
+    return written
+
+
+def append_season_rows(csv_path, rows):
+    """Durably append rows to a season CSV, keeping the file's existing column order."""
+    write_season_rows(csv_path, rows, fieldnames=SEASON_CSV_COLUMNS, append=True)
+
+
+def ingest_results(payloads, season_data, season_states, team_lookup, data_dir=None):
+    """
+    Append finished games to the in-memory season store and its indexes.
+
+    Only the affected season's state is touched: each new game updates team
+    records, form windows and head-to-head counts in O(1). Games already in the
+    store are skipped, and rows are appended to the season CSV when ``data_dir``
+    is given.
+
+    Returns:
+        dict: Counts, per-game errors, affected teams per season and the new
+        rows per season as serving frames (under ``frames``).
+    """
+    errors = []
+    games = []
+    for index, payload in enumerate(payloads):
+        try:
+            games.append(normalize_result(payload, team_lookup))
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+
+    games.sort(key=lambda g: g['date'])
+
+    new_rows = defaultdict(list)
+    affected_teams = defaultdict(set)
+    duplicates = 0
+    for game in games:
+        season = game['season']
+        state = season_states.get(season)
+        if state is None:
+            state = SeasonState.from_frame(season_data.get(season))
+            season_states[season] = state
+
+        if state.has_game(game['date'], game['home'], game['visitor']):
+            duplicates += 1
+            continue
+
+        stale = [team for team in (game['home'], game['visitor'])
+                 if state.last_played.get(team) is not None and game['date'] < state.last_played[team]]
+        if stale:
+            errors.append({
+                'game': f"{game['date'].date()} {game['visitor']} @ {game['home']}",
+                'error': f"Game predates the latest result already stored for {', '.join(stale)}",
+            })
+            continue
+
+        new_rows[season].append(build_csv_row(game, state))
+        affected_teams[season].update((game['home'], game['visitor']))
+
+    frames = {}
+    for season, rows in new_rows.items():
+        if data_dir:
+            append_season_rows(season_csv_path(data_dir, season), rows)
+
+        frame = pd.DataFrame(rows, columns=SEASON_CSV_COLUMNS).rename(columns={'': 'Unnamed: 4'})
+        frame = prepare_season_frame(frame)
+        existing = season_data.get(season)
+        season_data[season] = frame if existing is None else pd.concat([existing, frame], ignore_index=True)
+        frames[season] = frame
+
+    return {
+        'ingested': sum(len(rows) for rows in new_rows.values()),
+        'duplicates': duplicates,
+        'errors': errors,
+        'affected_teams': {season: sorted(teams) for season, teams in affected_teams.items()},
+        'frames': frames,
+    }
+
+
+def load_drop_file(path):
+    """Read results from a dropped .json (list or {"games": [...]}) or .csv file."""
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('games', []) if isinstance(data, dict) else data
+    return pd.read_csv(path).to_dict('records')
+
+
+class IngestWatcher(threading.Thread):
+    """
+    Poll a directory for dropped result files and feed them to ``handler``.
+
+    Writers should create files under a temporary name and rename them into
+    place. Processed files move to ``processed/``, unreadable ones to ``failed/``.
+    """
+
+    def __init__(self, directory, handler, interval=5.0):
+        super().__init__(daemon=True, name='ingest-watcher')
+        self.directory = directory
+        self.handler = handler
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.poll_once()
+            self._stop_event.wait(self.interval)
+
+    def poll_once(self):
+        """Ingest every ready file in the directory; returns the number of files handled."""
+        if not os.path.isdir(self.directory):
+            return 0
+
+        handled = 0
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if name.startswith('.') or not name.endswith(('.json', '.csv')) or not os.path.isfile(path):
+                continue
+            try:
+                summary = self.handler(load_drop_file(path))
+                print(f"📥 Ingested {summary['ingested']} games from {name}")
+                target = 'processed'
+            except Exception as e:
+                print(f"❌ Failed to ingest {name}: {str(e)}")
+                target = 'failed'
+            os.makedirs(os.path.join(self.directory, target), exist_ok=True)
+            shutil.move(path, os.path.join(self.directory, target, name))
+            handled += 1
+        return handled
@@ -0,0 +1,62 @@
+import hashlib
+import os
+from datetime import datetime
+
+import joblib
+
+# Bump when the bundle's keys change meaning
+BUNDLE_FORMAT_VERSION = 1
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_bundle(base_dir, model, scaler, feature_names, name=None):
+    """
+    Write scaler, model and feature schema as one uncompressed joblib file.
+
+    Uncompressed joblib stores numpy arrays as raw aligned buffers, so
+    ``load_bundle`` can memory-map them read-only and every worker process
+    serving the same file shares one copy in the page cache. The file is
+    written under a temporary name and renamed into place, and its SHA-256
+    is returned for model_metadata.json.
+
+    Returns:
+        (str, str): bundle file name (relative to ``base_dir``) and its SHA-256.
+    """
+    name = name or f"model_bundle_{datetime.now().strftime('%Y_%m_%d_%H%M%S')}.joblib"
+    bundle = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'feature_names': list(feature_names),
+        'scaler': scaler,
+        'model': model,
+    }
+    path = os.path.join(base_dir, name)
+    tmp_path = f"{path}.tmp"
+    joblib.dump(bundle, tmp_path)
+    checksum = file_sha256(tmp_path)
+    os.replace(tmp_path, path)
+    return name, checksum
+
+
+def load_bundle(path, expected_sha256, mmap_mode='r'):
+    """
+    Load a bundle after checking it against the checksum recorded at save time.
+
+    Raises:
+        ValueError: the file doesn't match ``expected_sha256`` (a torn or
+        replaced write) or isn't a bundle this code understands.
+    """
+    actual = file_sha256(path)
+    if actual != expected_sha256:
+        raise ValueError(f"Checksum mismatch for {os.path.basename(path)}: expected {expected_sha256}, got {actual}")
+    bundle = joblib.load(path, mmap_mode=mmap_mode)
+    if not isinstance(bundle, dict) or bundle.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format in {os.path.basename(path)}")
+    return bundle
@@ -0,0 +1,304 @@
+import math
+import os
+import time
+import warnings
+
+import numpy as np
+from joblib import effective_n_jobs
+from scipy.stats import loguniform, randint, uniform
+from sklearn.base import clone
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.frozen import FrozenEstimator
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import HalvingRandomSearchCV, StratifiedKFold, train_test_split
+
+# Candidate families for --search-budget. Linear models are halved over
+# training rows, boosting over boosting iterations.
+MODEL_FAMILIES = {
+    'logistic_l2': {
+        'estimator': LogisticRegression(solver='lbfgs', max_iter=5000, random_state=42),
+        'params': {'C': loguniform(1e-3, 1e2), 'class_weight': [None, 'balanced']},
+        'resource': 'n_samples',
+    },
+    'logistic_elasticnet': {
+        'estimator': LogisticRegression(solver='saga', max_iter=5000, random_state=42),
+        'params': {'C': loguniform(1e-3, 1e2), 'l1_ratio': uniform(0, 1)},
+        'resource': 'n_samples',
+    },
+    'hist_gradient_boosting': {
+        'estimator': HistGradientBoostingClassifier(early_stopping=False, random_state=42),
+        'params': {
+            'learning_rate': loguniform(0.01, 0.3),
+            'max_leaf_nodes': randint(4, 32),
+            'min_samples_leaf': randint(10, 100),
+            'l2_regularization': loguniform(1e-3, 10),
+        },
+        'resource': 'max_iter',
+        'max_resources': 300,
+    },
+}
+
+# Candidates are compared on a validation split of the training rows, so the
+# test split stays untouched for the final report. Candidates scoring within
+# this much validation accuracy of the best one count as tied, and the tie goes to the lowest p99 latency. p99s within
+# P99_TOLERANCE (relative) of the fastest are timing noise, so among those the
+# more accurate candidate wins.
+ACCURACY_TOLERANCE = 0.005
+P99_TOLERANCE = 0.25
+VALIDATION_FRACTION = 0.2
+HALVING_FACTOR = 3
+MAX_HALVING_ITERATIONS = 4  # at most 81 candidates per family
+# Fewer rows than this leave CV folds too small to score ROC AUC reliably
+MIN_HALVING_SAMPLES = 250
+LATENCY_REQUESTS = 300
+
+
+def latency_percentiles(models, X, requests=LATENCY_REQUESTS):
+    """
+    p50/p99 milliseconds for single-row predict_proba calls, as GamePredictor makes them.
+
+    ``models`` maps names to fitted models; rows are cycled from ``X``
+    (already scaled). Requests alternate between the models so background
+    noise hits every candidate alike.
+
+    Returns:
+        dict: name -> {'p50_ms', 'p99_ms'}.
+    """
+    rows = [X[i % len(X)].reshape(1, -1) for i in range(requests)]
+    timings = {name: np.empty(requests) for name in models}
+    for model in models.values():
+        model.predict_proba(rows[0])  # warm up
+    for i, row in enumerate(rows):
+        for name, model in models.items():
+            start = time.perf_counter()
+            model.predict_proba(row)
+            timings[name][i] = time.perf_counter() - start
+    return {
+        name: {
+            'p50_ms': float(round(np.percentile(values, 50) * 1000, 4)),
+            'p99_ms': float(round(np.percentile(values, 99) * 1000, 4)),
+        }
+        for name, values in timings.items()
+    }
+
+
+def _halving_schedule(n_candidates, min_resources, max_resources):
+    """(candidates, resource) of each iteration HalvingRandomSearchCV runs, without aggressive elimination."""
+    n_required = 1 + int(math.floor(math.log(n_candidates, HALVING_FACTOR) + 1e-9))
+    if min_resources == 'exhaust':
+        min_resources = max(1, max_resources // HALVING_FACTOR ** (n_required - 1))
+    n_possible = 1 + int(math.floor(math.log(max(max_resources // min_resources, 1), HALVING_FACTOR) + 1e-9))
+    return [(math.ceil(n_candidates / HALVING_FACTOR ** i), min(min_resources * HALVING_FACTOR ** i, max_resources))
+            for i in range(min(n_required, n_possible))]
+
+
+def _latency_seconds(model, X, calls=5):
+    """Estimated seconds latency_percentiles spends on ``model``, from a few single-row calls."""
+    start = time.perf_counter()
+    for i in range(calls):
+        model.predict_proba(X[i % len(X)].reshape(1, -1))
+    return (time.perf_counter() - start) / calls * (LATENCY_REQUESTS + 1)
+
+
+def _halving_search(family, n_candidates, cv, n_jobs, **search_kwargs):
+    return HalvingRandomSearchCV(
+        family['estimator'],
+        family['params'],
+        n_candidates=n_candidates,
+        factor=HALVING_FACTOR,
+        resource=family['resource'],
+        scoring='roc_auc',
+        cv=cv,
+        n_jobs=n_jobs,
+        random_state=42,
+        refit=False,
+        **search_kwargs,
+    )
+
+
+def _plan_search(family, X, y, cv, budget, calibration_folds, n_jobs):
+    """
+    The largest halving search, with its calibration, that fits in ``budget`` seconds.
+
+    A miniature search (HALVING_FACTOR candidates at the smallest resource)
+    measures what one CV fit really costs there, scoring and joblib dispatch
+    included; one fit at the full resource adds the per-resource cost. A
+    search is then priced by its actual fits (candidates x folds at each
+    iteration's resource, the MIN_HALVING_SAMPLES floor included) plus the
+    calibrated fit on the search rows, its refit should the family win, and
+    the latency measurement. The probes' own time is charged to ``budget``.
+
+    Returns:
+        dict: ``n_candidates`` and ``search_kwargs`` for HalvingRandomSearchCV
+        and the ``planned_seconds``, or ``skipped`` with the reason.
+    """
+    start = time.perf_counter()
+    n_rows, folds = len(y), cv.get_n_splits()
+    small_rows = min(MIN_HALVING_SAMPLES, n_rows)
+    if family['resource'] == 'n_samples':
+        max_resources = n_rows
+        small = small_rows
+        probe_kwargs = {'min_resources': small}
+    else:
+        max_resources = family['max_resources']
+        small = max(1, max_resources // HALVING_FACTOR ** MAX_HALVING_ITERATIONS)
+        probe_kwargs = {'min_resources': small, 'max_resources': small * HALVING_FACTOR}
+    probe_search = _halving_search(family, HALVING_FACTOR, cv, n_jobs, **probe_kwargs).fit(X, y)
+    cells = sum(probe_search.n_candidates_) * folds
+    floor = (time.perf_counter() - start) / cells
+
+    def plan(k, full_fit=0.0, fixed=0.0):
+        n_candidates = HALVING_FACTOR ** k
+        if family['resource'] == 'n_samples':
+            search_kwargs = {'min_resources': min(max(n_rows // n_candidates, MIN_HALVING_SAMPLES), n_rows)}
+        else:
+            search_kwargs = {'min_resources': 'exhaust', 'max_resources': max_resources}
+        schedule = _halving_schedule(n_candidates, search_kwargs['min_resources'], max_resources)
+        seconds = fixed + sum(count * folds * (floor + full_fit * resources / max_resources)
+                              for count, resources in schedule)
+        return {'n_candidates': n_candidates, 'search_kwargs': search_kwargs, 'planned_seconds': round(seconds, 3)}
+
+    # The smallest search's per-fit floor alone can rule the family out before the full-size probe
+    planned = plan(1)['planned_seconds']
+    if planned > budget - (time.perf_counter() - start):
+        return {'skipped': f'the smallest search needs over {planned:.1f}s of '
+                           f'{max(budget - (time.perf_counter() - start), 0):.1f}s left'}
+
+    fit_start = time.perf_counter()
+    probe = clone(family['estimator'])
+    if family['resource'] == 'n_samples':
+        probe.fit(X, y)
+        full_fit = time.perf_counter() - fit_start
+    else:
+        # A third of the resource, scaled up: boosting time grows linearly with iterations
+        probe.set_params(**{family['resource']: max_resources // HALVING_FACTOR}).fit(X, y)
+        full_fit = (time.perf_counter() - fit_start) * HALVING_FACTOR
+    # Served models are calibrated, one calibrated copy per calibration fold
+    calibrated = CalibratedClassifierCV(FrozenEstimator(probe), method='sigmoid').fit(X[:small_rows], y[:small_rows])
+    latency = _latency_seconds(calibrated, X) * calibration_folds
+
+    fixed = 2 * calibration_folds * full_fit + latency
+    remaining = budget - (time.perf_counter() - start)
+    for k in range(MAX_HALVING_ITERATIONS, 0, -1):
+        candidate = plan(k, full_fit, fixed)
+        planned = candidate['planned_seconds']
+        if planned <= remaining:
+            return candidate
+    return {'skipped': f'the smallest search needs ~{planned:.1f}s of {max(remaining, 0):.1f}s left'}
+
+
+def search_model_families(X_train, y_train, budget_seconds=60.0, n_jobs=-1,
+                          families=None, baseline=None, calibration_cv=5):
+    """
+    Successive-halving search over MODEL_FAMILIES under a wall-clock budget.
+
+    Only the training rows are used: VALIDATION_FRACTION of them are held
+    out for choosing, so the caller's test split stays an unbiased report
+    of the winner. Each family gets an equal share of what is left of
+    ``budget_seconds`` (less the time the final latency measurement of the
+    baseline will take), sized by _plan_search into the largest
+    HalvingRandomSearchCV whose fits, calibration and probes fit in it; a
+    family that cannot fit even the smallest search is skipped. ``n_jobs``
+    is capped at the core count. Each family's winner is sigmoid-calibrated like the
+    production model on the rest of the rows and scored on the validation
+    rows; then all of them are timed on single-row predictions.
+    ``baseline``, an (name, model) pair already fitted on all of
+    ``X_train``, competes as well, refitted the same way.
+
+    Candidates within ACCURACY_TOLERANCE of the best validation accuracy
+    are tied; among them the ones within P99_TOLERANCE of the lowest p99
+    latency stay, and the most accurate of those wins. The winner is refit
+    on all of ``X_train`` (the baseline is returned as given).
+
+    Returns:
+        dict: winner name, fitted winner ``model``, ``candidates`` (one
+        report per family) and the budget actually spent.
+    """
+    families = families or list(MODEL_FAMILIES)
+    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    calibration_folds = calibration_cv if isinstance(calibration_cv, int) else len(calibration_cv)
+    # Worker processes beyond the core count only add start-up time the budget has to pay for
+    n_jobs = min(effective_n_jobs(n_jobs), os.cpu_count() or 1)
+    search_start = time.perf_counter()
+    candidates, models = [], {}
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=VALIDATION_FRACTION, random_state=42, stratify=y_train
+    )
+
+    reserved = 0.0  # timing the baseline's latency at the end
+    if baseline is not None:
+        name, model = baseline
+        models[name] = clone(model).fit(X_fit, y_fit)
+        reserved = _latency_seconds(models[name], X_val)
+        candidates.append({
+            'family': name,
+            'params': None,
+            'validation_accuracy': float(round(accuracy_score(y_val, models[name].predict(X_val)), 6)),
+        })
+
+    for index, name in enumerate(families):
+        family = MODEL_FAMILIES[name]
+        remaining = budget_seconds - reserved - (time.perf_counter() - search_start)
+        share = remaining / (len(families) - index)
+        report = {'family': name}
+        if share <= 0:
+            candidates.append({**report, 'skipped': 'budget exhausted'})
+            continue
+
+        family_start = time.perf_counter()
+        with warnings.catch_warnings():
+            # saga on small halving subsets may stop at max_iter; the full refit is what gets scored
+            warnings.simplefilter('ignore', ConvergenceWarning)
+            plan = _plan_search(family, X_fit, y_fit, cv, share, calibration_folds, n_jobs)
+            if 'skipped' in plan:
+                candidates.append({**report, 'skipped': plan['skipped']})
+                continue
+            n_candidates = plan['n_candidates']
+            search = _halving_search(family, n_candidates, cv, n_jobs, **plan['search_kwargs'])
+            search.fit(X_fit, y_fit)
+            best = clone(family['estimator']).set_params(**search.best_params_)
+            model = CalibratedClassifierCV(estimator=best, method='sigmoid', cv=calibration_cv)
+            model.fit(X_fit, y_fit)
+
+        models[name] = model
+        candidates.append({
+            **report,
+            'params': {key: (value.item() if hasattr(value, 'item') else value)
+                       for key, value in search.best_params_.items()},
+            'cv_roc_auc': float(round(search.best_score_, 6)),
+            'n_candidates': n_candidates,
+            'planned_seconds': plan['planned_seconds'],
+            'halving_iterations': int(search.n_iterations_),
+            'search_seconds': round(time.perf_counter() - family_start, 3),
+            'validation_accuracy': float(round(accuracy_score(y_val, model.predict(X_val)), 6)),
+        })
+
+    latencies = latency_percentiles(models, X_val)
+    for candidate in candidates:
+        candidate.update(latencies.get(candidate['family'], {}))
+    scored = [c for c in candidates if 'validation_accuracy' in c]
+    if not scored:
+        raise ValueError(f"No model family fits a {budget_seconds}s search budget")
+    best_accuracy = max(c['validation_accuracy'] for c in scored)
+    tied = [c for c in scored if c['validation_accuracy'] >= best_accuracy - ACCURACY_TOLERANCE]
+    fastest = min(c['p99_ms'] for c in tied)
+    fast_enough = [c for c in tied if c['p99_ms'] <= fastest * (1 + P99_TOLERANCE)]
+    # max keeps the first of equals, so the baseline wins exact ties
+    winner = max(fast_enough, key=lambda c: c['validation_accuracy'])['family']
+    if baseline is not None and winner == baseline[0]:
+        model = baseline[1]
+    else:
+        model = clone(models[winner]).fit(X_train, y_train)
+    return {
+        'winner': winner,
+        'model': model,
+        'candidates': candidates,
+        'budget_seconds': budget_seconds,
+        'elapsed_seconds': round(time.perf_counter() - search_start, 3),
+        'accuracy_tolerance': ACCURACY_TOLERANCE,
+        'p99_tolerance': P99_TOLERANCE,
+    }
@@ -3,42 +3,13 @@ import joblib
 import os
 import glob
 import json
-
-# Team abbreviations dictionary
-TEAM_ABBREVIATIONS = {
-    # Eastern Conference
-    "ATL": "ATLANTA HAWKS",
-    "BOS": "BOSTON CELTICS",
-    "BKN": "BROOKLYN NETS",
-    "CHA": "CHARLOTTE HORNETS",
-    "CHI": "CHICAGO BULLS",
-    "CLE": "CLEVELAND CAVALIERS",
-    "DET": "DETROIT PISTONS",
-    "IND": "INDIANA PACERS",
-    "MIA": "MIAMI HEAT",
-    "MIL": "MILWAUKEE BUCKS",
-    "NYK": "NEW YORK KNICKS",
-    "ORL": "ORLANDO MAGIC",
-    "PHI": "PHILADELPHIA 76ERS",
-    "TOR": "TORONTO RAPTORS",
-    "WAS": "WASHINGTON WIZARDS",
-    # Western Conference
-    "DAL": "DALLAS MAVERICKS",
-    "DEN": "DENVER NUGGETS",
-    "GSW": "GOLDEN STATE WARRIORS",
-    "HOU": "HOUSTON ROCKETS",
-    "LAC": "LOS ANGELES CLIPPERS",
-    "LAL": "LOS ANGELES LAKERS",  
-    "MEM": "MEMPHIS GRIZZLIES",
-    "MIN": "MINNESOTA TIMBERWOLVES",
-    "NOP": "NEW ORLEANS PELICANS",
-    "OKC": "OKLAHOMA CITY THUNDER",
-    "PHX": "PHOENIX SUNS",
-    "POR": "PORTLAND TRAIL BLAZERS",
-    "SAC": "SACRAMENTO KINGS",
-    "SAS": "SAN ANTONIO SPURS",
-    "UTA": "UTAH JAZZ"
-}
+from ratings import get_season_ratings, clear_ratings_cache
+from team_stats_store import TeamStatsStore, season_end_year
+from teams import TEAM_INDEX
+from season_state import SeasonState
+from ingest import prepare_season_frame, ingest_results, season_csv_path
+from season_loader import read_season_csvs
+from model_bundle import load_bundle
 
 
 def _resolve_backend_dir():
@@ -80,19 +51,55 @@ def _load_artifact_paths():
 
     return os.path.join(base_dir, 'model.pkl'), os.path.join(base_dir, 'scaler.pkl')
 
+
+def _load_artifact_bundle():
+    """
+    Load the model bundle named in metadata (see model_bundle.py), memory-mapped.
+
+    Returns None when metadata names no bundle or the file fails its
+    checksum, so callers fall back to the separate model/scaler pickles.
+    """
+    metadata_path = os.path.join(_resolve_backend_dir(), 'model_metadata.json')
+    if not os.path.exists(metadata_path):
+        return None
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        bundle_file = metadata.get('bundle_file')
+        checksum = metadata.get('bundle_sha256')
+        if not bundle_file or not checksum:
+            return None
+        bundle = load_bundle(os.path.join(_resolve_backend_dir(), bundle_file), checksum)
+        bundle['file'] = bundle_file
+        return bundle
+    except Exception as e:
+        print(f"⚠️ Ignoring model bundle: {str(e)}")
+        return None
+
 class GamePredictor:
     def __init__(self):
         self.model = None
         self.scaler = None
         self.feature_names = None
+        self.version = 0  # bumped on every successful load so callers can drop stale outputs
     
     def load_model(self, model_path='model.pkl', scaler_path='scaler.pkl'):
         try:
             if model_path == 'model.pkl' and scaler_path == 'scaler.pkl':
+                bundle = _load_artifact_bundle()
+                if bundle is not None:
+                    self.model = bundle['model']
+                    self.scaler = bundle['scaler']
+                    self.feature_names = bundle['feature_names']
+                    print(f"✅ Model bundle loaded successfully: {bundle['file']}")
+                    self.version += 1
+                    return True
                 model_path, scaler_path = _load_artifact_paths()
             self.model = joblib.load(model_path)
             self.scaler = joblib.load(scaler_path)
+            self.feature_names = None
             print(f"✅ Model and scaler loaded successfully: {os.path.basename(model_path)}, {os.path.basename(scaler_path)}")
+            self.version += 1
             return True
         except Exception as e:
             print(f"❌ Error loading model/scaler: {str(e)}")
@@ -140,6 +147,12 @@ class GamePredictor:
             # Prepare features for prediction
             features_df = self.prepare_features(home_stats, away_stats, matchup_stats)
             
+            # Keep only the columns the scaler was fitted on, in its order, so
+            # optional features (e.g. ratings) don't break older artifacts.
+            expected_columns = self.feature_names or getattr(self.scaler, 'feature_names_in_', None)
+            if expected_columns is not None:
+                features_df = features_df.reindex(columns=list(expected_columns), fill_value=0)
+
             # Scale features
             features_scaled = self.scaler.transform(features_df)
             
@@ -220,6 +233,19 @@ class GamePredictor:
             else:
                 features['matchup_home_advantage'] = 0.5  # Neutral
             
+            # Margin-of-victory ratings (only used by models trained with them)
+            features['home_rating'] = home_stats.get('rating', 0.0)
+            features['away_rating'] = away_stats.get('rating', 0.0)
+            features['rating_diff'] = features['home_rating'] - features['away_rating']
+            
+            # Previous-season offensive/defensive ratings vs. league average
+            features['home_off_rating'] = home_stats.get('off_rating', 0.0)
+            features['home_def_rating'] = home_stats.get('def_rating', 0.0)
+            features['away_off_rating'] = away_stats.get('off_rating', 0.0)
+            features['away_def_rating'] = away_stats.get('def_rating', 0.0)
+            features['net_rating_diff'] = ((features['home_off_rating'] - features['home_def_rating'])
+                                           - (features['away_off_rating'] - features['away_def_rating']))
+            
             return pd.DataFrame([features])
             
         except Exception as e:
@@ -232,60 +258,53 @@ class GamePredictor:
                 'away_wins': 0, 'away_losses': 0, 'home_recent_losses': 0,
                 'away_recent_losses': 0, 'matchup_home_wins': 0,
                 'matchup_away_wins': 0, 'matchup_total': 0, 'games_diff': 0,
-                'recent_momentum': 0, 'matchup_home_advantage': 0.5
+                'recent_momentum': 0, 'matchup_home_advantage': 0.5,
+                'home_rating': 0.0, 'away_rating': 0.0, 'rating_diff': 0.0,
+                'home_off_rating': 0.0, 'home_def_rating': 0.0, 'away_off_rating': 0.0,
+                'away_def_rating': 0.0, 'net_rating_diff': 0.0
             }
             return pd.DataFrame([default_features])
     
 # Global variables
 model = None
 season_data = {}
+season_states = {}  # season -> SeasonState index over season_data
+team_ratings = {}  # season -> previous season's relative team ratings
+online_learner = None  # OnlineLearner fed from ingested games, see enable_online_learning
+online_publish = False
 
 def load_model_and_data():
     """Load the trained model and NBA data"""
-    global model, season_data
+    global model, season_data, season_states
     
     try:
         base_dir = _resolve_backend_dir()
 
-        # Load the model
+        # Load the model, preferring the checksummed bundle
+        bundle = _load_artifact_bundle()
         model_path, _ = _load_artifact_paths()
-        if os.path.exists(model_path):
+        if bundle is not None:
+            model = bundle['model']
+            print(f"Model loaded successfully: {bundle['file']}")
+        elif os.path.exists(model_path):
             model = joblib.load(model_path)
             print(f"Model loaded successfully: {os.path.basename(model_path)}")
         else:
             print("Model file 'model.pkl' not found")
             return False
         
-        # Load season data
-        column_mapping = {
-            'Home/Neutral': 'home_team',
-            'Visitor/Neutral': 'visitor_team',
-            'Home_PTS': 'home_pts',
-            'Visitor_PTS': 'visitor_pts',
-            'Wins (Home)': 'home_wins',
-            'Losses (Home)': 'home_losses',
-            'Wins (Visitor)': 'visitor_wins',
-            'Losses (Visitor)': 'visitor_losses'
+        # Load each season's data, reading the available files concurrently
+        season_files = {
+            season: season_csv_path(os.path.join(base_dir, 'data'), season)
+            for season in ["2021-2022", "2022-2023", "2023-2024", "2024-2025"]
         }
-        
-        # Load each season's data
-        for season in ["2021-2022", "2022-2023", "2023-2024", "2024-2025"]:
-            filename = os.path.join(base_dir, 'data', f'nba_{season.replace("-", "_")}_final_data.csv')
-            if os.path.exists(filename):
-                df = pd.read_csv(filename)
-                
-                # Clean team names
-                df['Home/Neutral'] = df['Home/Neutral'].str.strip().str.upper()
-                df['Visitor/Neutral'] = df['Visitor/Neutral'].str.strip().str.upper()
-                
-                # Rename columns
-                df = df.rename(columns=column_mapping)
-                
-                # Add home_win column
-                df['home_win'] = (df['home_pts'] > df['visitor_pts']).astype(int)
-                
-                season_data[season] = df
-                print(f"Loaded {season} data: {len(df)} rows")
+        season_files = {season: path for season, path in season_files.items() if os.path.exists(path)}
+        frames = read_season_csvs(season_files.values())
+        for season, frame in zip(season_files, frames):
+            df = prepare_season_frame(frame)
+            season_data[season] = df
+            season_states[season] = SeasonState.from_frame(df)
+            print(f"Loaded {season} data: {len(df)} rows")
         
         # Try to load a single combined data file if no season files found
         if not season_data:
@@ -338,13 +357,13 @@ def get_team_stats(team_abbr, season):
         print(f"🔍 Getting stats for {team_abbr} in season {season}")
         
         # Check if abbreviation exists
-        if team_abbr not in TEAM_ABBREVIATIONS:
-            print(f"❌ Team abbreviation {team_abbr} not found in TEAM_ABBREVIATIONS")
-            available_abbrs = list(TEAM_ABBREVIATIONS.keys())
-            print(f"Available abbreviations: {available_abbrs}")
+        team_id = TEAM_INDEX.id(team_abbr)
+        if team_id is None:
+            print(f"❌ Team abbreviation {team_abbr} not found in TEAM_INDEX")
+            print(f"Available abbreviations: {list(TEAM_INDEX.nba_codes)}")
             return None
             
-        team_name = TEAM_ABBREVIATIONS[team_abbr]
+        team_name = TEAM_INDEX.name(team_id)
         print(f"✅ Mapped {team_abbr} to {team_name}")
         
         # Check if season data exists
@@ -356,51 +375,34 @@ def get_team_stats(team_abbr, season):
         df = season_data[season]
         print(f"✅ Found season data with {len(df)} rows")
         
-        # Debug: Show unique team names in data
-        unique_home_teams = df['home_team'].unique()
-        unique_visitor_teams = df['visitor_team'].unique()
-        print(f"Sample home teams in data: {unique_home_teams[:5]}")
-        print(f"Sample visitor teams in data: {unique_visitor_teams[:5]}")
+        # Season aggregates come from the incremental index, not a frame scan
+        state = season_states.get(season)
+        if state is None:
+            state = season_states[season] = SeasonState.from_frame(df)
+        stats = state.team_stats(team_name)
         
-        # Check if team exists in data
-        home_games = df[df['home_team'] == team_name]
-        away_games = df[df['visitor_team'] == team_name]
-        
-        print(f"Found {len(home_games)} home games and {len(away_games)} away games for {team_name}")
-        
-        if home_games.empty and away_games.empty:
+        if stats is None:
             print(f"❌ No games found for {team_name}")
             # Try fuzzy matching
             all_teams = set(df['home_team'].unique()) | set(df['visitor_team'].unique())
             similar_teams = [t for t in all_teams if team_abbr in t or any(word in t for word in team_name.split())]
             print(f"Similar teams found: {similar_teams}")
             return None
-            
-        # Calculate stats
-        home_wins = len(home_games[home_games['home_win'] == 1])
-        away_wins = len(away_games[away_games['home_win'] == 0])
-        total_wins = home_wins + away_wins
         
-        home_losses = len(home_games[home_games['home_win'] == 0])
-        away_losses = len(away_games[away_games['home_win'] == 1])
-        total_losses = home_losses + away_losses
+        total_wins = stats['wins']
+        total_losses = stats['losses']
         
-        total_games = len(home_games) + len(away_games)
-        
-        stats = {
-            'wins': total_wins,
-            'losses': total_losses,
-            'games_played': total_games,
-            'win_pct': total_wins / max(total_games, 1),
-            'ppg': 0,
-            'recent_win_pct': 0.5,  # Default for now
-            'recent_losses': 0      # Default for now
-        }
-        
-        # Calculate points per game
-        if total_games > 0:
-            total_points = home_games['home_pts'].sum() + away_games['visitor_pts'].sum()
-            stats['ppg'] = round(total_points / total_games, 1)
+        # Season margin-of-victory rating (cached per season)
+        season_ratings = get_season_ratings(season, df)
+        stats['rating'] = round(season_ratings['ratings'].get(team_name, 0.0), 2)
+
+        # Previous season's offensive/defensive ratings from the team stats store
+        if season not in team_ratings:
+            team_ratings[season] = TeamStatsStore().ratings_table(season_end_year(season) - 1)
+        code = TEAM_INDEX.bbref_code(team_id)
+        if code in team_ratings[season].index:
+            stats['off_rating'] = round(float(team_ratings[season].at[code, 'off_rating']), 2)
+            stats['def_rating'] = round(float(team_ratings[season].at[code, 'def_rating']), 2)
             
         print(f"✅ Stats calculated: W-L: {total_wins}-{total_losses}, PPG: {stats['ppg']}")
         return stats
@@ -416,56 +418,26 @@ def get_matchup_stats(home_abbr, away_abbr, season):
     try:
         print(f"🔍 Getting matchup stats: {home_abbr} vs {away_abbr} in {season}")
         
-        home_team = TEAM_ABBREVIATIONS.get(home_abbr)
-        away_team = TEAM_ABBREVIATIONS.get(away_abbr)
+        home_id = TEAM_INDEX.id(home_abbr)
+        away_id = TEAM_INDEX.id(away_abbr)
         
-        if not home_team or not away_team:
-            print(f"❌ Team mapping failed: {home_abbr}->{home_team}, {away_abbr}->{away_team}")
+        if home_id is None or away_id is None:
+            print(f"❌ Team mapping failed: {home_abbr}->{home_id}, {away_abbr}->{away_id}")
             return {}
+        home_team = TEAM_INDEX.name(home_id)
+        away_team = TEAM_INDEX.name(away_id)
         
         df = season_data.get(season, pd.DataFrame())
         if df.empty:
             print(f"❌ No data for season {season}")
             return {}
             
-        # Find head-to-head games
-        matchups = df[
-            ((df['home_team'] == home_team) & (df['visitor_team'] == away_team)) |
-            ((df['home_team'] == away_team) & (df['visitor_team'] == home_team))
-        ]
-        
-        print(f"Found {len(matchups)} head-to-head games")
+        state = season_states.get(season)
+        if state is None:
+            state = season_states[season] = SeasonState.from_frame(df)
+        result = state.matchup(home_team, away_team)
         
-        if matchups.empty:
-            return {
-                'home_wins': 0,
-                'away_wins': 0,
-                'total_games': 0
-            }
-            
-        # Calculate wins for each team
-        home_wins = 0
-        away_wins = 0
-        
-        for _, row in matchups.iterrows():
-            if row['home_team'] == home_team:
-                # home_team is playing at home
-                if row['home_win'] == 1:
-                    home_wins += 1
-                else:
-                    away_wins += 1
-            else:
-                # home_team is playing away
-                if row['home_win'] == 0:
-                    home_wins += 1  # away team (home_team) won
-                else:
-                    away_wins += 1  # home team (away_team) won
-        
-        result = {
-            'home_wins': home_wins,
-            'away_wins': away_wins,
-            'total_games': len(matchups)
-        }
+        print(f"Found {result['total_games']} head-to-head games")
         
         print(f"✅ Matchup stats: {result}")
         return result
@@ -474,6 +446,54 @@ def get_matchup_stats(home_abbr, away_abbr, season):
         print(f"❌ Error getting matchup stats: {str(e)}")
         return {}
 
+def ingest_games(payloads, data_dir=None):
+    """
+    Ingest finished games into season_data and the per-season indexes.
+
+    New rows are also appended to the season CSVs under backend/data unless
+    another ``data_dir`` is given. Ratings for affected seasons are invalidated.
+    """
+    if data_dir is None:
+        data_dir = os.path.join(_resolve_backend_dir(), 'data')
+
+    summary = ingest_results(payloads, season_data, season_states, TEAM_INDEX.canonical_names, data_dir=data_dir)
+    for season in summary['affected_teams']:
+        clear_ratings_cache(season)
+    if online_learner is not None and summary['frames']:
+        _update_online_learner(summary['frames'])
+    return summary
+
+def enable_online_learning(publish=False):
+    """
+    Update the online learner (see online_model.py) from every ingested game.
+
+    The learner state saved by ``python online_model.py`` is resumed. With
+    ``publish`` each recalibrated version is also served by the predictor.
+    """
+    global online_learner, online_publish
+    from online_model import OnlineLearner
+
+    online_learner = OnlineLearner.load_state()
+    online_publish = publish
+    if online_learner is None:
+        print("⚠️ No online learner state found; run online_model.py to bootstrap it")
+        return False
+    print(f"🔁 Online learning enabled (version {online_learner.version}, {online_learner.rows_seen} games seen)")
+    return True
+
+def _update_online_learner(frames):
+    from online_model import update_from_frames
+
+    try:
+        if update_from_frames(online_learner, frames):
+            model_file, _ = online_learner.save_artifacts(publish=online_publish)
+            print(f"🔁 Online model recalibrated: {model_file}")
+            if online_publish:
+                predictor.load_model()
+        online_learner.save_state()
+    except Exception as e:
+        print(f"⚠️ Online learner update failed: {str(e)}")
+
 # Initialize predictor instance
 predictor = GamePredictor()
 
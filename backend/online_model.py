@@ -0,0 +1,281 @@
+import argparse
+import copy
+import os
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.frozen import FrozenEstimator
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss
+from sklearn.preprocessing import StandardScaler
+
+from feature_store import FeatureStore
+from model_bundle import save_bundle
+from train_model import _calibrated_logit, _resolve_training_files, build_training_dataset, update_model_metadata
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_METADATA_PATH = os.path.join(BACKEND_DIR, 'model_metadata.json')
+DEFAULT_STATE_PATH = os.path.join(BACKEND_DIR, '.cache', 'online', 'learner.joblib')
+DEFAULT_PARAMS = {'C': 0.1, 'class_weight': None, 'solver': 'lbfgs'}
+
+
+class OnlineLearner:
+    """
+    Logistic model updated in place as games arrive.
+
+    Each batch of new games updates a running StandardScaler (partial_fit) and
+    an averaged SGD logistic regression in O(batch rows). The most recent
+    ``calibration_window`` rows are kept, and every ``recalibrate_every`` rows
+    the current scaler and model are snapshotted and sigmoid-calibrated on
+    that window. Each snapshot is a new version; it is what gets predicted
+    with and published, while the live model keeps learning.
+    """
+
+    def __init__(self, alpha=1e-3, recalibrate_every=500, calibration_window=2000, random_state=42):
+        self.recalibrate_every = recalibrate_every
+        self.calibration_window = calibration_window
+        self.scaler = StandardScaler()
+        self.model = SGDClassifier(loss='log_loss', alpha=alpha, average=True, random_state=random_state)
+        self.window_X = None
+        self.window_y = None
+        self.rows_seen = 0
+        self.rows_since_calibration = 0
+        self.version = 0
+        self.served_scaler = None
+        self.served_model = None
+        self.calibrated_at = None
+
+    def partial_fit(self, X, y):
+        """
+        Learn from new rows (a feature DataFrame and labels).
+
+        Returns:
+            bool: True when the batch triggered a recalibration (a new version).
+        """
+        if len(X) == 0:
+            return False
+        y = np.asarray(y, dtype=int)
+        self.scaler.partial_fit(X)
+        self.model.partial_fit(self.scaler.transform(X), y, classes=np.array([0, 1]))
+
+        values = X.to_numpy(dtype=float)
+        if self.window_X is None:
+            self.window_X, self.window_y = values, y
+        else:
+            self.window_X = np.concatenate([self.window_X, values])
+            self.window_y = np.concatenate([self.window_y, y])
+        self.window_X = self.window_X[-self.calibration_window:]
+        self.window_y = self.window_y[-self.calibration_window:]
+
+        self.rows_seen += len(y)
+        self.rows_since_calibration += len(y)
+        if self.rows_since_calibration >= self.recalibrate_every:
+            return self.recalibrate()
+        return False
+
+    def recalibrate(self):
+        """Snapshot the live scaler and model and fit a sigmoid calibration on the recent window."""
+        if self.window_y is None or len(np.unique(self.window_y)) < 2:
+            return False
+        scaler = copy.deepcopy(self.scaler)
+        window = scaler.transform(self._window_frame())
+        calibrated = CalibratedClassifierCV(FrozenEstimator(copy.deepcopy(self.model)), method='sigmoid')
+        calibrated.fit(window, self.window_y)
+
+        self.served_scaler, self.served_model = scaler, calibrated
+        self.rows_since_calibration = 0
+        self.version += 1
+        self.calibrated_at = datetime.now().isoformat()
+        return True
+
+    def _window_frame(self):
+        return pd.DataFrame(self.window_X, columns=self.scaler.feature_names_in_)
+
+    def predict_proba(self, X):
+        """Home-win probabilities from the current version (the live model before the first one)."""
+        if self.served_model is None:
+            return self.model.predict_proba(self.scaler.transform(X))[:, 1]
+        return self.served_model.predict_proba(self.served_scaler.transform(X))[:, 1]
+
+    def save_state(self, path=DEFAULT_STATE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_state(cls, path=DEFAULT_STATE_PATH):
+        return joblib.load(path) if os.path.exists(path) else None
+
+    def save_artifacts(self, base_dir=BACKEND_DIR, publish=False, drift=None):
+        """
+        Write the current version as model_online_<tag>.pkl / scaler_online_<tag>.pkl
+        plus a checksummed bundle (see model_bundle.py).
+
+        The files are recorded under the 'online' key of model_metadata.json.
+        With ``publish`` they also become the top-level model_file/scaler_file
+        and bundle_file that serving loads, and the files they replace are
+        kept under 'online' for rollback.
+        """
+        if self.served_model is None:
+            raise ValueError("No calibrated version to save yet")
+        version_tag = datetime.now().strftime('%Y_%m_%d_%H%M%S')
+        model_file = f'model_online_{version_tag}_v{self.version}.pkl'
+        scaler_file = f'scaler_online_{version_tag}_v{self.version}.pkl'
+        joblib.dump(self.served_model, os.path.join(base_dir, model_file))
+        joblib.dump(self.served_scaler, os.path.join(base_dir, scaler_file))
+        bundle_file, bundle_sha256 = save_bundle(
+            base_dir, self.served_model, self.served_scaler, self.served_scaler.feature_names_in_,
+            name=f'model_bundle_online_{version_tag}_v{self.version}.joblib')
+
+        metadata_path = os.path.join(base_dir, 'model_metadata.json')
+        online = {
+            'version': self.version,
+            'model_file': model_file,
+            'scaler_file': scaler_file,
+            'bundle_file': bundle_file,
+            'bundle_sha256': bundle_sha256,
+            'calibrated_at': self.calibrated_at,
+            'rows_seen': int(self.rows_seen),
+            'calibration_window': self.calibration_window,
+            'recalibrate_every': self.recalibrate_every,
+            'feature_names': list(self.served_scaler.feature_names_in_),
+        }
+        if drift is not None:
+            online['drift'] = drift
+        updates = {'online': online}
+        if publish:
+            previous = update_model_metadata({}, metadata_path)
+            for key in ('model_file', 'scaler_file', 'bundle_file', 'bundle_sha256'):
+                online[f'previous_{key}'] = previous.get(key)
+            updates.update({
+                'model_file': model_file,
+                'scaler_file': scaler_file,
+                'bundle_file': bundle_file,
+                'bundle_sha256': bundle_sha256,
+                'training_mode': 'online',
+            })
+        update_model_metadata(updates, metadata_path)
+        return model_file, scaler_file
+
+
+def update_from_frames(learner, frames):
+    """
+    Feed newly ingested season frames (ingest_results' ``frames``) to the learner.
+
+    Returns:
+        bool: True when any batch produced a new calibrated version.
+    """
+    recalibrated = False
+    for season in sorted(frames):
+        X, y = build_training_dataset(frames[season])
+        recalibrated = learner.partial_fit(X, y) or recalibrated
+    return recalibrated
+
+
+def stream_matrices(learner, matrices, seasons, batch_size=50):
+    """Replay whole seasons through the learner in arrival-sized batches, oldest first."""
+    for season in seasons:
+        X, y = matrices[season]['X'], matrices[season]['y']
+        for start in range(0, len(y), batch_size):
+            learner.partial_fit(X.iloc[start:start + batch_size], y[start:start + batch_size])
+
+
+def _metrics(y_true, prob):
+    return {
+        'accuracy': float(round(accuracy_score(y_true, (prob >= 0.5).astype(int)), 6)),
+        'log_loss': float(round(log_loss(y_true, prob, labels=[0, 1]), 6)),
+        'brier_score': float(round(brier_score_loss(y_true, prob), 6)),
+    }
+
+
+def holdout_drift(matrices, params=None, batch_size=50, **learner_kwargs):
+    """
+    Compare the online learner with the batch model on the latest-season holdout.
+
+    Both train on every earlier season: the batch model in one fit (the
+    calibrated logistic regression train_model uses), the learner by
+    streaming the same rows in ``batch_size`` batches. Both then score the
+    holdout season frozen. The learner is also scored prequentially (each
+    batch predicted, then learned from), which is how it runs once deployed.
+
+    Returns:
+        (dict, OnlineLearner): the drift report and the learner, which has
+        seen every season including the holdout.
+    """
+    seasons = sorted(matrices)
+    if len(seasons) < 2:
+        raise ValueError("The holdout comparison needs at least two seasons")
+    train_seasons, holdout = seasons[:-1], seasons[-1]
+    X_test, y_test = matrices[holdout]['X'], matrices[holdout]['y']
+
+    X_train = np.concatenate([matrices[s]['X'].to_numpy(dtype=float) for s in train_seasons])
+    y_train = np.concatenate([matrices[s]['y'] for s in train_seasons])
+    start = time.perf_counter()
+    batch_scaler = StandardScaler()
+    batch_model = _calibrated_logit(params or DEFAULT_PARAMS)
+    batch_model.fit(batch_scaler.fit_transform(X_train), y_train)
+    batch_seconds = time.perf_counter() - start
+    batch = _metrics(y_test, batch_model.predict_proba(batch_scaler.transform(X_test.to_numpy(dtype=float)))[:, 1])
+
+    learner = OnlineLearner(**learner_kwargs)
+    start = time.perf_counter()
+    stream_matrices(learner, matrices, train_seasons, batch_size)
+    learner.recalibrate()
+    stream_seconds = time.perf_counter() - start
+    online = _metrics(y_test, learner.predict_proba(X_test))
+
+    prequential = np.empty(len(y_test))
+    for start in range(0, len(y_test), batch_size):
+        rows = slice(start, start + batch_size)
+        prequential[rows] = learner.predict_proba(X_test.iloc[rows])
+        learner.partial_fit(X_test.iloc[rows], y_test[rows])
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'holdout_season': holdout,
+        'holdout_games': int(len(y_test)),
+        'batch': batch,
+        'online': online,
+        'online_prequential': _metrics(y_test, prequential),
+        'accuracy_drift': float(round(online['accuracy'] - batch['accuracy'], 6)),
+        'batch_fit_seconds': round(batch_seconds, 3),
+        'online_stream_seconds': round(stream_seconds, 3),
+    }
+    return report, learner
+
+
+def print_drift(report):
+    print(f"\n📉 Online vs batch on the {report['holdout_season']} holdout ({report['holdout_games']} games)")
+    print(f"{'model':<22}{'accuracy':>10}{'log loss':>10}{'brier':>8}")
+    for name, key in (('batch', 'batch'), ('online (frozen)', 'online'), ('online (prequential)', 'online_prequential')):
+        metrics = report[key]
+        print(f"{name:<22}{metrics['accuracy']:>10.3f}{metrics['log_loss']:>10.3f}{metrics['brier_score']:>8.3f}")
+    print(f"Accuracy drift (online - batch): {report['accuracy_drift']:+.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bootstrap the online learner from the season CSVs")
+    parser.add_argument('--batch-size', type=int, default=50, help="Games per partial_fit call while replaying")
+    parser.add_argument('--recalibrate-every', type=int, default=500)
+    parser.add_argument('--publish', action='store_true',
+                        help="Serve the online model (point model_file/scaler_file at it)")
+    parser.add_argument('--no-write', action='store_true', help="Only report drift; save nothing")
+    args = parser.parse_args()
+
+    from backtest import _load_params
+
+    matrices = FeatureStore().load(_resolve_training_files(BACKEND_DIR))
+    report, learner = holdout_drift(matrices, _load_params(DEFAULT_METADATA_PATH), args.batch_size,
+                                    recalibrate_every=args.recalibrate_every)
+    print_drift(report)
+    learner.recalibrate()
+    print(f"Learner has seen {learner.rows_seen} games, version {learner.version}")
+    if not args.no_write:
+        learner.save_state()
+        model_file, scaler_file = learner.save_artifacts(publish=args.publish, drift=report)
+        print(f"💾 Saved {model_file}, {scaler_file}{' (published)' if args.publish else ''}")
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads in one process are coordinated
+    fcntl = None
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'pages')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SEASON_URL_PATTERNS = [
+    re.compile(r'/leagues/NBA_(\d{4})_games'),
+    re.compile(r'/teams/[A-Z]{3}/(\d{4})\.html'),
+]
+
+
+def current_season_end_year(today=None):
+    """
+    End year of the season in progress (or about to start).
+
+    A season ending in year Y is treated as finished from August of year Y,
+    once the playoffs are done.
+    """
+    today = today or date.today()
+    return today.year + 1 if today.month >= 8 else today.year
+
+
+def finished_season_policy(url, today=None):
+    """Return 'immutable' for pages of seasons that are over, else 'revalidate'."""
+    current_end_year = current_season_end_year(today)
+    for pattern in _SEASON_URL_PATTERNS:
+        match = pattern.search(url)
+        if match and int(match.group(1)) < current_end_year:
+            return 'immutable'
+    return 'revalidate'
+
+
+class PageCache:
+    """
+    Persistent, content-addressed cache of fetched pages.
+
+    Bodies are stored once under ``objects/<sha256>``; ``index.json`` maps each
+    URL to its body hash, ETag/Last-Modified validators and last access time.
+    When the stored bodies exceed ``max_bytes`` the least recently used URLs
+    are evicted. Index updates take a file lock and re-read the index first,
+    so several scraper processes can share one cache directory.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(directory, 'objects')
+        self.index_path = os.path.join(directory, 'index.json')
+        self.lock_path = os.path.join(directory, 'index.lock')
+        self._lock = threading.RLock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable page cache index: {str(e)}")
+            return {}
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the thread and file locks with a fresh copy of the index."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    # Pick up entries written by other processes since our last look
+                    self._index = self._load_index()
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest)
+
+    def lookup(self, url):
+        """Return (entry, body) for a cached URL, or (None, None)."""
+        with self._locked():
+            entry = self._index.get(url)
+            if entry is None:
+                return None, None
+            try:
+                with open(self._object_path(entry['sha256']), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                del self._index[url]
+                self._save_index()
+                return None, None
+            return dict(entry), body
+
+    def touch(self, url):
+        """Mark a URL as just used (keeps it away from LRU eviction)."""
+        with self._locked():
+            if url in self._index:
+                self._index[url]['last_access'] = time.time()
+                self._save_index()
+
+    def store(self, url, body, etag=None, last_modified=None):
+        with self._locked():
+            digest = hashlib.sha256(body).hexdigest()
+            object_path = self._object_path(digest)
+            if not os.path.exists(object_path):
+                tmp_path = f"{object_path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, object_path)
+
+            previous = self._index.get(url)
+            now = time.time()
+            self._index[url] = {
+                'sha256': digest,
+                'size': len(body),
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': now,
+                'last_access': now,
+            }
+            if previous and previous['sha256'] != digest:
+                self._release(previous['sha256'])
+            self._evict()
+            self._save_index()
+
+    def _release(self, digest):
+        """Delete a body once no URL references it."""
+        if not any(entry['sha256'] == digest for entry in self._index.values()):
+            try:
+                os.remove(self._object_path(digest))
+            except OSError:
+                pass
+
+    def total_bytes(self):
+        with self._lock:
+            sizes = {entry['sha256']: entry['size'] for entry in self._index.values()}
+            return sum(sizes.values())
+
+    def _evict(self):
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            del self._index[url]
+            if not any(other['sha256'] == entry['sha256'] for other in self._index.values()):
+                total -= entry['size']
+                self._release(entry['sha256'])
+
+    def __len__(self):
+        return len(self._index)
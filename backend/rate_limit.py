@@ -0,0 +1,73 @@
+import multiprocessing
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``. Each
+    ``acquire`` takes one token, sleeping until one is available, so sustained
+    throughput never exceeds ``rate`` while short bursts of ``capacity`` are allowed.
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(max(capacity, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ProcessTokenBucket:
+    """
+    Token bucket shared by several worker processes.
+
+    Same behaviour as TokenBucket, but the token count lives in shared memory
+    behind a process-safe lock, so one global rate holds across all processes
+    it is handed to (e.g. through a pool initializer).
+    """
+
+    def __init__(self, rate, capacity=1, context=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        context = context or multiprocessing.get_context()
+        self.rate = float(rate)
+        self.capacity = float(max(capacity, 1))
+        self._tokens = context.Value('d', self.capacity, lock=False)
+        self._updated = context.Value('d', time.monotonic(), lock=False)
+        self._lock = context.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._updated.value
+                self._tokens.value = min(self.capacity, self._tokens.value + elapsed * self.rate)
+                self._updated.value = now
+                if self._tokens.value >= 1:
+                    self._tokens.value -= 1
+                    return
+                wait = (1 - self._tokens.value) / self.rate
+            time.sleep(wait)
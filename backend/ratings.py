@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import lsqr
+
+# Solved ratings keyed by (season, as_of, method). Cleared per season whenever
+# that season's games change (see clear_ratings_cache).
+_ratings_cache = {}
+
+RATING_FEATURES = ['home_rating', 'away_rating', 'rating_diff']
+
+# Minimum number of played games before pre-game ratings are trusted as features.
+MIN_GAMES_FOR_RATINGS = 150
+
+
+def _first_column(df, candidates):
+    for col in candidates:
+        if col in df.columns:
+            return df[col]
+    raise KeyError(f"None of the columns {candidates} found")
+
+
+def normalize_games(df):
+    """Return a (date, home, visitor, home_pts, visitor_pts) frame from raw or renamed season data."""
+    home = _first_column(df, ['home_team', 'Home/Neutral']).astype(str).str.strip().str.upper()
+    visitor = _first_column(df, ['visitor_team', 'Visitor/Neutral']).astype(str).str.strip().str.upper()
+    home_pts = pd.to_numeric(_first_column(df, ['home_pts', 'Home_PTS']), errors='coerce')
+    visitor_pts = pd.to_numeric(_first_column(df, ['visitor_pts', 'Visitor_PTS']), errors='coerce')
+
+    if 'Date' in df.columns:
+        dates = pd.to_datetime(df['Date'], format='%a %b %d %Y', errors='coerce')
+    else:
+        dates = pd.Series(pd.NaT, index=df.index)
+
+    games = pd.DataFrame({
+        'date': dates,
+        'home': home,
+        'visitor': visitor,
+        'home_pts': home_pts,
+        'visitor_pts': visitor_pts,
+    })
+
+    # Unplayed games carry empty or zero scores and say nothing about strength.
+    played = games['home_pts'].fillna(0).gt(0) & games['visitor_pts'].fillna(0).gt(0)
+    return games[played]
+
+
+def build_design_matrix(games, teams=None, home_court=True):
+    """
+    Build the sparse game x team design matrix for a least-squares rating fit.
+
+    Each game row has +1 in the home team's column and -1 in the visitor's, so
+    that the row dotted with the ratings predicts the home margin of victory.
+    With ``home_court`` an extra all-ones column absorbs home advantage. A final
+    constraint row forces the team ratings to sum to zero.
+
+    Returns:
+        tuple: (A, b, teams) where A is a CSR matrix and b the margin vector.
+    """
+    if teams is None:
+        teams = sorted(set(games['home']) | set(games['visitor']))
+    team_index = {team: i for i, team in enumerate(teams)}
+    n_games = len(games)
+    n_teams = len(teams)
+    n_cols = n_teams + (1 if home_court else 0)
+
+    home_idx = games['home'].map(team_index).to_numpy()
+    visitor_idx = games['visitor'].map(team_index).to_numpy()
+    game_rows = np.arange(n_games)
+
+    rows = [game_rows, game_rows]
+    cols = [home_idx, visitor_idx]
+    vals = [np.ones(n_games), -np.ones(n_games)]
+    if home_court:
+        rows.append(game_rows)
+        cols.append(np.full(n_games, n_teams))
+        vals.append(np.ones(n_games))
+
+    # Sum-to-zero constraint row pins the otherwise free rating offset.
+    rows.append(np.full(n_teams, n_games))
+    cols.append(np.arange(n_teams))
+    vals.append(np.ones(n_teams))
+
+    A = sparse.csr_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_games + 1, n_cols),
+    )
+    margins = (games['home_pts'] - games['visitor_pts']).to_numpy(dtype=float)
+    b = np.append(margins, 0.0)
+    return A, b, teams
+
+
+def solve_ratings(games, method='massey'):
+    """
+    Solve margin-of-victory ratings for a set of played games.
+
+    ``massey`` fits team strength plus a shared home-court term; ``srs`` is the
+    neutral-site Simple Rating System (MOV adjusted for strength of schedule).
+    """
+    if method not in ('massey', 'srs'):
+        raise ValueError(f"Unknown rating method: {method}")
+
+    if games.empty:
+        return {'ratings': {}, 'home_advantage': 0.0, 'games': 0}
+
+    A, b, teams = build_design_matrix(games, home_court=(method == 'massey'))
+    solution = lsqr(A, b, atol=1e-10, btol=1e-10)[0]
+
+    ratings = {team: float(solution[i]) for i, team in enumerate(teams)}
+    home_advantage = float(solution[len(teams)]) if method == 'massey' else 0.0
+    return {
+        'ratings': ratings,
+        'home_advantage': home_advantage,
+        'games': int(len(games)),
+    }
+
+
+def _as_of_key(as_of):
+    if as_of is None:
+        return None
+    return pd.Timestamp(as_of).normalize()
+
+
+def get_season_ratings(season, df, as_of=None, method='massey'):
+    """
+    Return cached ratings for a season using games played strictly before ``as_of``.
+
+    ``as_of=None`` uses every played game in ``df``.
+    """
+    as_of_key = _as_of_key(as_of)
+    cache_key = (season, as_of_key, method)
+    if cache_key in _ratings_cache:
+        return _ratings_cache[cache_key]
+
+    games = normalize_games(df)
+    if as_of_key is not None:
+        games = games[games['date'] < as_of_key]
+
+    result = solve_ratings(games, method=method)
+    _ratings_cache[cache_key] = result
+    return result
+
+
+def clear_ratings_cache(season=None):
+    """Drop cached ratings for one season, or for all seasons."""
+    if season is None:
+        _ratings_cache.clear()
+        return
+    for key in [k for k in _ratings_cache if k[0] == season]:
+        del _ratings_cache[key]
+
+
+def add_rating_features(df, season_column='__season_key', method='massey'):
+    """
+    Attach pre-game ratings for both teams to every row.
+
+    Ratings for a game only use games played on earlier dates of the same
+    season, so the features carry no information about the game's own result.
+    Rows before ``MIN_GAMES_FOR_RATINGS`` games have been played get 0.
+    """
+    out = df.copy()
+    home_rating = pd.Series(0.0, index=df.index)
+    away_rating = pd.Series(0.0, index=df.index)
+
+    games = normalize_games(df)
+    all_dates = pd.to_datetime(df['Date'], format='%a %b %d %Y', errors='coerce') \
+        if 'Date' in df.columns else pd.Series(pd.NaT, index=df.index)
+    home_names = _first_column(df, ['home_team', 'Home/Neutral']).astype(str).str.strip().str.upper()
+    away_names = _first_column(df, ['visitor_team', 'Visitor/Neutral']).astype(str).str.strip().str.upper()
+
+    if season_column in df.columns:
+        seasons = df[season_column]
+    else:
+        seasons = pd.Series('all', index=df.index)
+
+    for season, season_index in df.groupby(seasons, sort=False).groups.items():
+        season_games = games.loc[games.index.intersection(season_index)]
+        season_dates = all_dates.loc[season_index]
+        for game_date, date_index in season_dates.groupby(season_dates).groups.items():
+            prior = season_games[season_games['date'] < game_date]
+            if len(prior) < MIN_GAMES_FOR_RATINGS:
+                continue
+            cache_key = (season, game_date, method)
+            result = _ratings_cache.get(cache_key)
+            if result is None:
+                result = solve_ratings(prior, method=method)
+                _ratings_cache[cache_key] = result
+            ratings = result['ratings']
+            home_rating.loc[date_index] = home_names.loc[date_index].map(ratings).fillna(0.0)
+            away_rating.loc[date_index] = away_names.loc[date_index].map(ratings).fillna(0.0)
+
+    out['home_rating'] = home_rating
+    out['away_rating'] = away_rating
+    out['rating_diff'] = home_rating - away_rating
+    return out
@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'journal')
+
+
+class ScrapeJournal:
+    """
+    Append-only record of finished scrape steps, for resuming an interrupted run.
+
+    Each line of ``journal.jsonl`` marks one completed stage of a season: a
+    month page fetched and parsed (its frame is checkpointed under
+    ``checkpoints/``) or the season CSV written. Lines are appended with a
+    single write, so worker processes can share one journal.
+    """
+
+    def __init__(self, directory=DEFAULT_JOURNAL_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, 'journal.jsonl')
+        self.checkpoint_dir = os.path.join(directory, 'checkpoints')
+        self._lock = threading.Lock()
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+    def reset(self):
+        """Forget every recorded step and checkpoint (start a fresh run)."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+    def record(self, season, stage, month=None, **details):
+        entry = dict(details, season=str(season), stage=stage, month=month, at=time.time())
+        line = (json.dumps(entry) + '\n').encode('utf-8')
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def entries(self):
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # A line cut short by a crash
+        return entries
+
+    def completed(self, season, stage):
+        """Months (None for season-wide stages) that finished ``stage`` for a season."""
+        return {entry['month'] for entry in self.entries()
+                if entry['season'] == str(season) and entry['stage'] == stage}
+
+    def is_done(self, season, stage, month=None):
+        return month in self.completed(season, stage)
+
+    def _checkpoint_path(self, season, month):
+        return os.path.join(self.checkpoint_dir, f"{season}-{month}.pkl")
+
+    def save_month(self, season, month, frame):
+        """Checkpoint a parsed month frame, then journal the month as done."""
+        path = self._checkpoint_path(season, month)
+        tmp_path = f"{path}.tmp"
+        frame.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        self.record(season, 'month', month, rows=len(frame))
+
+    def load_month(self, season, month):
+        """The checkpointed frame of a journaled month, or None."""
+        path = self._checkpoint_path(season, month)
+        if not self.is_done(season, 'month', month) or not os.path.exists(path):
+            return None
+        return pd.read_pickle(path)
@@ -1,55 +1,306 @@
 import os
-import pandas as pd
-from NBADataScraper import NBADataScraper
+import argparse
+import csv
+from collections import Counter
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from NBADataScraper import NBADataScraper, BASE_URL
+from http_client import FetchClient, report_connection_stats
+from page_cache import PageCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from ingest import write_season_rows
+from rate_limit import ProcessTokenBucket
+from scrape_journal import ScrapeJournal, DEFAULT_JOURNAL_DIR
 
-def run_scraper(start_year=2021, end_year=2025):
+SEASON_MONTHS = ["october", "november", "december", "january", "february", "march", "april"]
+
+
+def _season_month_order(month):
+    # Seasons run from autumn to spring: August sorts first
+    return (datetime.strptime(month, '%B').month - 8) % 12
+
+
+def months_to_refresh(latest_date, months=SEASON_MONTHS):
+    """Month pages that can hold games on or after ``latest_date``."""
+    latest_order = _season_month_order(latest_date.strftime('%B'))
+    return [month for month in months if _season_month_order(month) >= latest_order]
+
+
+def _game_key(scraper, game):
+    date = scraper.game_results.parse_date(game.get('Date'))
+    return date, str(game.get('Home/Neutral', '')).strip().upper(), str(game.get('Visitor/Neutral', '')).strip().upper()
+
+
+def _is_scored(scraper, game):
+    visitor_pts = scraper.parse_pts(game.get('Visitor_PTS'))
+    home_pts = scraper.parse_pts(game.get('Home_PTS'))
+    return bool(visitor_pts and home_pts and visitor_pts != home_pts)
+
+
+def update_season_csv(scraper, season_year, csv_path, months=SEASON_MONTHS, **scrape_options):
+    """
+    Bring a season CSV up to date with the games played since it was written.
+
+    Mid-season CSVs also hold scheduled games not played yet, stored 0-0.
+    Only month pages from the latest scored game onwards are fetched; their
+    games replace the stored rows of those months, and earlier months are
+    taken from the CSV. The derived columns (recent form, head-to-head,
+    rest days, records) are then recomputed for the whole season with the
+    scraper's own iter_final_rows, so an updated CSV holds exactly what a
+    full scrape would write. The file is only rewritten when new results
+    arrived.
+
+    Returns:
+        int: Number of newly finished games, or None when there is no CSV to extend.
+    """
+    if not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0:
+        return None
+    # Read as text so carried-over values are written back exactly as stored
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        stored = list(reader)
+    if not stored:
+        return None
+
+    stored_scored = {_game_key(scraper, game) for game in stored if _is_scored(scraper, game)}
+    scored_dates = [key[0] for key in stored_scored if key[0] is not None]
+    if not scored_dates:
+        refresh = list(months)
+        print(f"🔁 {csv_path} has no played games yet: fetching {', '.join(refresh)}")
+    else:
+        latest = max(scored_dates)
+        refresh = months_to_refresh(latest, months)
+        print(f"🔁 {csv_path} is complete up to {latest.date()}: fetching {', '.join(refresh) or 'nothing'}")
+    if not refresh:
+        return 0
+
+    # A month whose page could not be fetched keeps its stored rows
+    fetched = {month for month, _ in scraper.iter_season_frames(season_year, refresh, **scrape_options)}
+    scraped = list(scraper.game_results)
+    new_games = sum(1 for game in scraped
+                    if _is_scored(scraper, game) and _game_key(scraper, game) not in stored_scored)
+    if not new_games:
+        return 0
+
+    # Games in the order a full scrape parses them: month by month, page order within a month
+    season_games = []
+    for month in months:
+        if month in fetched:
+            season_games.extend(game for game in scraped if game.get('Month') == month)
+        else:
+            season_games.extend(game for game in stored if game.get('Month') == month)
+    season_games.extend(game for game in stored if game.get('Month') not in months)
+    for game in season_games:
+        if isinstance(game, dict):
+            game['Visitor_PTS'] = scraper.parse_pts(game.get('Visitor_PTS'))
+            game['Home_PTS'] = scraper.parse_pts(game.get('Home_PTS'))
+    scraper.game_results = season_games
+
+    write_season_rows(csv_path, scraper.iter_final_rows(), fieldnames=fieldnames)
+    return new_games
+
+def scrape_season(season_year, client, data_dir="data", months=SEASON_MONTHS, base_url=BASE_URL,
+                  parse_mode='full', concurrent=False, requests_per_second=1.0, max_in_flight=4,
+                  limiter=None, incremental=False, journal=None):
+    """
+    Scrape, enrich and write one season's CSV.
+
+    With a ``journal`` each parsed month is checkpointed as soon as it is
+    fetched, months finished by an earlier run are replayed from their
+    checkpoints instead of being fetched again, and a season already written
+    is skipped. ``limiter`` paces requests together with other scrapers.
+
+    Returns:
+        int: Number of rows written or appended.
+    """
+    label = f"{int(season_year)-1}-{season_year}"
+    output_file = os.path.join(data_dir, f"nba_{int(season_year)-1}_{season_year}.csv")
+    fetch_options = dict(concurrent=concurrent, requests_per_second=requests_per_second,
+                         max_in_flight=max_in_flight, limiter=limiter)
+    print(f"\n=== Processing {label} season ===")
+
+    if journal is not None and journal.is_done(season_year, 'written') and os.path.exists(output_file):
+        print(f"⏭️ {output_file} was completed by an earlier run")
+        return 0
+
+    # Create a new scraper instance for each season
+    scraper = NBADataScraper(base_url=base_url, client=client, parse_mode=parse_mode)
+
+    if incremental:
+        added = update_season_csv(scraper, season_year, output_file, months, **fetch_options)
+        if added is not None:
+            print(f"✅ Added {added} new games to {output_file}")
+            return added
+
+    # Scrape only the current season; month frames are dropped once parsed
+    print(f"🔍 Scraping {label} season data...")
+    if journal is None:
+        games = sum(len(frame) for _, frame in scraper.iter_season_frames(season_year, months, **fetch_options))
+    else:
+        done = journal.completed(season_year, 'month')
+        pending = [month for month in months if month not in done]
+        if len(pending) < len(months):
+            print(f"♻️ Resuming: {len(months) - len(pending)} months already fetched")
+        fetcher = NBADataScraper(base_url=base_url, client=client, parse_mode=parse_mode)
+        for month, frame in fetcher.iter_season_frames(season_year, pending, **fetch_options):
+            journal.save_month(season_year, month, frame)
+        # Replay every month in order so game_results match an uninterrupted run
+        games = 0
+        for month in months:
+            frame = journal.load_month(season_year, month)
+            if frame is not None:
+                scraper.add_month_frame(frame)
+                games += len(frame)
+
+    if not games:
+        print(f"❌ No data found for {label}")
+        return 0
+
+    # Enhance, add DSLG and records, and write rows as they are produced
+    print("📊 Enhancing game data and calculating advanced metrics...")
+    os.makedirs(data_dir, exist_ok=True)
+    written = write_season_rows(output_file, scraper.iter_final_rows())
+
+    if not written:
+        print(f"⚠️ Enhancement failed for {label}")
+        return 0
+
+    if journal is not None:
+        journal.record(season_year, 'written', rows=written)
+    print(f"✅ Successfully saved {output_file} ({written} games)")
+    return written
+
+
+_worker_client = None
+_worker_limiter = None
+
+
+def _init_worker(limiter, use_cache, cache_dir, cache_max_bytes):
+    global _worker_client, _worker_limiter
+    cache = PageCache(cache_dir, max_bytes=cache_max_bytes) if use_cache else None
+    _worker_client = FetchClient(cache=cache)
+    _worker_limiter = limiter
+
+
+def _scrape_season_in_worker(season_year, journal_dir, options):
+    journal = ScrapeJournal(journal_dir) if journal_dir else None
+    before = _worker_client.connection_stats()
+    written = scrape_season(season_year, _worker_client, limiter=_worker_limiter, journal=journal, **options)
+    after = _worker_client.connection_stats()
+    return written, {key: after[key] - before[key] for key in after}
+
+
+def run_scraper(start_year=2021, end_year=2025, concurrent=False, requests_per_second=1.0, max_in_flight=4,
+                use_cache=True, cache_dir=DEFAULT_CACHE_DIR, cache_max_bytes=DEFAULT_MAX_BYTES, parse_mode='full',
+                incremental=False, workers=1, resume=False, journal_dir=DEFAULT_JOURNAL_DIR,
+                base_url=BASE_URL, data_dir="data"):
     """
     Scrapes NBA data for each season separately and saves to individual CSV files.
+
+    With ``concurrent`` each season's month pages are fetched in parallel,
+    limited to ``requests_per_second`` and ``max_in_flight`` open requests.
+    With ``use_cache`` pages are kept in an on-disk cache: finished seasons are
+    served from it without any request, others are revalidated.
+    ``parse_mode='fast'`` parses only the schedule table of each page.
+    With ``incremental`` seasons that already have a CSV only fetch the
+    months from its latest played game on (see update_season_csv).
+
+    Progress is journaled in ``journal_dir`` (None disables it); ``resume``
+    continues the previous run instead of starting over. With ``workers`` > 1
+    seasons are scraped in parallel processes that share one
+    ``requests_per_second`` limit.
+
+    Returns:
+        dict: the run's HTTP and page cache counts (see FetchClient.connection_stats),
+        summed over worker processes.
     """
     print(f"🚀 Starting NBA data scraping from {start_year-1}-{start_year} to {end_year-1}-{end_year}...")
+
+    journal = ScrapeJournal(journal_dir) if journal_dir else None
+    if journal is not None and not resume:
+        journal.reset()
+
+    seasons = [str(season_year) for season_year in range(start_year, end_year + 1)]
+    options = dict(data_dir=data_dir, months=SEASON_MONTHS, base_url=base_url, parse_mode=parse_mode,
+                   concurrent=concurrent, requests_per_second=requests_per_second,
+                   max_in_flight=max_in_flight, incremental=incremental)
+
+    if workers > 1:
+        # One token bucket in shared memory paces every worker process
+        limiter = ProcessTokenBucket(requests_per_second)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(limiter, use_cache, cache_dir, cache_max_bytes)) as pool:
+            futures = {pool.submit(_scrape_season_in_worker, year_str, journal_dir, options): year_str
+                       for year_str in seasons}
+            stats = Counter()
+            for future in as_completed(futures):
+                year_str = futures[future]
+                try:
+                    _, season_stats = future.result()
+                    stats.update(season_stats)
+                except Exception as e:
+                    print(f"🔥 Error processing {int(year_str)-1}-{year_str}: {str(e)}")
+        print("\n🎉 All seasons processed!")
+        print(f"👷 {workers} worker processes:")
+        # The workers shared the cache directory, so re-read it for its size
+        cache = PageCache(cache_dir, max_bytes=cache_max_bytes) if use_cache else None
+        return report_connection_stats(stats, cache)
+
+    # One pooled client for every season so connections are reused across the run
+    cache = PageCache(cache_dir, max_bytes=cache_max_bytes) if use_cache else None
+    client = FetchClient(cache=cache)
     
-    for season_year in range(start_year, end_year + 1):
-        year_str = str(season_year)
-        print(f"\n=== Processing {int(year_str)-1}-{year_str} season ===")
-        
-        # Create a new scraper instance for each season
-        scraper = NBADataScraper()
-        months = ["october", "november", "december", "january", "february", "march", "april"]
-        
+    for year_str in seasons:
         try:
-            # Scrape only the current season
-            print(f"🔍 Scraping {int(year_str)-1}-{year_str} season data...")
-            basic_data = scraper.scrape_full_season(year_str, months)
-            
-            if basic_data is None or basic_data.empty:
-                print(f"❌ No data found for {int(year_str)-1}-{year_str}")
-                continue
-
-            # Enhance data for this season only
-            print("📊 Enhancing game data...")
-            enhanced_df = scraper.enhance_game_data()
-            
-            if enhanced_df.empty:
-                print(f"⚠️ Enhancement failed for {int(year_str)-1}-{year_str}")
-                continue
-
-            # Calculate DSLG and records for this season
-            print("📈 Calculating advanced metrics...")
-            data_with_dslg = scraper.calculate_days_since_last_match(enhanced_df.to_dict('records'))
-            final_data = scraper.calculate_team_record(data_with_dslg)
-            final_df = pd.DataFrame(final_data)
-
-            # Save to season-specific CSV
-            os.makedirs("data", exist_ok=True)
-            output_file = f"data/nba_{int(year_str)-1}_{year_str}.csv"
-            final_df.to_csv(output_file, index=False)
-            print(f"✅ Successfully saved {output_file}")
-
+            scrape_season(year_str, client, journal=journal, **options)
         except Exception as e:
             print(f"🔥 Error processing {int(year_str)-1}-{year_str}: {str(e)}")
             continue
 
     print("\n🎉 All seasons processed!")
+    stats = client.report()
+    client.close()
+    return stats
 
 if __name__ == "__main__":
-    run_scraper(start_year=2021, end_year=2025)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape NBA season data from basketball-reference.com")
+    parser.add_argument('--start-year', type=int, default=2021)
+    parser.add_argument('--end-year', type=int, default=2025)
+    parser.add_argument('--concurrent', action='store_true',
+                        help="Fetch each season's month pages in parallel")
+    parser.add_argument('--rps', type=float, default=1.0,
+                        help="Maximum requests per second in concurrent mode or across --workers")
+    parser.add_argument('--max-in-flight', type=int, default=4,
+                        help="Maximum simultaneous requests in concurrent mode")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always download pages instead of using the on-disk page cache")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024))
+    parser.add_argument('--parse-mode', choices=['full', 'fast'], default='full',
+                        help="'fast' parses only the schedule table (with lxml when installed)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only fetch the months since each season CSV's latest played game")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Scrape seasons in this many parallel processes (sharing --rps)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the previous run from its journal instead of starting over")
+    parser.add_argument('--no-journal', action='store_true',
+                        help="Do not checkpoint progress")
+    parser.add_argument('--journal-dir', default=DEFAULT_JOURNAL_DIR)
+    args = parser.parse_args()
+
+    run_scraper(
+        start_year=args.start_year,
+        end_year=args.end_year,
+        concurrent=args.concurrent,
+        requests_per_second=args.rps,
+        max_in_flight=args.max_in_flight,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        parse_mode=args.parse_mode,
+        incremental=args.incremental,
+        workers=args.workers,
+        resume=args.resume,
+        journal_dir=None if args.no_journal else args.journal_dir,
+    )
\ No newline at end of file
@@ -0,0 +1,137 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Compact dtypes for the season CSV columns, applied by read_csv as it
+# parses. Counts fit in int16 even with records carried across 20+ seasons;
+# scores are nullable Int16 because unplayed games may leave them empty.
+# Recent Win % stays float64 because it feeds the model features directly.
+# Team names and months repeat on every row, so they are categoricals. Date
+# stays a string.
+SEASON_DTYPES = {
+    'Visitor/Neutral': 'category',
+    'PTS': 'Int16',
+    'Home/Neutral': 'category',
+    'Visitor_PTS': 'Int16',
+    'Home_PTS': 'Int16',
+    'Month': 'category',
+    'Season': 'category',
+    'Recent Wins (Home)': 'int16',
+    'Recent Losses (Home)': 'int16',
+    'Recent Wins (Visitor)': 'int16',
+    'Recent Losses (Visitor)': 'int16',
+    'Matchup Wins (Home)': 'int16',
+    'Matchup Wins (Visitor)': 'int16',
+    'Total Matchups': 'int16',
+    'DSLG (Visitor)': 'float32',
+    'DSLG (Home)': 'float32',
+    'Wins (Home)': 'int16',
+    'Losses (Home)': 'int16',
+    'Wins (Visitor)': 'int16',
+    'Losses (Visitor)': 'int16',
+}
+
+# Everything build_training_dataset, the rating/team-stat features and the
+# feature store's month layout read; the rest of the CSV is never parsed.
+TRAINING_COLUMNS = [
+    'Date', 'Visitor/Neutral', 'Home/Neutral', 'Visitor_PTS', 'Home_PTS', 'Month',
+    'Recent Losses (Home)', 'Recent Win % (Home)', 'Recent Losses (Visitor)', 'Recent Win % (Visitor)',
+    'Matchup Wins (Home)', 'Matchup Wins (Visitor)',
+    'Wins (Home)', 'Losses (Home)', 'Wins (Visitor)', 'Losses (Visitor)',
+]
+
+
+def compact_season_frame(df):
+    """
+    Cast an in-memory season frame to SEASON_DTYPES in one pass.
+
+    Files are typed as they are read (see read_season_csv); this is for
+    frames built in memory. int16 columns with gaps are left as they are.
+    """
+    dtypes = {}
+    for col, dtype in SEASON_DTYPES.items():
+        if col not in df.columns:
+            continue
+        if dtype == 'int16' and df[col].hasnans:
+            continue
+        dtypes[col] = dtype
+    return df.astype(dtypes)
+
+
+def _read(path, columns, chunksize=None):
+    wanted = set(columns) if columns is not None else None
+    return pd.read_csv(path, usecols=(lambda name: name in wanted) if wanted is not None else None,
+                       dtype=SEASON_DTYPES, chunksize=chunksize)
+
+
+def _union_categories(frames):
+    """Give each categorical column the same categories in every frame, so concat keeps it categorical."""
+    for col, dtype in SEASON_DTYPES.items():
+        if dtype != 'category' or not all(col in frame.columns for frame in frames):
+            continue
+        categories = union_categoricals([frame[col] for frame in frames]).categories
+        for frame in frames:
+            frame[col] = frame[col].cat.set_categories(categories)
+
+
+def _read_all(paths, columns, max_workers, skip_errors):
+    def read(path):
+        try:
+            return _read(path, columns)
+        except Exception as e:
+            if not skip_errors:
+                raise
+            print(f"Failed to load {path}: {e}")
+            return None
+
+    # Local files: parsing, not I/O, is the bottleneck, so one thread per core
+    workers = min(len(paths), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [read(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read, paths))
+
+
+def read_season_csv(path, columns=None, chunksize=None):
+    """
+    Read one season CSV with compact dtypes, keeping only the ``columns`` (default: all) it has.
+
+    With ``chunksize`` returns an iterator of frames of that many rows, as read_csv does.
+    """
+    return _read(path, columns, chunksize)
+
+
+def read_season_csvs(paths, columns=None, max_workers=None, skip_errors=False):
+    """
+    Read several season CSVs concurrently; compact frames come back in ``paths`` order.
+
+    The C parser releases the GIL while tokenizing, so threads overlap both
+    file I/O and parsing. With ``skip_errors`` an unreadable file is reported
+    and yields None instead of failing the whole load.
+    """
+    return _read_all(list(paths), columns, max_workers, skip_errors)
+
+
+def load_seasons(paths, season_keys, columns=None, max_workers=None, skip_errors=False):
+    """
+    Read season CSVs concurrently into one compact frame tagged with ``__season_key``.
+
+    Each file is parsed straight into compact dtypes, so no wider copy of it
+    is ever held. Categorical columns get the union of the files'
+    categories before the single concat, which then keeps them categorical.
+
+    Returns:
+        DataFrame, or None when no file could be read.
+    """
+    frames = _read_all(list(paths), columns, max_workers, skip_errors)
+    loaded = [(key, frame) for key, frame in zip(season_keys, frames) if frame is not None]
+    if not loaded:
+        return None
+    _union_categories([frame for _, frame in loaded])
+    df = pd.concat([frame for _, frame in loaded], ignore_index=True)
+    df['__season_key'] = pd.Categorical.from_codes(
+        pd.RangeIndex(len(loaded)).repeat([len(frame) for _, frame in loaded]),
+        categories=[key for key, _ in loaded])
+    return df
@@ -0,0 +1,150 @@
+from collections import Counter, deque
+from itertools import repeat
+
+import pandas as pd
+
+FORM_WINDOW = 5
+
+
+class SeasonState:
+    """
+    Running per-team aggregates for one season, updated one game at a time.
+
+    Holds everything serving needs without rescanning the season frame: W-L,
+    points, last game date, a bounded window of recent results and
+    head-to-head counts. Applying a game is O(1).
+    """
+
+    def __init__(self):
+        self.wins = Counter()
+        self.losses = Counter()
+        self.points = Counter()
+        self.last_played = {}
+        self.form = {}
+        self.head_to_head = Counter()  # (winner, loser) -> games won
+        self.games_seen = set()  # (date, home, visitor) already applied
+        # Offset between the CSV's carried-over records and this season's record.
+        self.record_base = {}
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build state from a normalized season frame (home_team, visitor_team, home_pts, visitor_pts, Date)."""
+        state = cls()
+        if df is None or df.empty:
+            return state
+
+        dates = pd.to_datetime(df['Date'], format='%a %b %d %Y', errors='coerce')
+        record_columns = ['home_wins', 'home_losses', 'visitor_wins', 'visitor_losses']
+        if set(record_columns).issubset(df.columns):
+            records = zip(*(df[col] for col in record_columns))
+        else:
+            records = repeat(None)
+
+        for date, home, visitor, home_pts, visitor_pts, record in zip(
+                dates, df['home_team'], df['visitor_team'], df['home_pts'], df['visitor_pts'], records):
+            if pd.isna(date) or pd.isna(home_pts) or pd.isna(visitor_pts):
+                continue
+            if record is not None and not any(pd.isna(value) for value in record):
+                # Records in the scraped CSVs may carry over from earlier seasons.
+                home_wins, home_losses, visitor_wins, visitor_losses = record
+                state.record_base[home] = (int(home_wins) - state.wins[home],
+                                           int(home_losses) - state.losses[home])
+                state.record_base[visitor] = (int(visitor_wins) - state.wins[visitor],
+                                              int(visitor_losses) - state.losses[visitor])
+            state.apply_game(date, home, visitor, int(home_pts), int(visitor_pts))
+
+        return state
+
+    def has_game(self, date, home, visitor):
+        return (pd.Timestamp(date).normalize(), home, visitor) in self.games_seen
+
+    def apply_game(self, date, home, visitor, home_pts, visitor_pts):
+        """Fold one finished game into the aggregates."""
+        date = pd.Timestamp(date).normalize()
+        winner, loser = (home, visitor) if home_pts > visitor_pts else (visitor, home)
+
+        self.wins[winner] += 1
+        self.losses[loser] += 1
+        self.points[home] += home_pts
+        self.points[visitor] += visitor_pts
+        self.head_to_head[(winner, loser)] += 1
+        self.games_seen.add((date, home, visitor))
+
+        for team in (home, visitor):
+            self.form.setdefault(team, deque(maxlen=FORM_WINDOW)).append(1 if team == winner else 0)
+            self.last_played[team] = date
+
+    def games_played(self, team):
+        return self.wins[team] + self.losses[team]
+
+    def team_stats(self, team):
+        """Season stats for one team in the shape returned by model_utils.get_team_stats."""
+        total_games = self.games_played(team)
+        if total_games == 0:
+            return None
+
+        form = self.form.get(team, ())
+        _, recent_losses, recent_win_pct = self._recent(team)
+        return {
+            'wins': self.wins[team],
+            'losses': self.losses[team],
+            'games_played': total_games,
+            'win_pct': self.wins[team] / max(total_games, 1),
+            'ppg': round(self.points[team] / total_games, 1),
+            # Percent, like the CSV's Recent Win % columns the model was trained on
+            'recent_win_pct': recent_win_pct,
+            'recent_losses': recent_losses,
+            'form': ''.join('W' if won else 'L' for won in form),
+        }
+
+    def matchup(self, home, away):
+        """Head-to-head wins between two teams this season, regardless of venue."""
+        home_wins = self.head_to_head[(home, away)]
+        away_wins = self.head_to_head[(away, home)]
+        return {
+            'home_wins': home_wins,
+            'away_wins': away_wins,
+            'total_games': home_wins + away_wins,
+        }
+
+    def _recent(self, team):
+        form = self.form.get(team, ())
+        wins = sum(form)
+        losses = len(form) - wins
+        win_pct = round(wins / len(form) * 100, 1) if form else 0.0
+        return wins, losses, win_pct
+
+    def _csv_record(self, team):
+        base_wins, base_losses = self.record_base.get(team, (0, 0))
+        return self.wins[team] + base_wins, self.losses[team] + base_losses
+
+    def _days_since(self, team, date):
+        last = self.last_played.get(team)
+        return float((date - last).days) if last is not None else None
+
+    def derived_columns(self, date, home, visitor):
+        """
+        Pre-game derived columns for a new game, in the season CSV schema.
+
+        Records, DSLG and recent form use only games before this one, so call
+        this before apply_game. Matchup counts are added by ingest.build_csv_row.
+        """
+        date = pd.Timestamp(date).normalize()
+        home_recent = self._recent(home)
+        visitor_recent = self._recent(visitor)
+        home_record = self._csv_record(home)
+        visitor_record = self._csv_record(visitor)
+        return {
+            'Recent Wins (Home)': home_recent[0],
+            'Recent Losses (Home)': home_recent[1],
+            'Recent Win % (Home)': home_recent[2],
+            'Recent Wins (Visitor)': visitor_recent[0],
+            'Recent Losses (Visitor)': visitor_recent[1],
+            'Recent Win % (Visitor)': visitor_recent[2],
+            'DSLG (Visitor)': self._days_since(visitor, date),
+            'DSLG (Home)': self._days_since(home, date),
+            'Wins (Home)': home_record[0],
+            'Losses (Home)': home_record[1],
+            'Wins (Visitor)': visitor_record[0],
+            'Losses (Visitor)': visitor_record[1],
+        }
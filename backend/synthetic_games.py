@@ -0,0 +1,192 @@
+import math
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from season_loader import compact_season_frame
+
+# League shape: every team plays once per round, so a season is
+# GAMES_PER_TEAM rounds of TEAMS // 2 games, two days apart.
+TEAMS = 30
+GAMES_PER_TEAM = 82
+DAYS_BETWEEN_ROUNDS = 2
+RECENT_GAMES = 5
+# Home win log-odds at equal strength (about 56%), team strength spread in
+# log-odds, and how much of it carries into the next season.
+HOME_ADVANTAGE = 0.25
+STRENGTH_STD = 0.5
+STRENGTH_CARRYOVER = 0.6
+
+
+def games_per_season(teams=TEAMS, games_per_team=GAMES_PER_TEAM):
+    return teams * games_per_team // 2
+
+
+class _Leagues:
+    """Running state for ``count`` independent leagues, simulated side by side."""
+
+    def __init__(self, count, teams, rng):
+        self.count, self.teams, self.rng = count, teams, rng
+        self.names = [f"League {league} Team {team:02d}" for league in range(count) for team in range(teams)]
+        self.strength = rng.normal(0, STRENGTH_STD, (count, teams))
+        # Records and head-to-heads carry across seasons, like the scraped CSVs
+        self.wins = np.zeros((count, teams), dtype=np.int64)
+        self.losses = np.zeros((count, teams), dtype=np.int64)
+        self.recent = np.full((count, teams, RECENT_GAMES), -1, dtype=np.int8)  # 1 win, 0 loss, -1 none
+        self.matchups = np.zeros((count, teams, teams), dtype=np.int64)  # [i, j]: wins of i over j
+        self.last_day = np.full((count, teams), -1, dtype=np.int64)
+
+    def play_season(self, start_year, games_per_team):
+        """Simulate one season; returns a dict of [round, league, game] arrays plus the round dates."""
+        rng, count, teams = self.rng, self.count, self.teams
+        shape = (games_per_team, count, teams // 2)
+        out = {key: np.empty(shape, dtype=np.int64) for key in (
+            'home', 'away', 'home_pts', 'away_pts', 'home_wins', 'home_losses', 'away_wins', 'away_losses',
+            'home_recent_wins', 'home_recent_losses', 'away_recent_wins', 'away_recent_losses',
+            'matchup_home', 'matchup_away', 'home_rest', 'away_rest')}
+        leagues = np.arange(count)[:, None]
+        opening = date(start_year, 10, 24)
+        dates = [opening + timedelta(days=DAYS_BETWEEN_ROUNDS * r) for r in range(games_per_team)]
+        results = np.empty((count, teams), dtype=np.int8)
+
+        for r, day in enumerate(dates):
+            day_number = day.toordinal()
+            pairing = rng.permuted(np.broadcast_to(np.arange(teams), (count, teams)), axis=1)
+            home, away = pairing[:, 0::2], pairing[:, 1::2]
+            recent_home, recent_away = self.recent[leagues, home], self.recent[leagues, away]
+            last_home, last_away = self.last_day[leagues, home], self.last_day[leagues, away]
+            row = {
+                'home': leagues * teams + home,
+                'away': leagues * teams + away,
+                'home_wins': self.wins[leagues, home],
+                'home_losses': self.losses[leagues, home],
+                'away_wins': self.wins[leagues, away],
+                'away_losses': self.losses[leagues, away],
+                'home_recent_wins': (recent_home == 1).sum(axis=2),
+                'home_recent_losses': (recent_home == 0).sum(axis=2),
+                'away_recent_wins': (recent_away == 1).sum(axis=2),
+                'away_recent_losses': (recent_away == 0).sum(axis=2),
+                'matchup_home': self.matchups[leagues, home, away],
+                'matchup_away': self.matchups[leagues, away, home],
+                'home_rest': np.where(last_home >= 0, day_number - last_home, 0),
+                'away_rest': np.where(last_away >= 0, day_number - last_away, 0),
+            }
+
+            edge = HOME_ADVANTAGE + self.strength[leagues, home] - self.strength[leagues, away]
+            home_win = rng.random(edge.shape) < 1 / (1 + np.exp(-edge))
+            loser_pts = np.clip(np.rint(rng.normal(106, 10, edge.shape)), 70, None).astype(np.int64)
+            winner_pts = loser_pts + rng.geometric(0.09, edge.shape)
+            row['home_pts'] = np.where(home_win, winner_pts, loser_pts)
+            row['away_pts'] = np.where(home_win, loser_pts, winner_pts)
+            for key, value in row.items():
+                out[key][r] = value
+
+            # Every team plays exactly once per round, so each fancy-indexed update hits distinct cells
+            self.wins[leagues, home] += home_win
+            self.losses[leagues, home] += ~home_win
+            self.wins[leagues, away] += ~home_win
+            self.losses[leagues, away] += home_win
+            self.matchups[leagues, home, away] += home_win
+            self.matchups[leagues, away, home] += ~home_win
+            results[leagues, home] = home_win
+            results[leagues, away] = ~home_win
+            self.recent[:, :, :-1] = self.recent[:, :, 1:]
+            self.recent[:, :, -1] = results
+            self.last_day[:] = day_number
+
+        # Strength drifts between seasons with a stationary spread of STRENGTH_STD
+        self.strength = (STRENGTH_CARRYOVER * self.strength
+                         + math.sqrt(1 - STRENGTH_CARRYOVER ** 2) * self.rng.normal(0, STRENGTH_STD, self.strength.shape))
+        return out, dates
+
+
+def _recent_pct(wins, losses):
+    played = wins + losses
+    return np.round(np.where(played > 0, 100 * wins / np.maximum(played, 1), 0.0), 1)
+
+
+def _season_frame(games, dates, names, season, rows):
+    """Flatten a simulated season into season-CSV columns, keeping the first ``rows`` games."""
+    flat = {key: value.reshape(-1)[:rows] for key, value in games.items()}
+    per_round = games['home'][0].size
+    round_index = np.repeat(np.arange(len(dates)), per_round)[:rows]
+    date_labels = [day.strftime('%a %b %d %Y') for day in dates]
+    month_labels = [day.strftime('%B').lower() for day in dates]
+    df = pd.DataFrame({
+        # Dates and months repeat for every game of a round, so they stay categorical
+        'Date': pd.Categorical.from_codes(round_index, categories=date_labels),
+        'Visitor/Neutral': pd.Categorical.from_codes(flat['away'], categories=names),
+        'Home/Neutral': pd.Categorical.from_codes(flat['home'], categories=names),
+        'Visitor_PTS': flat['away_pts'],
+        'Home_PTS': flat['home_pts'],
+        'Month': pd.Categorical(month_labels)[round_index],
+        'Season': season,
+        'Recent Wins (Home)': flat['home_recent_wins'],
+        'Recent Losses (Home)': flat['home_recent_losses'],
+        'Recent Win % (Home)': _recent_pct(flat['home_recent_wins'], flat['home_recent_losses']),
+        'Recent Wins (Visitor)': flat['away_recent_wins'],
+        'Recent Losses (Visitor)': flat['away_recent_losses'],
+        'Recent Win % (Visitor)': _recent_pct(flat['away_recent_wins'], flat['away_recent_losses']),
+        'Matchup Wins (Home)': flat['matchup_home'],
+        'Matchup Wins (Visitor)': flat['matchup_away'],
+        'Total Matchups': flat['matchup_home'] + flat['matchup_away'],
+        'DSLG (Visitor)': flat['away_rest'],
+        'DSLG (Home)': flat['home_rest'],
+        'Wins (Home)': flat['home_wins'],
+        'Losses (Home)': flat['home_losses'],
+        'Wins (Visitor)': flat['away_wins'],
+        'Losses (Visitor)': flat['away_losses'],
+    })
+    return compact_season_frame(df)
+
+
+def synthetic_seasons(n_rows, chunk_size=100_000, teams=TEAMS, games_per_team=GAMES_PER_TEAM,
+                      last_season_start=2019, burn_in_seasons=1, seed=42):
+    """
+    Yield schedule-consistent synthetic games in the season CSV schema, one season at a time.
+
+    Each season is played by as many independent leagues as fit in
+    ``chunk_size`` rows, all simulated together with array operations.
+    Within a league every team plays once per round; outcomes follow latent
+    team strengths plus home advantage, and the records, recent form,
+    head-to-heads and rest days in each row are the ones before the game,
+    as the scraper writes them. ``burn_in_seasons`` are played but not
+    emitted, so the first rows already have history. Only the current season
+    is ever held in memory; the last one is cut at ``n_rows``.
+
+    Yields:
+        (str, DataFrame): season key ('2018-2019') and that season's games,
+        with the compact dtypes of season_loader.
+    """
+    per_league = games_per_season(teams, games_per_team)
+    count = max(1, min(chunk_size, n_rows) // per_league)
+    n_seasons = math.ceil(n_rows / (count * per_league))
+    if (n_seasons + burn_in_seasons) * games_per_team > np.iinfo(np.int16).max:
+        raise ValueError(f"{n_seasons} seasons of {games_per_team} games overflow the int16 record "
+                         f"columns; use a larger chunk_size")
+    rng = np.random.default_rng(seed)
+    leagues = _Leagues(count, teams, rng)
+    first = last_season_start - n_seasons + 1
+
+    for start_year in range(first - burn_in_seasons, first):
+        leagues.play_season(start_year, games_per_team)
+    remaining = n_rows
+    for start_year in range(first, last_season_start + 1):
+        games, dates = leagues.play_season(start_year, games_per_team)
+        season = f"{start_year}-{start_year + 1}"
+        frame = _season_frame(games, dates, leagues.names, season, min(remaining, count * per_league))
+        remaining -= len(frame)
+        yield season, frame
+
+
+def write_synthetic_seasons(data_dir, n_rows, **kwargs):
+    """Write ``synthetic_seasons`` as nba_YYYY_YYYY_final_data.csv files in ``data_dir``; returns their paths."""
+    os.makedirs(data_dir, exist_ok=True)
+    paths = []
+    for season, frame in synthetic_seasons(n_rows, **kwargs):
+        path = os.path.join(data_dir, f"nba_{season.replace('-', '_')}_final_data.csv")
+        frame.to_csv(path, index=False)
+        paths.append(path)
+    return paths
@@ -1,30 +1,47 @@
+import re
 import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup, Comment
+from http_client import get_default_client
+from page_cache import current_season_end_year
+from rate_limit import TokenBucket
+from team_stats_store import TeamStatsStore, season_end_year
+from teams import TEAM_INDEX
 
-def get_team_stats(team_abbr):
-    """
-    Scrapes comprehensive team stats from basketball-reference.com for the 2023-2024 season.
-    
-    Args:
-        team_abbr (str): Team abbreviation (e.g. 'LAL', 'GSW')
-    
-    Returns:
-        dict: Dictionary of team stats or error message.
-    """
-    url = f"https://www.basketball-reference.com/teams/{team_abbr}/2024.html"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    
-    try:
-        res = requests.get(url, headers=headers, timeout=10)
-        res.raise_for_status()
-    except requests.RequestException as e:
-        return {"error": f"Failed to retrieve data for team {team_abbr}: {str(e)}"}
+BASE_URL = "https://www.basketball-reference.com"
+
+
+def team_stats_url(team_abbr, season, base_url=BASE_URL):
+    return f"{base_url}/teams/{team_abbr}/{season_end_year(season)}.html"
+
+
+def _misc_ratings(soup):
+    """ORtg/DRtg from the team_misc table, which the page ships inside an HTML comment."""
+    table = soup.find("table", id="team_misc")
+    if table is None:
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            if 'id="team_misc"' in comment:
+                table = BeautifulSoup(comment, "html.parser").find("table", id="team_misc")
+                break
+    if table is None or table.tbody is None:
+        return {}
+    row = table.tbody.find("tr")
+    ratings = {}
+    for key, stat in (("offensive_rating", "off_rtg"), ("defensive_rating", "def_rtg")):
+        cell = row.find("td", {"data-stat": stat}) if row else None
+        if cell and cell.get_text(strip=True):
+            ratings[key] = cell.get_text(strip=True)
+    return ratings
 
-    soup = BeautifulSoup(res.text, "html.parser")
+
+def parse_team_stats(content, team_abbr, season):
+    """Parse a basketball-reference team-season page into a stats dict."""
+    soup = BeautifulSoup(content, "html.parser")
     
     # Initialize stats dictionary
     stats = {
         "team": team_abbr,
+        "season": season_end_year(season),
         "basic_stats": {},
         "advanced_stats": {},
         "team_info": {}
@@ -33,23 +50,109 @@ def get_team_stats(team_abbr):
     # Get team name and basic info
     team_info = soup.find("div", {"id": "info"})
     if team_info:
-        stats["team_info"]["name"] = team_info.find("h1").get_text(strip=True).replace("2023-24 ", "")
-        stats["team_info"]["record"] = team_info.find("div", {"id": "meta"}).find_all("p")[1].get_text(strip=True)
+        heading = team_info.find("h1")
+        if heading:
+            stats["team_info"]["name"] = re.sub(r"^\d{4}-\d{2}\s+", "", heading.get_text(" ", strip=True))
+        meta = team_info.find("div", {"id": "meta"})
+        paragraphs = meta.find_all("p") if meta else []
+        if len(paragraphs) > 1:
+            stats["team_info"]["record"] = paragraphs[1].get_text(strip=True)
+        # e.g. "Off Rtg: 122.2 (1st of 30) Def Rtg: 111.6 (3rd of 30)"
+        info_text = team_info.get_text(" ", strip=True)
+        for key, label in (("offensive_rating", "Off Rtg"), ("defensive_rating", "Def Rtg")):
+            match = re.search(rf"{label}\s*:\s*(-?\d+(?:\.\d+)?)", info_text)
+            if match:
+                stats[key] = match.group(1)
+
+    for key, value in _misc_ratings(soup).items():
+        stats.setdefault(key, value)
     
     # Get basic stats from team_and_opponent table
     table = soup.find("table", id="team_and_opponent")
-    if table:
+    if table and table.tbody:
         for row in table.tbody.find_all("tr"):
-            label = row.find("th").get_text(strip=True)
-            value = row.find("td").get_text(strip=True)
-            stats["basic_stats"][label] = value
+            label, value = row.find("th"), row.find("td")
+            if label and value:
+                stats["basic_stats"][label.get_text(strip=True)] = value.get_text(strip=True)
     
     # Get advanced stats from advanced-team table
     advanced_table = soup.find("table", id="advanced-team")
-    if advanced_table:
+    if advanced_table and advanced_table.tbody:
         for row in advanced_table.tbody.find_all("tr"):
-            label = row.find("th").get_text(strip=True)
-            value = row.find("td").get_text(strip=True)
-            stats["advanced_stats"][label] = value
+            label, value = row.find("th"), row.find("td")
+            if label and value:
+                stats["advanced_stats"][label.get_text(strip=True)] = value.get_text(strip=True)
+    
+    return stats
+
+
+def get_team_stats(team_abbr, season=None, client=None, store=None, base_url=BASE_URL, limiter=None):
+    """
+    Scrapes comprehensive team stats from basketball-reference.com for one season.
+    
+    Args:
+        team_abbr (str): Team abbreviation (e.g. 'LAL', 'GSW')
+        season (int or str, optional): Season end year (2024) or '2023-2024'; defaults to the current season.
+        client (FetchClient, optional): HTTP client to use; defaults to the shared one.
+        store (TeamStatsStore, optional): On-disk store answering fresh lookups without a request.
     
-    return stats
\ No newline at end of file
+    Returns:
+        dict: Dictionary of team stats or error message.
+    """
+    season = season_end_year(season) if season is not None else current_season_end_year()
+    if store is not None:
+        stored = store.get(season, team_abbr)
+        if stored is not None:
+            return stored
+
+    url = team_stats_url(team_abbr, season, base_url)
+    headers = {"User-Agent": "Mozilla/5.0"}
+    client = client or get_default_client()
+    
+    try:
+        res = client.get(url, headers=headers, timeout=10, limiter=limiter)
+    except requests.RequestException as e:
+        return {"error": f"Failed to retrieve data for team {team_abbr}: {str(e)}"}
+
+    stats = parse_team_stats(res.content, team_abbr, season)
+    if store is not None:
+        store.put(season, team_abbr, stats)
+    return stats
+
+
+def fetch_all_team_stats(season, client=None, store=None, teams=None, requests_per_second=1.0,
+                         max_in_flight=4, base_url=BASE_URL):
+    """
+    Stats for every team of a season, keyed by team code.
+
+    Teams with fresh entries in ``store`` are answered from disk; the others
+    are fetched on a thread pool, no more than ``requests_per_second`` at
+    ``max_in_flight`` open requests, and written back to the store in one go.
+    Failed teams map to {"error": ...} and are not stored.
+    """
+    season = season_end_year(season)
+    teams = list(teams or TEAM_INDEX.bbref_codes)
+    client = client or get_default_client()
+
+    results = {}
+    missing = []
+    for team in teams:
+        stored = store.get(season, team) if store is not None else None
+        if stored is not None:
+            results[team] = stored
+        else:
+            missing.append(team)
+
+    if missing:
+        print(f"📈 Fetching {len(missing)} team pages for {season} ({len(teams) - len(missing)} stored)")
+        limiter = TokenBucket(requests_per_second)
+        with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as pool:
+            fetched = list(pool.map(
+                lambda team: get_team_stats(team, season, client=client, base_url=base_url, limiter=limiter),
+                missing,
+            ))
+        results.update(zip(missing, fetched))
+        if store is not None:
+            store.put_many(season, {team: stats for team, stats in zip(missing, fetched) if "error" not in stats})
+
+    return results
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from page_cache import current_season_end_year
+from teams import TEAM_INDEX
+
+DEFAULT_STATS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'team_stats')
+DEFAULT_TTL = 6 * 60 * 60  # Current-season stats change nightly at most
+
+# Team-season ratings relative to that season's league average (0 = average)
+TEAM_STAT_FEATURES = ['home_off_rating', 'home_def_rating', 'away_off_rating', 'away_def_rating', 'net_rating_diff']
+
+
+def season_end_year(season):
+    """2024, '2024' or '2023-2024' -> 2024."""
+    return int(str(season).split('-')[-1])
+
+
+class TeamStatsStore:
+    """
+    On-disk store of scraped team-season stats, one JSON file per season.
+
+    Stats of finished seasons never expire; those of the season in progress
+    are refetched once older than ``ttl`` seconds.
+    """
+
+    def __init__(self, directory=DEFAULT_STATS_DIR, ttl=DEFAULT_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, season):
+        return os.path.join(self.directory, f"{season_end_year(season)}.json")
+
+    def _load(self, season):
+        path = self._path(season)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable team stats file {path}: {str(e)}")
+            return {}
+
+    def is_fresh(self, season, entry, now=None):
+        if season_end_year(season) < current_season_end_year():
+            return True
+        return (now or time.time()) - entry['fetched_at'] < self.ttl
+
+    def get(self, season, team):
+        """Stored stats for a team-season, or None when missing or expired."""
+        entry = self._load(season).get(team)
+        if entry is None or not self.is_fresh(season, entry):
+            return None
+        return entry['stats']
+
+    def put_many(self, season, stats_by_team):
+        with self._lock:
+            entries = self._load(season)
+            now = time.time()
+            for team, stats in stats_by_team.items():
+                entries[team] = {'fetched_at': now, 'stats': stats}
+            path = self._path(season)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, path)
+
+    def put(self, season, team, stats):
+        self.put_many(season, {team: stats})
+
+    def season_stats(self, season):
+        """Every stored team's stats for a season, expired or not."""
+        return {team: entry['stats'] for team, entry in self._load(season).items()}
+
+    def ratings_table(self, season):
+        """
+        Offensive/defensive ratings of a season relative to the league average.
+
+        Returns a DataFrame indexed by team code with ``off_rating`` and
+        ``def_rating`` columns (empty when nothing is stored).
+        """
+        rows = {}
+        for team, stats in self.season_stats(season).items():
+            try:
+                rows[team] = (float(stats['offensive_rating']), float(stats['defensive_rating']))
+            except (KeyError, TypeError, ValueError):
+                continue
+        table = pd.DataFrame.from_dict(rows, orient='index', columns=['off_rating', 'def_rating'])
+        return table - table.mean() if not table.empty else table
+
+
+def add_team_stat_features(df, store, season_column='__season_key', lag=1):
+    """
+    Join team-season offensive/defensive ratings onto game rows.
+
+    Games of season Y use the ratings of season Y - ``lag`` (the default 1
+    keeps end-of-season numbers from leaking into that season's games).
+    Teams or seasons without stored stats get 0, the league average.
+    """
+    df = df.copy()
+    home_col = 'home_team' if 'home_team' in df.columns else 'Home/Neutral'
+    visitor_col = 'visitor_team' if 'visitor_team' in df.columns else 'Visitor/Neutral'
+    # Team ids index straight into the code table; unknown teams (-1) land on the trailing None
+    codes = np.array(TEAM_INDEX.bbref_codes + (None,), dtype=object)
+    home_ids = df['home_id'] if 'home_id' in df.columns else TEAM_INDEX.ids(df[home_col])
+    visitor_ids = df['visitor_id'] if 'visitor_id' in df.columns else TEAM_INDEX.ids(df[visitor_col])
+    home_codes = pd.Series(codes[home_ids.to_numpy()], index=df.index)
+    visitor_codes = pd.Series(codes[visitor_ids.to_numpy()], index=df.index)
+
+    for col in TEAM_STAT_FEATURES:
+        df[col] = 0.0
+    if season_column not in df.columns:
+        return df
+
+    for season, index in df.groupby(season_column).groups.items():
+        if not season:
+            continue
+        table = store.ratings_table(season_end_year(season) - lag)
+        if table.empty:
+            continue
+        for side, team_codes in (('home', home_codes), ('away', visitor_codes)):
+            joined = table.reindex(team_codes.loc[index].to_numpy())
+            df.loc[index, f'{side}_off_rating'] = np.nan_to_num(joined['off_rating'].to_numpy())
+            df.loc[index, f'{side}_def_rating'] = np.nan_to_num(joined['def_rating'].to_numpy())
+
+    df['net_rating_diff'] = ((df['home_off_rating'] - df['home_def_rating'])
+                             - (df['away_off_rating'] - df['away_def_rating']))
+    return df
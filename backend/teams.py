@@ -0,0 +1,111 @@
+import pandas as pd
+
+# (NBA code, basketball-reference code, full name, conference), in id order.
+TEAMS = [
+    ("ATL", "ATL", "ATLANTA HAWKS", "Eastern"),
+    ("BOS", "BOS", "BOSTON CELTICS", "Eastern"),
+    ("BKN", "BRK", "BROOKLYN NETS", "Eastern"),
+    ("CHA", "CHO", "CHARLOTTE HORNETS", "Eastern"),
+    ("CHI", "CHI", "CHICAGO BULLS", "Eastern"),
+    ("CLE", "CLE", "CLEVELAND CAVALIERS", "Eastern"),
+    ("DET", "DET", "DETROIT PISTONS", "Eastern"),
+    ("IND", "IND", "INDIANA PACERS", "Eastern"),
+    ("MIA", "MIA", "MIAMI HEAT", "Eastern"),
+    ("MIL", "MIL", "MILWAUKEE BUCKS", "Eastern"),
+    ("NYK", "NYK", "NEW YORK KNICKS", "Eastern"),
+    ("ORL", "ORL", "ORLANDO MAGIC", "Eastern"),
+    ("PHI", "PHI", "PHILADELPHIA 76ERS", "Eastern"),
+    ("TOR", "TOR", "TORONTO RAPTORS", "Eastern"),
+    ("WAS", "WAS", "WASHINGTON WIZARDS", "Eastern"),
+    ("DAL", "DAL", "DALLAS MAVERICKS", "Western"),
+    ("DEN", "DEN", "DENVER NUGGETS", "Western"),
+    ("GSW", "GSW", "GOLDEN STATE WARRIORS", "Western"),
+    ("HOU", "HOU", "HOUSTON ROCKETS", "Western"),
+    ("LAC", "LAC", "LOS ANGELES CLIPPERS", "Western"),
+    ("LAL", "LAL", "LOS ANGELES LAKERS", "Western"),
+    ("MEM", "MEM", "MEMPHIS GRIZZLIES", "Western"),
+    ("MIN", "MIN", "MINNESOTA TIMBERWOLVES", "Western"),
+    ("NOP", "NOP", "NEW ORLEANS PELICANS", "Western"),
+    ("OKC", "OKC", "OKLAHOMA CITY THUNDER", "Western"),
+    ("PHX", "PHO", "PHOENIX SUNS", "Western"),
+    ("POR", "POR", "PORTLAND TRAIL BLAZERS", "Western"),
+    ("SAC", "SAC", "SACRAMENTO KINGS", "Western"),
+    ("SAS", "SAS", "SAN ANTONIO SPURS", "Western"),
+    ("UTA", "UTA", "UTAH JAZZ", "Western"),
+]
+
+# Other spellings seen in feeds and user input
+TEAM_ALIASES = {
+    "LA CLIPPERS": "LAC",
+    "LA LAKERS": "LAL",
+    "GS": "GSW",
+    "NO": "NOP",
+    "NY": "NYK",
+    "SA": "SAS",
+    "UTAH": "UTA",
+    "WSH": "WAS",
+}
+
+# Written to id columns for names the index doesn't know
+UNKNOWN_TEAM_ID = -1
+
+
+class TeamIndex:
+    """
+    One lookup for every way a team is named.
+
+    Full names, NBA codes (BKN/CHA/PHX), basketball-reference codes
+    (BRK/CHO/PHO) and aliases all resolve, case-insensitively, to a small
+    int id in one dict lookup. Ids index the per-team tuples below, so
+    frames can carry compact int8 team columns instead of strings.
+    """
+
+    def __init__(self, teams=TEAMS, aliases=TEAM_ALIASES):
+        self.nba_codes = tuple(team[0] for team in teams)
+        self.bbref_codes = tuple(team[1] for team in teams)
+        self.names = tuple(team[2] for team in teams)
+        self.conferences = tuple(team[3] for team in teams)
+
+        self._ids = {}
+        for team_id, (nba_code, bbref_code, name, _) in enumerate(teams):
+            for key in (name, nba_code, bbref_code):
+                self._ids[key] = team_id
+        for alias, code in aliases.items():
+            self._ids[alias] = self._ids[code]
+
+        # Any known key -> upper-case full name, the spelling serving frames use
+        self.canonical_names = {key: self.names[team_id] for key, team_id in self._ids.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, key):
+        return self.id(key) is not None
+
+    def id(self, key):
+        """Team id for a name, code or alias, or None if unknown."""
+        if not isinstance(key, str):
+            return None
+        return self._ids.get(key.strip().upper())
+
+    def name(self, team_id):
+        return self.names[team_id]
+
+    def display_name(self, team_id):
+        """'PHILADELPHIA 76ERS' -> 'Philadelphia 76ers', as written by the scraper."""
+        return ' '.join(word.capitalize() if word.isalpha() else word.lower()
+                        for word in self.names[team_id].split())
+
+    def nba_code(self, team_id):
+        return self.nba_codes[team_id]
+
+    def bbref_code(self, team_id):
+        return self.bbref_codes[team_id]
+
+    def ids(self, values):
+        """Vectorized id lookup for a Series of names/codes; unknown teams get UNKNOWN_TEAM_ID."""
+        keys = pd.Series(values).astype(str).str.strip().str.upper()
+        return keys.map(self._ids).fillna(UNKNOWN_TEAM_ID).astype('int8')
+
+
+TEAM_INDEX = TeamIndex()
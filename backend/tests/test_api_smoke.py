@@ -52,3 +52,64 @@ def test_predict_teams_endpoint_returns_expected_payload_shape():
     assert 0.0 <= home_prob <= 100.0
     assert 0.0 <= away_prob <= 100.0
     assert abs((home_prob + away_prob) - 100.0) <= 0.2
+
+
+def test_standings_endpoint_includes_ratings():
+    client = app.test_client()
+    response = client.get("/api/standings?season=2023-2024")
+
+    assert response.status_code == 200
+    body = response.get_json()
+
+    assert len(body["standings"]) == 30
+    assert all("rating" in team and "srs" in team for team in body["standings"])
+    assert abs(sum(team["rating"] for team in body["standings"])) < 0.5
+
+
+def test_ingest_results_endpoint_updates_team_stats(tmp_path, monkeypatch):
+    import model_utils
+
+    monkeypatch.setattr(model_utils, "_resolve_backend_dir", lambda: str(tmp_path))
+    # The ingested 2025-2026 season must not leak into later tests
+    monkeypatch.setattr(model_utils, "season_data", dict(model_utils.season_data))
+    monkeypatch.setattr(model_utils, "season_states", dict(model_utils.season_states))
+    monkeypatch.setattr(sys.modules["app"], "season_data", dict(sys.modules["app"].season_data))
+    client = app.test_client()
+
+    payload = {"games": [{
+        "date": "2025-10-21",
+        "home_team": "OKC",
+        "visitor_team": "HOU",
+        "home_pts": 125,
+        "visitor_pts": 124,
+        "overtime": "2OT",
+    }]}
+    response = client.post("/api/ingest-results", json=payload)
+
+    assert response.status_code == 200
+    assert response.get_json()["ingested"] == 1
+    assert (tmp_path / "data" / "nba_2025_2026_final_data.csv").exists()
+
+    stats = model_utils.get_team_stats("OKC", "2025-2026")
+    assert stats["wins"] == 1 and stats["losses"] == 0
+    assert stats["recent_win_pct"] == 100.0 and stats["recent_losses"] == 0
+    assert model_utils.get_team_stats("HOU", "2025-2026")["recent_losses"] == 1
+
+
+def test_predictor_reload_drops_cached_predictions():
+    import app as app_module
+    from model_utils import predictor
+
+    client = app.test_client()
+    payload = {"home_team": "LAL", "away_team": "BOS", "season": "2023-2024"}
+    assert client.post("/api/predict-teams", json=payload).status_code == 200
+    cache_key = ("2023-2024", "LAL", "BOS")
+    fresh = app_module.prediction_cache[cache_key]
+    app_module.prediction_cache[cache_key] = {**fresh, "confidence": "stale"}
+
+    # An online model publish reloads the predictor in place
+    assert predictor.load_model()
+    response = client.post("/api/predict-teams", json=payload)
+
+    assert response.status_code == 200
+    assert app_module.prediction_cache[cache_key] == fresh
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from backtest import run_backtest, season_feature_matrices, walk_forward_folds  # noqa: E402
+from train_model import build_training_dataset  # noqa: E402
+
+DATA_DIR = os.path.join(BACKEND_DIR, "data")
+SEASONS = ["2021-2022", "2022-2023", "2023-2024"]
+
+
+@pytest.fixture(scope="module")
+def season_frame():
+    frames = []
+    for season in SEASONS:
+        frame = pd.read_csv(os.path.join(DATA_DIR, f"nba_{season.replace('-', '_')}_final_data.csv"))
+        frame['__season_key'] = season
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_season_matrices_match_per_season_build(season_frame):
+    matrices = season_feature_matrices(season_frame)
+
+    assert sorted(matrices) == SEASONS
+    alone = season_frame[season_frame['__season_key'] == "2022-2023"].reset_index(drop=True)
+    X, y = build_training_dataset(alone)
+    pd.testing.assert_frame_equal(matrices["2022-2023"]['X'], X)
+    assert (matrices["2022-2023"]['y'] == y.to_numpy()).all()
+    assert matrices["2022-2023"]['month_order'][:2] == ['october', 'november']
+
+
+def test_walk_forward_folds_never_train_on_the_future(season_frame):
+    matrices = season_feature_matrices(season_frame)
+
+    seasonal = walk_forward_folds(matrices)
+    assert [fold['test'] for fold in seasonal] == [("2022-2023", None), ("2023-2024", None)]
+    assert seasonal[1]['train'] == [("2021-2022", None), ("2022-2023", None)]
+
+    monthly = walk_forward_folds(matrices, monthly=True)
+    december = next(fold for fold in monthly if fold['test'] == ("2023-2024", "december"))
+    assert december['train'][-2:] == [("2023-2024", "october"), ("2023-2024", "november")]
+
+
+def test_parallel_backtest_matches_serial(season_frame, tmp_path):
+    matrices = season_feature_matrices(season_frame)
+    metadata_path = str(tmp_path / "model_metadata.json")
+
+    serial = run_backtest(matrices=matrices, n_jobs=1, metadata_path=metadata_path)
+    parallel = run_backtest(matrices=matrices, n_jobs=2, metadata_path=metadata_path)
+
+    strip = lambda folds: [{k: v for k, v in fold.items() if k != 'seconds'} for fold in folds]  # noqa: E731
+    assert strip(serial['folds']) == strip(parallel['folds'])
+    assert serial['summary']['test_games'] == sum(len(m['y']) for s, m in matrices.items() if s != "2021-2022")
+    assert 0.5 < serial['summary']['accuracy'] < 1
@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import model_utils  # noqa: E402
+from backtest import DEFAULT_PARAMS, _load_params  # noqa: E402
+from chunked_training import train_chunked  # noqa: E402
+from synthetic_games import write_synthetic_seasons  # noqa: E402
+
+
+def test_chunked_training_streams_files_and_serves_through_the_predictor(tmp_path, monkeypatch):
+    season_files = write_synthetic_seasons(str(tmp_path / 'data'), 6000, chunk_size=3000)
+    # Backtest results and the online block outlive a retrain; everything else is replaced
+    backtest = {'params': DEFAULT_PARAMS, 'folds': []}
+    online = {'version': 3, 'previous_model_file': 'model_20250101_000000.pkl'}
+    (tmp_path / 'model_metadata.json').write_text(json.dumps(
+        {'backtest': backtest, 'online': online, 'training_mode': 'online', 'model_search': {}}))
+
+    train_chunked(season_files, base_dir=str(tmp_path), chunk_rows=1000)
+
+    metadata = json.loads((tmp_path / 'model_metadata.json').read_text())
+    assert metadata['training_mode'] == 'chunked'
+    assert metadata['backtest'] == backtest and metadata['online'] == online
+    assert 'model_search' not in metadata
+    # Files are read chunk_rows at a time: two 2460-row seasons take 3 chunks each, the last 1080 rows 2
+    assert len(season_files) == 3 and metadata['chunked']['chunks'] == 8
+    assert metadata['chunked']['train_rows'] + metadata['chunked']['holdout_rows'] == 6000
+    assert metadata['random_split_metrics']['accuracy'] > 0.5
+    # SGD settings stay out of best_params, which backtest and online_model refit logistic models with
+    assert metadata['best_params'] is None and metadata['chunked']['alpha'] == 1e-3
+    assert _load_params(str(tmp_path / 'model_metadata.json')) == DEFAULT_PARAMS
+    assert [stage['stage'] for stage in metadata['profile']['stages']] == [
+        'scaler_pass', 'training_pass', 'calibrate', 'save_artifacts']
+
+    monkeypatch.setattr(model_utils, '_resolve_backend_dir', lambda: str(tmp_path))
+    predictor = model_utils.GamePredictor()
+    assert predictor.load_model()
+    prediction = predictor.predict_game({'wins': 40, 'losses': 10}, {'wins': 10, 'losses': 40}, {})
+    assert prediction['home_win_prob'] > 0.5
@@ -0,0 +1,77 @@
+import os
+import sys
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from NBADataScraper import NBADataScraper  # noqa: E402
+from benchmarks.fixture_pages import scraped_game_results  # noqa: E402
+
+
+def _scraper(games):
+    scraper = NBADataScraper()
+    scraper.game_results = games
+    return scraper
+
+
+def test_recent_performance_table_matches_per_game_scans():
+    games = scraped_game_results([2024])[:300]
+    # Out-of-order and same-day rows exercise the date grouping.
+    games = games[150:] + games[:150]
+    games.append(dict(games[10]))
+    scraper = _scraper(games)
+
+    expected = [
+        (scraper.calculate_recent_performance(g['Visitor/Neutral'], g['Date'], g['Season']),
+         scraper.calculate_recent_performance(g['Home/Neutral'], g['Date'], g['Season']))
+        for g in games
+    ]
+    assert scraper.recent_performance_table() == expected
+
+
+def test_enhance_game_data_keeps_recent_form_columns():
+    scraper = _scraper([
+        {'Date': 'Tue Oct 24 2023', 'Visitor/Neutral': 'Boston Celtics', 'PTS': '104',
+         'Home/Neutral': 'New York Knicks', 'Visitor_PTS': 108, 'Home_PTS': 104, 'Season': '2023-2024'},
+        {'Date': 'Fri Oct 27 2023', 'Visitor/Neutral': 'Miami Heat', 'PTS': '119',
+         'Home/Neutral': 'Boston Celtics', 'Visitor_PTS': 111, 'Home_PTS': 119, 'Season': '2023-2024'},
+    ])
+    enhanced = scraper.enhance_game_data()
+
+    second = enhanced.iloc[1]
+    assert (second['Recent Wins (Home)'], second['Recent Losses (Home)'], second['Recent Win % (Home)']) == (1, 0, 100.0)
+    assert (second['Recent Wins (Visitor)'], second['Recent Losses (Visitor)']) == (0, 0)
+
+
+def test_head_to_head_table_matches_season_scans():
+    games = scraped_game_results([2023, 2024])
+    games = games[:400] + games[-400:]
+    # An unplayed game (no scores yet) is credited to the home side.
+    unplayed = dict(games[-1], Visitor_PTS='', Home_PTS='', PTS='')
+    games.append(unplayed)
+    scraper = _scraper(games)
+
+    expected = []
+    for game in games:
+        visitor, home = game['Visitor/Neutral'], game['Home/Neutral']
+        h2h = scraper.calculate_head_to_head(visitor, home, game['Season'])
+        expected.append({'home_wins': h2h[f"{home}_wins"], 'visitor_wins': h2h[f"{visitor}_wins"],
+                         'total_games': h2h['total_games']})
+    assert scraper.head_to_head_table() == expected
+
+
+def test_streamed_rows_match_dataframe_pipeline(tmp_path):
+    from ingest import write_season_rows
+    import pandas as pd
+
+    scraper = _scraper(scraped_game_results([2024])[:400])
+    enhanced = scraper.enhance_game_data().to_dict('records')
+    final = scraper.calculate_team_record(scraper.calculate_days_since_last_match(enhanced))
+    pd.DataFrame(final).to_csv(tmp_path / "batch.csv", index=False)
+
+    written = write_season_rows(str(tmp_path / "streamed.csv"), scraper.iter_final_rows(), chunk_size=64)
+
+    assert written == 400
+    assert (tmp_path / "streamed.csv").read_text() == (tmp_path / "batch.csv").read_text()
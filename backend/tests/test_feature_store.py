@@ -0,0 +1,49 @@
+import os
+import shutil
+import sys
+
+import pandas as pd
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import feature_store  # noqa: E402
+from feature_store import FeatureStore, stack_seasons  # noqa: E402
+from train_model import build_training_dataset, load_training_frame  # noqa: E402
+
+SEASON_CSV = os.path.join(BACKEND_DIR, "data", "nba_2022_2023_final_data.csv")
+
+
+def test_store_rebuilds_only_stale_seasons(tmp_path, monkeypatch):
+    csv_path = str(tmp_path / "nba_2022_2023_final_data.csv")
+    shutil.copy(SEASON_CSV, csv_path)
+    store = FeatureStore(str(tmp_path / "features"))
+
+    built = store.load_season(csv_path)
+    loaded = store.load_season(csv_path)
+    assert (store.rebuilt, store.hits) == (1, 1)
+    pd.testing.assert_frame_equal(loaded['X'], built['X'])
+    assert (loaded['y'] == built['y']).all() and loaded['month_order'] == built['month_order']
+
+    df = pd.read_csv(csv_path)
+    df.iloc[:10].to_csv(csv_path, index=False)  # the CSV changed: rebuild
+    assert len(store.load_season(csv_path)['y']) == 10
+    monkeypatch.setattr(feature_store, "FEATURE_SCHEMA_VERSION", feature_store.FEATURE_SCHEMA_VERSION + 1)
+    store.load_season(csv_path)  # the feature schema changed: rebuild
+    assert (store.rebuilt, store.hits) == (3, 1)
+
+
+def test_stacked_store_matches_full_build(tmp_path):
+    store = FeatureStore(str(tmp_path / "features"))
+    data_dir = os.path.join(BACKEND_DIR, "data")
+    paths = sorted(os.path.join(data_dir, name) for name in os.listdir(data_dir) if name.endswith("_final_data.csv"))
+
+    X, y, seasons = stack_seasons(store.load(paths))
+
+    df = load_training_frame(BACKEND_DIR)
+    expected_X, expected_y = build_training_dataset(df)
+    pd.testing.assert_frame_equal(X, expected_X)
+    assert (y.to_numpy() == expected_y.to_numpy()).all()
+    assert (seasons == df['__season_key'].to_numpy()).all()
@@ -0,0 +1,29 @@
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from game_store import GameStore  # noqa: E402
+
+
+def test_add_frame_matches_row_dicts_and_parses_dates():
+    df = pd.DataFrame(
+        [['Tue Oct 24 2023', 'Los Angeles Lakers', '107', 'Denver Nuggets', '119', 'OT', 107, 119],
+         ['not a date', 'Phoenix Suns', '108', 'Golden State Warriors', '104', '', 108, 104]],
+        columns=['Date', 'Visitor/Neutral', 'PTS', 'Home/Neutral', 'PTS', '', 'Visitor_PTS', 'Home_PTS'],
+    )
+    store = GameStore()
+    store.add_frame(df)
+
+    assert store == [row.to_dict() for _, row in df.iterrows()]
+    assert store[0]['PTS'] == '119'
+    assert store[0].date == datetime(2023, 10, 24)
+    assert store[1].date is None
+    assert store[0].copy() == dict(store[0])
+    assert store.parse_date('2023-10-24') == datetime(2023, 10, 24)
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pandas as pd
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from ingest import IngestWatcher, ingest_results, season_csv_path  # noqa: E402
+
+TEAM_LOOKUP = {
+    "BOS": "BOSTON CELTICS",
+    "NYK": "NEW YORK KNICKS",
+    "PHI": "PHILADELPHIA 76ERS",
+    "BOSTON CELTICS": "BOSTON CELTICS",
+}
+
+
+def _game(date, home, visitor, home_pts, visitor_pts):
+    return {"date": date, "home_team": home, "visitor_team": visitor,
+            "home_pts": home_pts, "visitor_pts": visitor_pts}
+
+
+def test_ingest_updates_state_and_appends_season_csv(tmp_path):
+    season_data, season_states = {}, {}
+    payloads = [
+        _game("2025-10-22", "BOS", "NYK", 110, 100),
+        _game("2025-10-24", "PHI", "BOSTON CELTICS", 99, 104),
+        _game("2025-10-24", "PHI", "BOS", 99, 104),  # duplicate
+        _game("2025-10-25", "BOS", "LAL", 1, 2),  # unknown team
+    ]
+
+    summary = ingest_results(payloads, season_data, season_states, TEAM_LOOKUP, data_dir=str(tmp_path))
+
+    assert summary["ingested"] == 2
+    assert summary["duplicates"] == 1
+    assert len(summary["errors"]) == 1
+    assert summary["affected_teams"]["2025-2026"] == ["BOSTON CELTICS", "NEW YORK KNICKS", "PHILADELPHIA 76ERS"]
+
+    state = season_states["2025-2026"]
+    assert state.team_stats("BOSTON CELTICS")["wins"] == 2
+    assert state.team_stats("BOSTON CELTICS")["form"] == "WW"
+    assert state.matchup("PHILADELPHIA 76ERS", "BOSTON CELTICS")["away_wins"] == 1
+    assert len(season_data["2025-2026"]) == 2
+
+    saved = pd.read_csv(season_csv_path(str(tmp_path), "2025-2026"))
+    second = saved.iloc[1]
+    assert second["Home/Neutral"] == "Philadelphia 76ers"
+    assert second["Wins (Visitor)"] == 1 and second["Losses (Home)"] == 0
+    assert second["Recent Win % (Visitor)"] == 100.0
+    assert second["DSLG (Visitor)"] == 2.0
+    assert second["Matchup Wins (Visitor)"] == 1
+
+
+def test_ingest_rejects_games_older_than_stored_results(tmp_path):
+    season_data, season_states = {}, {}
+    ingest_results([_game("2025-11-02", "BOS", "NYK", 110, 100)],
+                   season_data, season_states, TEAM_LOOKUP, data_dir=str(tmp_path))
+
+    summary = ingest_results([_game("2025-11-01", "NYK", "BOS", 110, 100)],
+                             season_data, season_states, TEAM_LOOKUP, data_dir=str(tmp_path))
+
+    assert summary["ingested"] == 0
+    assert "predates" in summary["errors"][0]["error"]
+
+
+def test_watcher_ingests_dropped_files(tmp_path):
+    received = []
+
+    def handler(games):
+        received.extend(games)
+        return {"ingested": len(games)}
+
+    drop = tmp_path / "results.json"
+    drop.write_text('{"games": [{"date": "2025-10-22", "home_team": "BOS"}]}')
+
+    assert IngestWatcher(str(tmp_path), handler).poll_once() == 1
+    assert received == [{"date": "2025-10-22", "home_team": "BOS"}]
+    assert (tmp_path / "processed" / "results.json").exists()
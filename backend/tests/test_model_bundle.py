@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import sys
+
+import joblib
+import numpy as np
+import pytest
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import model_utils  # noqa: E402
+from model_bundle import load_bundle, save_bundle  # noqa: E402
+
+
+@pytest.fixture
+def artifacts_dir(tmp_path, monkeypatch):
+    """A backend dir with the tracked model/scaler pickles, a bundle of them and metadata naming all three."""
+    for name in ('model.pkl', 'scaler.pkl'):
+        shutil.copyfile(os.path.join(BACKEND_DIR, name), tmp_path / name)
+    scaler = joblib.load(tmp_path / 'scaler.pkl')
+    bundle_file, checksum = save_bundle(str(tmp_path), joblib.load(tmp_path / 'model.pkl'), scaler,
+                                        scaler.feature_names_in_)
+    (tmp_path / 'model_metadata.json').write_text(json.dumps({
+        'model_file': 'model.pkl',
+        'scaler_file': 'scaler.pkl',
+        'bundle_file': bundle_file,
+        'bundle_sha256': checksum,
+    }))
+    monkeypatch.setattr(model_utils, '_resolve_backend_dir', lambda: str(tmp_path))
+    return tmp_path, bundle_file, checksum
+
+
+def test_bundle_round_trips_with_memory_mapped_arrays(artifacts_dir):
+    tmp_path, bundle_file, checksum = artifacts_dir
+
+    bundle = load_bundle(str(tmp_path / bundle_file), checksum)
+
+    assert isinstance(bundle['scaler'].mean_, np.memmap)
+    assert not bundle['scaler'].mean_.flags.writeable
+    assert bundle['feature_names'] == list(joblib.load(tmp_path / 'scaler.pkl').feature_names_in_)
+
+
+def test_predictor_serves_the_bundle_and_refuses_a_torn_one(artifacts_dir):
+    tmp_path, bundle_file, checksum = artifacts_dir
+    stats = ({'wins': 40, 'losses': 10}, {'wins': 10, 'losses': 40}, {})
+
+    predictor = model_utils.GamePredictor()
+    assert predictor.load_model()
+    assert predictor.feature_names is not None
+    from_bundle = predictor.predict_game(*stats)
+
+    with open(tmp_path / bundle_file, 'r+b') as f:
+        f.truncate(os.path.getsize(tmp_path / bundle_file) // 2)
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        load_bundle(str(tmp_path / bundle_file), checksum)
+
+    fallback = model_utils.GamePredictor()
+    assert fallback.load_model()
+    assert fallback.feature_names is None
+    assert fallback.predict_game(*stats)['home_win_prob'] == pytest.approx(from_bundle['home_win_prob'])
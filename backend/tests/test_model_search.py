@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from model_search import search_model_families  # noqa: E402
+from train_model import _calibrated_logit, build_training_dataset  # noqa: E402
+
+DATA_PATH = os.path.join(BACKEND_DIR, "data", "nba_2023_2024_final_data.csv")
+
+
+@pytest.fixture(scope="module")
+def split():
+    X, y = build_training_dataset(pd.read_csv(DATA_PATH))
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    scaler = StandardScaler()
+    return scaler.fit_transform(X_train), scaler.transform(X_test), y_train, y_test
+
+
+def test_search_reports_every_family_and_picks_a_scored_winner(split):
+    X_train, X_test, y_train, y_test = split
+    baseline = _calibrated_logit({'C': 0.1, 'class_weight': None, 'solver': 'lbfgs'}).fit(X_train, y_train)
+
+    result = search_model_families(X_train, y_train, budget_seconds=20, n_jobs=1,
+                                   families=['logistic_l2'], baseline=('logistic', baseline))
+
+    assert [c['family'] for c in result['candidates']] == ['logistic', 'logistic_l2']
+    assert all(c['p99_ms'] >= c['p50_ms'] > 0 for c in result['candidates'])
+    # Chosen on training rows alone; the test split is only used below
+    assert all('test_accuracy' not in c and 0.5 < c['validation_accuracy'] < 1 for c in result['candidates'])
+    search = result['candidates'][1]
+    assert search['n_candidates'] >= 3 and search['halving_iterations'] >= 2
+    assert result['winner'] in {'logistic', 'logistic_l2'}
+    assert result['model'].predict_proba(X_test).shape == (len(X_test), 2)
+
+
+def test_families_that_cannot_fit_the_budget_are_skipped(split):
+    X_train, X_test, y_train, y_test = split
+    baseline = _calibrated_logit({'C': 0.1, 'class_weight': None, 'solver': 'lbfgs'}).fit(X_train, y_train)
+
+    result = search_model_families(X_train, y_train, budget_seconds=0.01, n_jobs=1,
+                                   families=['hist_gradient_boosting'], baseline=('logistic', baseline))
+
+    assert 'skipped' in result['candidates'][1]
+    assert result['winner'] == 'logistic' and result['model'] is baseline
+
+
+def test_search_stays_within_a_small_budget(split):
+    X_train, _, y_train, _ = split
+    baseline = _calibrated_logit({'C': 0.1, 'class_weight': None, 'solver': 'lbfgs'}).fit(X_train, y_train)
+
+    result = search_model_families(X_train, y_train, budget_seconds=3, n_jobs=1, baseline=('logistic', baseline))
+
+    # Probes, halving fits, calibration, the winner's refit and latency timing all come out of the budget
+    assert result['elapsed_seconds'] <= 3 * 1.15
+    searched = [c for c in result['candidates'][1:] if 'skipped' not in c]
+    assert all(c['planned_seconds'] <= 3 for c in searched)
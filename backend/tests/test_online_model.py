@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+
+import pandas as pd
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from model_utils import GamePredictor  # noqa: E402
+from online_model import OnlineLearner  # noqa: E402
+from train_model import build_training_dataset  # noqa: E402
+
+DATA_DIR = os.path.join(BACKEND_DIR, "data")
+
+
+def _season(season):
+    frame = pd.read_csv(os.path.join(DATA_DIR, f"nba_{season.replace('-', '_')}_final_data.csv"))
+    return build_training_dataset(frame)
+
+
+def test_learner_recalibrates_on_schedule_and_keeps_a_bounded_window():
+    X, y = _season("2022-2023")
+    learner = OnlineLearner(recalibrate_every=300, calibration_window=500)
+
+    versions = [learner.partial_fit(X.iloc[start:start + 100], y.iloc[start:start + 100])
+                for start in range(0, len(X), 100)]
+
+    assert learner.rows_seen == len(X)
+    assert learner.version == sum(versions) == len(X) // 300
+    assert len(learner.window_y) == 500
+    X_next, y_next = _season("2023-2024")
+    prob = learner.predict_proba(X_next)
+    assert ((prob >= 0.5).astype(int) == y_next).mean() > 0.7
+
+
+def test_saved_version_is_served_through_model_metadata(tmp_path):
+    metadata_path = tmp_path / "model_metadata.json"
+    metadata_path.write_text(json.dumps({'model_file': 'model_batch.pkl', 'scaler_file': 'scaler_batch.pkl'}))
+    X, y = _season("2023-2024")
+    learner = OnlineLearner(recalibrate_every=len(X))
+    assert learner.partial_fit(X, y)
+
+    model_file, scaler_file = learner.save_artifacts(base_dir=str(tmp_path), publish=True)
+
+    metadata = json.loads(metadata_path.read_text())
+    assert (metadata['model_file'], metadata['scaler_file']) == (model_file, scaler_file)
+    assert metadata['online']['version'] == 1
+    assert metadata['online']['previous_model_file'] == 'model_batch.pkl'
+    predictor = GamePredictor()
+    assert predictor.load_model(str(tmp_path / model_file), str(tmp_path / scaler_file))
+    result = predictor.predict_game({'wins': 40, 'losses': 10}, {'wins': 10, 'losses': 40}, {})
+    assert result['predicted_winner'] == 'home'
@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from http_client import FetchClient  # noqa: E402
+from page_cache import PageCache, finished_season_policy  # noqa: E402
+
+
+class _ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = []
+
+    def do_GET(self):
+        type(self).hits.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = f"page {self.path}".encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def etag_server():
+    _ETagHandler.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_finished_season_policy():
+    today = date(2025, 1, 15)
+    assert finished_season_policy("https://x/leagues/NBA_2024_games-march.html", today) == "immutable"
+    assert finished_season_policy("https://x/leagues/NBA_2025_games-march.html", today) == "revalidate"
+    assert finished_season_policy("https://x/teams/BOS/2024.html", today) == "immutable"
+    assert finished_season_policy("https://x/teams/BOS/2025.html", date(2025, 9, 1)) == "immutable"
+
+
+def test_revalidates_live_pages_and_skips_network_for_finished_ones(etag_server, tmp_path):
+    client = FetchClient(cache=PageCache(str(tmp_path)))
+    live = f"{etag_server}/leagues/NBA_2099_games-october.html"
+    finished = f"{etag_server}/leagues/NBA_2001_games-october.html"
+
+    first = client.get(live)
+    second = client.get(live)
+    client.get(finished)
+    offline = client.get(finished)
+
+    assert first.from_cache is False and second.from_cache is True
+    assert second.content == first.content
+    assert offline.from_cache is True and offline.content == b"page /leagues/NBA_2001_games-october.html"
+    assert _ETagHandler.hits == [
+        ("/leagues/NBA_2099_games-october.html", None),
+        ("/leagues/NBA_2099_games-october.html", '"v1"'),
+        ("/leagues/NBA_2001_games-october.html", None),
+    ]
+
+    # A new process sees the same cache on disk
+    reopened = FetchClient(cache=PageCache(str(tmp_path)))
+    assert reopened.get(finished).from_cache is True
+    assert reopened.connection_stats()["requests"] == 0
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = PageCache(str(tmp_path), max_bytes=25)
+    cache.store("a", b"x" * 10)
+    cache.store("b", b"y" * 10)
+    cache.lookup("a")
+    cache.touch("a")
+    cache.store("c", b"z" * 10)
+
+    assert cache.lookup("b") == (None, None)
+    assert cache.lookup("a")[1] == b"x" * 10
+    assert cache.total_bytes() == 20
+    assert len(os.listdir(os.path.join(str(tmp_path), "objects"))) == 2
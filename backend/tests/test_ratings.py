@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pandas as pd
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from ratings import add_rating_features, get_season_ratings, normalize_games, solve_ratings  # noqa: E402
+
+
+def _games(rows):
+    return pd.DataFrame(rows, columns=["Date", "Visitor/Neutral", "Home/Neutral", "Visitor_PTS", "Home_PTS"])
+
+
+def test_massey_recovers_margins_and_home_court():
+    # A is 10 points better than B, B is 10 points better than C, home court is worth 3.
+    df = _games([
+        ("Mon Jan 01 2024", "B", "A", 90, 103),
+        ("Tue Jan 02 2024", "A", "B", 97, 90),
+        ("Wed Jan 03 2024", "C", "B", 90, 103),
+        ("Thu Jan 04 2024", "B", "C", 97, 90),
+        ("Fri Jan 05 2024", "C", "A", 90, 113),
+        ("Sat Jan 06 2024", "A", "C", 107, 90),
+    ])
+
+    result = solve_ratings(normalize_games(df), method="massey")
+    ratings = result["ratings"]
+
+    assert abs(result["home_advantage"] - 3.0) < 1e-6
+    assert abs(ratings["A"] - ratings["B"] - 10.0) < 1e-6
+    assert abs(ratings["B"] - ratings["C"] - 10.0) < 1e-6
+    assert abs(sum(ratings.values())) < 1e-6
+
+
+def test_ratings_respect_as_of_and_skip_unplayed_games():
+    df = _games([
+        ("Mon Jan 01 2024", "B", "A", 90, 100),
+        ("Tue Jan 02 2024", "A", "B", 80, 100),
+        ("Wed Jan 03 2024", "A", "B", 0, 0),
+    ])
+
+    early = get_season_ratings("test-as-of", df, as_of="2024-01-02", method="srs")
+    full = get_season_ratings("test-as-of", df, method="srs")
+
+    assert early["games"] == 1
+    assert full["games"] == 2
+    assert early["ratings"]["A"] > 0
+    assert full["ratings"]["A"] < 0
+
+
+def test_rating_features_have_no_lookahead():
+    df = _games([("Mon Jan 01 2024", "B", "A", 90, 100)] * 3)
+    df["__season_key"] = "2023-2024"
+
+    out = add_rating_features(df)
+
+    assert (out["home_rating"] == 0).all()
+    assert (out["rating_diff"] == 0).all()
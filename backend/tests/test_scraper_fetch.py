@@ -0,0 +1,258 @@
+import functools
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import NBADataScraper as scraper_module  # noqa: E402
+from http_client import FetchClient  # noqa: E402
+from ingest import write_season_rows  # noqa: E402
+from NBADataScraper import NBADataScraper  # noqa: E402
+from rate_limit import ProcessTokenBucket, TokenBucket  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+MONTHS = ["october", "november", "december"]  # no december fixture: a 404
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    handler = functools.partial(_QuietHandler, directory=FIXTURES_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_fetch_matches_serial_output(fixture_server, monkeypatch):
+    monkeypatch.setattr(scraper_module.time, "sleep", lambda seconds: None)
+
+    serial = NBADataScraper(base_url=fixture_server)
+    serial_df = serial.scrape_full_season("2024", MONTHS)
+
+    concurrent = NBADataScraper(base_url=fixture_server)
+    concurrent_df = concurrent.scrape_full_season(
+        "2024", MONTHS, concurrent=True, requests_per_second=50, max_in_flight=3
+    )
+
+    assert len(serial_df) == 12
+    pd.testing.assert_frame_equal(serial_df, concurrent_df)
+    assert serial.game_results == concurrent.game_results
+
+
+@pytest.mark.parametrize("fast_parser", ["html.parser", "lxml"])
+def test_fast_parse_mode_matches_full_parse(fast_parser, monkeypatch):
+    if fast_parser == "lxml":
+        pytest.importorskip("lxml")
+    monkeypatch.setattr(scraper_module, "FAST_PARSER", fast_parser)
+
+    full = NBADataScraper(parse_mode="full")
+    fast = NBADataScraper(parse_mode="fast")
+    for month in ["october", "november"]:
+        with open(os.path.join(FIXTURES_DIR, "leagues", f"NBA_2024_games-{month}.html"), "rb") as f:
+            content = f.read()
+        url = f"{full.base_url}/leagues/NBA_2024_games-{month}.html"
+        pd.testing.assert_frame_equal(full.parse_month_page(content, url), fast.parse_month_page(content, url))
+
+    assert full.game_results == fast.game_results
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=20)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+
+    # First token is immediate, the remaining four are spaced 50ms apart.
+    assert time.monotonic() - start >= 0.18
+
+
+def _take_tokens(bucket, count):
+    for _ in range(count):
+        bucket.acquire()
+
+
+def test_process_token_bucket_paces_across_processes():
+    import multiprocessing
+
+    bucket = ProcessTokenBucket(rate=20)
+    workers = [multiprocessing.Process(target=_take_tokens, args=(bucket, 3)) for _ in range(2)]
+    start = time.monotonic()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # Six tokens between both processes: the last five are spaced 50ms apart.
+    assert time.monotonic() - start >= 0.23
+
+
+class _FlakyHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures_left = 0
+
+    def do_GET(self):
+        if type(self).failures_left > 0:
+            type(self).failures_left -= 1
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_fetch_client_retries_and_reuses_connections():
+    _FlakyHandler.failures_left = 2
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+
+    client = FetchClient(backoff_base=0.01)
+    try:
+        assert client.get(url).content == b"ok"
+        for _ in range(3):
+            client.get(url)
+        stats = client.connection_stats()
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    assert stats["requests"] == 6
+    assert stats["retries"] == 2
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 5
+
+
+def _write_full_scrape(base_url, path, months=MONTHS[:2], unplayed=()):
+    """Write a season CSV as scrape_season does; games of ``unplayed`` months are scheduled, not played."""
+    fetcher, scraper = NBADataScraper(base_url=base_url), NBADataScraper(base_url=base_url)
+    for month, frame in fetcher.iter_season_frames("2024", months):
+        if month in unplayed:
+            frame = frame.assign(PTS='', Visitor_PTS=0, Home_PTS=0)
+        scraper.add_month_frame(frame)
+    write_season_rows(str(path), scraper.iter_final_rows())
+
+
+def test_incremental_update_appends_only_new_games(fixture_server, monkeypatch, tmp_path):
+    from scraper import update_season_csv
+
+    monkeypatch.setattr(scraper_module.time, "sleep", lambda seconds: None)
+    csv_path = tmp_path / "nba_2023_2024.csv"
+    _write_full_scrape(fixture_server, csv_path, months=MONTHS[:1])
+    full_path = tmp_path / "full.csv"
+    _write_full_scrape(fixture_server, full_path)
+
+    added = update_season_csv(NBADataScraper(base_url=fixture_server), "2024", str(csv_path), MONTHS[:2])
+
+    assert added == 6
+    # Every column, derived ones included, is what a full scrape of both months writes
+    assert csv_path.read_text() == full_path.read_text()
+    assert list(pd.read_csv(csv_path)['Month'].iloc[6:]) == ['november'] * 6
+
+    assert update_season_csv(NBADataScraper(base_url=fixture_server), "2024", str(csv_path), MONTHS[:2]) == 0
+    assert csv_path.read_text() == full_path.read_text()
+
+
+def test_incremental_update_fills_in_unplayed_rows(fixture_server, monkeypatch, tmp_path):
+    from scraper import update_season_csv
+
+    monkeypatch.setattr(scraper_module.time, "sleep", lambda seconds: None)
+    # A mid-season CSV: November is scheduled but not played yet
+    csv_path = tmp_path / "nba_2023_2024.csv"
+    _write_full_scrape(fixture_server, csv_path, unplayed=("november",))
+    before = pd.read_csv(csv_path)
+    assert len(before) == 12 and (before['Home_PTS'].iloc[6:] == 0).all()
+    full_path = tmp_path / "full.csv"
+    _write_full_scrape(fixture_server, full_path)
+
+    added = update_season_csv(NBADataScraper(base_url=fixture_server), "2024", str(csv_path), MONTHS[:2])
+
+    assert added == 6
+    assert csv_path.read_text() == full_path.read_text()
+    assert update_season_csv(NBADataScraper(base_url=fixture_server), "2024", str(csv_path), MONTHS[:2]) == 0
+
+
+class _CountingHandler(_QuietHandler):
+    paths = []
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        super().do_GET()
+
+
+@pytest.fixture
+def counting_server():
+    _CountingHandler.paths = []
+    handler = functools.partial(_CountingHandler, directory=FIXTURES_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", _CountingHandler.paths
+    server.shutdown()
+    server.server_close()
+
+
+def test_journal_resume_replays_fetched_months(counting_server, monkeypatch, tmp_path):
+    from scrape_journal import ScrapeJournal
+    from scraper import scrape_season
+
+    base_url, paths = counting_server
+    monkeypatch.setattr(scraper_module.time, "sleep", lambda seconds: None)
+    journal = ScrapeJournal(str(tmp_path / "journal"))
+    options = dict(data_dir=str(tmp_path), months=MONTHS, base_url=base_url, journal=journal)
+
+    assert scrape_season("2024", FetchClient(), **options) == 12
+    first_run = (tmp_path / "nba_2023_2024.csv").read_text()
+    assert journal.completed("2024", "month") == {"october", "november"}
+
+    # Interrupted before the CSV was kept: only the month that failed is fetched again
+    (tmp_path / "nba_2023_2024.csv").unlink()
+    paths.clear()
+    assert scrape_season("2024", FetchClient(), **options) == 12
+    assert paths == ["/leagues/NBA_2024_games-december.html"]
+    assert (tmp_path / "nba_2023_2024.csv").read_text() == first_run
+
+    paths.clear()
+    assert scrape_season("2024", FetchClient(), **options) == 0
+    assert paths == []
+
+
+def test_worker_processes_share_rate_limit_and_write_seasons(counting_server, tmp_path):
+    from scraper import run_scraper
+
+    base_url, paths = counting_server
+    stats = run_scraper(start_year=2023, end_year=2024, workers=2, requests_per_second=50, use_cache=False,
+                        journal_dir=str(tmp_path / "journal"), base_url=base_url, data_dir=str(tmp_path / "data"))
+
+    written = pd.read_csv(tmp_path / "data" / "nba_2023_2024.csv")
+    assert len(written) == 12
+    assert not (tmp_path / "data" / "nba_2022_2023.csv").exists()  # no fixtures for that season
+    assert len(paths) == 14
+    # Each worker's connection counts are summed into the final report
+    assert stats['requests'] == 14 and stats['failures'] == 0
+    assert stats['connections_opened'] >= 1
+    assert stats['connections_opened'] + stats['connections_reused'] == 14
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from ingest import prepare_season_frame  # noqa: E402
+from season_loader import TRAINING_COLUMNS, load_seasons, read_season_csv  # noqa: E402
+from train_model import build_training_dataset  # noqa: E402
+
+DATA_DIR = os.path.join(BACKEND_DIR, "data")
+SEASONS = ["2022-2023", "2023-2024"]
+
+
+def _path(season):
+    return os.path.join(DATA_DIR, f"nba_{season.replace('-', '_')}_final_data.csv")
+
+
+def test_typed_load_builds_the_same_features_from_fewer_smaller_columns():
+    df = load_seasons([_path(season) for season in SEASONS], SEASONS, TRAINING_COLUMNS)
+    default = pd.concat([pd.read_csv(_path(season)) for season in SEASONS], ignore_index=True)
+
+    assert list(df['__season_key'].cat.categories) == SEASONS
+    assert (df['__season_key'] == SEASONS[0]).sum() == len(pd.read_csv(_path(SEASONS[0])))
+    assert df['Wins (Home)'].dtype == 'int16'
+    assert isinstance(df['Home/Neutral'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['Month'].dtype, pd.CategoricalDtype)
+    assert df.memory_usage(deep=True).sum() < default.memory_usage(deep=True).sum() / 3
+    X, y = build_training_dataset(df)
+    X_default, y_default = build_training_dataset(default)
+    assert np.array_equal(X.to_numpy(dtype=float), X_default.to_numpy(dtype=float))
+    assert (y == y_default).all()
+
+
+def test_scores_with_gaps_are_read_as_nullable_int16(tmp_path):
+    rows = pd.read_csv(_path(SEASONS[0]), nrows=5)
+    rows.loc[4, ['Visitor_PTS', 'Home_PTS']] = np.nan
+    path = tmp_path / "nba_2022_2023_final_data.csv"
+    rows.to_csv(path, index=False)
+
+    df = read_season_csv(str(path))
+
+    assert df['Home_PTS'].dtype == 'Int16' and df['Home_PTS'].isna().sum() == 1
+    assert df['Wins (Home)'].dtype == 'int16'
+
+    prepared = prepare_season_frame(df)
+    assert prepared['home_win'].tolist()[4] == 0
+    # Team names are upper-cased category by category, so the columns stay categorical
+    assert isinstance(prepared['home_team'].dtype, pd.CategoricalDtype)
+    assert prepared['home_team'].tolist() == rows['Home/Neutral'].str.upper().tolist()
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from season_loader import read_season_csv  # noqa: E402
+from synthetic_games import games_per_season, synthetic_seasons, write_synthetic_seasons  # noqa: E402
+from train_model import build_training_dataset  # noqa: E402
+
+
+def test_seasons_are_chunked_and_schedule_consistent():
+    seasons = list(synthetic_seasons(5000, chunk_size=2500))
+
+    assert [key for key, _ in seasons] == ['2017-2018', '2018-2019', '2019-2020']
+    assert [len(frame) for _, frame in seasons] == [2 * games_per_season()] * 2 + [5000 - 4 * games_per_season()]
+    df = seasons[1][1]
+    # Every team plays once per date, and each row carries the record from before the game
+    for _, games in df.groupby('Date', observed=True):
+        teams = pd.concat([games['Home/Neutral'], games['Visitor/Neutral']])
+        assert teams.is_unique
+    home_win = (df['Home_PTS'] > df['Visitor_PTS']).to_numpy()
+    team = df['Home/Neutral'].iloc[0]
+    played = df[(df['Home/Neutral'] == team) | (df['Visitor/Neutral'] == team)]
+    won = np.where(played['Home/Neutral'] == team, home_win[played.index], ~home_win[played.index])
+    wins = np.where(played['Home/Neutral'] == team, played['Wins (Home)'], played['Wins (Visitor)'])
+    assert (np.diff(wins) == won[:-1]).all()
+
+
+def test_written_seasons_load_like_scraped_ones(tmp_path):
+    paths = write_synthetic_seasons(str(tmp_path), 2000, chunk_size=2000)
+
+    assert [os.path.basename(path) for path in paths] == ['nba_2018_2019_final_data.csv', 'nba_2019_2020_final_data.csv']
+    X, y = build_training_dataset(read_season_csv(paths[0]))
+    assert len(X) == games_per_season() and 0.5 < y.mean() < 0.65
@@ -0,0 +1,117 @@
+import functools
+import os
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from http_client import FetchClient  # noqa: E402
+from NBADataScraper import NBADataScraper  # noqa: E402
+from page_cache import current_season_end_year  # noqa: E402
+from team_stats_scraper import fetch_all_team_stats, parse_team_stats  # noqa: E402
+from team_stats_store import TEAM_STAT_FEATURES, TeamStatsStore, add_team_stat_features  # noqa: E402
+from teams import TEAM_INDEX  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class _CountingHandler(SimpleHTTPRequestHandler):
+    paths = []
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def team_server():
+    _CountingHandler.paths = []
+    handler = functools.partial(_CountingHandler, directory=FIXTURES_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", _CountingHandler.paths
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_team_stats_reads_ratings_from_summary_or_commented_table():
+    with open(os.path.join(FIXTURES_DIR, "teams", "BOS", "2024.html"), encoding="utf-8") as f:
+        html = f.read()
+
+    stats = parse_team_stats(html, "BOS", "2023-2024")
+    assert (stats["season"], stats["offensive_rating"], stats["defensive_rating"]) == (2024, "122.2", "110.6")
+
+    without_summary = parse_team_stats(html.replace("Off Rtg", "").replace("Def Rtg", ""), "BOS", 2024)
+    assert (without_summary["offensive_rating"], without_summary["defensive_rating"]) == ("122.2", "110.6")
+
+
+def test_fetch_all_team_stats_uses_store(team_server, tmp_path):
+    base_url, paths = team_server
+    store = TeamStatsStore(str(tmp_path))
+
+    first = fetch_all_team_stats(2024, client=FetchClient(), store=store, teams=["BOS", "LAL"],
+                                 requests_per_second=50, base_url=base_url)
+    assert first["BOS"]["offensive_rating"] == "122.2"
+    assert "error" in first["LAL"]  # no fixture: not stored
+    assert sorted(paths) == ["/teams/BOS/2024.html", "/teams/LAL/2024.html"]
+
+    paths.clear()
+    second = fetch_all_team_stats(2024, client=FetchClient(), store=store, teams=["BOS", "LAL"],
+                                  requests_per_second=50, base_url=base_url)
+    assert second["BOS"] == first["BOS"]
+    assert paths == ["/teams/LAL/2024.html"]
+
+
+def test_scraper_team_season_stats_go_through_the_store(team_server, tmp_path):
+    base_url, paths = team_server
+    store = TeamStatsStore(str(tmp_path))
+    # Every other team is already stored, so the season fetch only asks for BOS
+    store.put_many(2024, {team: {"team": team} for team in TEAM_INDEX.bbref_codes if team != "BOS"})
+    scraper = NBADataScraper(base_url=base_url, client=FetchClient(), team_stats_store=store)
+
+    stats = scraper.get_team_season_stats("BOS", "2023-2024")
+    assert stats == {"record": "64-18", "offensive_rating": "122.2", "defensive_rating": "110.6"}
+    assert paths == ["/teams/BOS/2024.html"]
+
+    paths.clear()
+    assert NBADataScraper(base_url=base_url, team_stats_store=store).get_team_season_stats("BOS", "2023-2024") == stats
+    assert paths == []
+
+
+def test_store_expires_only_current_season(tmp_path):
+    store = TeamStatsStore(str(tmp_path), ttl=0)
+    store.put(2024, "BOS", {"offensive_rating": "122.2"})
+    store.put(current_season_end_year(), "BOS", {"offensive_rating": "120.0"})
+
+    assert store.get(2024, "BOS") == {"offensive_rating": "122.2"}
+    assert store.get(current_season_end_year(), "BOS") is None
+
+
+def test_team_stat_features_use_previous_season(tmp_path):
+    store = TeamStatsStore(str(tmp_path))
+    store.put_many(2024, {
+        "BOS": {"offensive_rating": "122.0", "defensive_rating": "110.0"},
+        "LAL": {"offensive_rating": "114.0", "defensive_rating": "116.0"},
+    })
+    games = pd.DataFrame({
+        "Home/Neutral": ["Boston Celtics", "Los Angeles Lakers", "Boston Celtics"],
+        "Visitor/Neutral": ["Los Angeles Lakers", "Miami Heat", "Los Angeles Lakers"],
+        "__season_key": ["2024-2025", "2024-2025", "2023-2024"],
+    })
+
+    joined = add_team_stat_features(games, store)
+
+    assert list(joined.loc[0, TEAM_STAT_FEATURES]) == [4.0, -3.0, -4.0, 3.0, 14.0]
+    assert joined.loc[1, "away_off_rating"] == 0.0  # no stored stats: league average
+    assert (joined.loc[2, TEAM_STAT_FEATURES] == 0).all()  # 2022-23 stats not stored
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pandas as pd
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from ingest import prepare_season_frame  # noqa: E402
+from teams import TEAM_INDEX, UNKNOWN_TEAM_ID  # noqa: E402
+
+
+def test_every_spelling_resolves_to_one_id():
+    team_id = TEAM_INDEX.id('BKN')
+    assert team_id is not None
+    for key in ('BRK', 'Brooklyn Nets', ' brooklyn nets ', 'BROOKLYN NETS'):
+        assert TEAM_INDEX.id(key) == team_id
+    assert TEAM_INDEX.id('PHO') == TEAM_INDEX.id('PHX') == TEAM_INDEX.id('Phoenix Suns')
+    assert TEAM_INDEX.id('LA Clippers') == TEAM_INDEX.id('LAC')
+    assert TEAM_INDEX.id('Seattle SuperSonics') is None
+
+    assert TEAM_INDEX.nba_code(team_id) == 'BKN'
+    assert TEAM_INDEX.bbref_code(team_id) == 'BRK'
+    assert TEAM_INDEX.display_name(TEAM_INDEX.id('PHI')) == 'Philadelphia 76ers'
+    assert len(TEAM_INDEX) == 30 and len(set(TEAM_INDEX.nba_codes)) == 30
+
+
+def test_season_frames_carry_int_team_ids():
+    df = prepare_season_frame(pd.DataFrame({
+        'Date': ['Tue Oct 24 2023', 'Wed Oct 25 2023'],
+        'Visitor/Neutral': ['Los Angeles Lakers', 'Unknown Team'],
+        'Home/Neutral': ['Denver Nuggets', 'Charlotte Hornets'],
+        'Visitor_PTS': [107, 110],
+        'Home_PTS': [119, 116],
+    }))
+
+    assert df['home_id'].dtype == 'int8'
+    assert list(df['home_id']) == [TEAM_INDEX.id('DEN'), TEAM_INDEX.id('CHA')]
+    assert list(df['visitor_id']) == [TEAM_INDEX.id('LAL'), UNKNOWN_TEAM_ID]
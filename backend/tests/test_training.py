@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import train_model  # noqa: E402
+from train_model import build_training_dataset, create_dummy_model, fit_models, print_coefficients  # noqa: E402
+
+
+def test_fast_mode_matches_standard_training():
+    df = create_dummy_model()
+    seasons = np.where(df.index < 800, '2022-2023', '2023-2024')
+    X, y = build_training_dataset(df)
+
+    standard = fit_models(X, y, seasons)
+    fast = fit_models(X, y, seasons, fast=True)
+
+    assert fast['best_params'] == standard['best_params']
+    np.testing.assert_allclose(fast['model'].predict_proba(fast['X_test_scaled']),
+                               standard['model'].predict_proba(standard['X_test_scaled']), atol=1e-3)
+    # Collinear features leave coefficients loose within solver tolerance; predictions much less so
+    np.testing.assert_allclose(fast['coef_model'].predict_proba(fast['X_test_scaled']),
+                               standard['coef_model'].predict_proba(standard['X_test_scaled']), atol=1e-2)
+    for key, value in standard['time_split_metrics'].items():
+        assert abs(fast['time_split_metrics'][key] - value) < 1e-3
+
+
+def test_a_non_logistic_winner_keeps_the_logistic_baseline_apart(monkeypatch, capsys):
+    df = create_dummy_model()
+    X, y = build_training_dataset(df)
+    winner_params = {'learning_rate': 0.1, 'max_leaf_nodes': 15}
+
+    def search_model_families(X_train, y_train, baseline, **kwargs):
+        return {'winner': 'hist_gradient_boosting', 'model': baseline[1], 'budget_seconds': 1,
+                'elapsed_seconds': 1, 'candidates': [
+                    {'family': 'logistic', 'params': None, 'validation_accuracy': 0.6, 'p99_ms': 1.0},
+                    {'family': 'hist_gradient_boosting', 'params': winner_params, 'n_candidates': 3,
+                     'validation_accuracy': 0.7, 'p99_ms': 1.0}]}
+
+    monkeypatch.setattr(train_model, 'search_model_families', search_model_families)
+    fitted = fit_models(X, y, search_budget=1)
+
+    assert fitted['model_family'] == 'hist_gradient_boosting'
+    assert fitted['model_params'] == winner_params and 'C' in fitted['best_params']
+    print_coefficients(X.columns, fitted['coef_model'], fitted['model_family'])
+    assert 'Top 10 Logistic Regression Coefficients' not in capsys.readouterr().out
@@ -0,0 +1,69 @@
+import os
+import pstats
+import shutil
+import sys
+
+import numpy as np
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from feature_store import FeatureStore  # noqa: E402
+from train_model import build_training_dataset, create_dummy_model, fit_models, load_training_matrices  # noqa: E402
+from training_profile import StageProfiler  # noqa: E402
+
+
+def test_stages_record_time_memory_and_the_slowest_profile(tmp_path):
+    profiler = StageProfiler(cprofile=True)
+    with profiler.stage('allocate'):
+        block = np.ones((4096, 4096))  # 128 MiB
+        block.sum()
+    del block
+    with profiler.stage('idle'):
+        pass
+
+    allocate, idle = profiler.stages
+    assert allocate['wall_seconds'] > idle['wall_seconds']
+    assert allocate['cpu_seconds'] > 0
+    if profiler.peak_rss_scope == 'stage':
+        assert allocate['peak_rss_mb'] - idle['peak_rss_mb'] > 100
+
+    path = tmp_path / 'slowest.prof'
+    assert profiler.dump_slowest(str(path)) == 'allocate'
+    assert pstats.Stats(str(path)).total_calls > 0
+    report = profiler.report()
+    assert report['slowest_stage'] == 'allocate'
+    assert report['peak_rss_mb'] == allocate['peak_rss_mb']
+
+
+def test_fit_models_records_every_stage_on_the_profiler():
+    df = create_dummy_model()
+    X, y = build_training_dataset(df)
+    profiler = StageProfiler()
+
+    fitted = fit_models(X, y, np.where(df.index < 800, '2022-2023', '2023-2024'), fast=True, profiler=profiler)
+
+    assert [record['stage'] for record in profiler.stages] == [
+        'prepare', 'search', 'calibrate', 'coefficients', 'evaluate', 'time_split']
+    assert fitted['timings'] == profiler.timings()
+
+
+def test_loading_records_csv_reads_apart_from_feature_building(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for name in ('nba_2022_2023_final_data.csv', 'nba_2023_2024_final_data.csv'):
+        shutil.copy(os.path.join(BACKEND_DIR, 'data', name), data_dir / name)
+    store = FeatureStore(str(tmp_path / 'features'))
+
+    profiler = StageProfiler()
+    X, y, seasons = load_training_matrices(str(tmp_path), feature_store=store, profiler=profiler)
+    assert [record['stage'] for record in profiler.stages] == [
+        'feature_store', 'load_csv', 'build_features', 'stack_seasons']
+    assert store.rebuilt == 2 and sorted(set(seasons)) == ['2022-2023', '2023-2024']
+
+    # Current seasons come straight from the store; no CSV is read
+    cached = load_training_matrices(str(tmp_path), feature_store=store)
+    assert store.hits == 2 and store.rebuilt == 2
+    assert (cached[0].to_numpy() == X.to_numpy()).all() and (cached[1] == y).all()
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, LogisticRegressionCV
+from sklearn.base import clone
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
@@ -11,59 +12,22 @@ import os
 import glob
 import re
 import json
+import argparse
+import warnings
 from datetime import datetime
-
-def create_dummy_model():
-    """Create a dummy model if no training data is available"""
+from ratings import add_rating_features, RATING_FEATURES
+from team_stats_store import TeamStatsStore, TEAM_STAT_FEATURES, add_team_stat_features, season_end_year
+from team_stats_scraper import fetch_all_team_stats
+from season_loader import TRAINING_COLUMNS, load_seasons, read_season_csvs
+from model_bundle import BUNDLE_FORMAT_VERSION, save_bundle
+from model_search import search_model_families
+from training_profile import StageProfiler
+from synthetic_games import synthetic_seasons
+
+def create_dummy_model(n_samples=1000):
+    """Synthetic season-schema games (see synthetic_games.py) if no training data is available"""
     print("Creating dummy model with synthetic data...")
-    
-    # Generate synthetic training data
-    np.random.seed(42)
-    n_samples = 1000
-    
-    # Create features that somewhat represent real basketball stats
-    features = {
-        'home_win_pct': np.random.beta(2, 2, n_samples),  # Win percentages tend to cluster around 0.5
-        'away_win_pct': np.random.beta(2, 2, n_samples),
-        'home_recent_win_pct': np.random.beta(2, 2, n_samples),
-        'away_recent_win_pct': np.random.beta(2, 2, n_samples),
-        'home_wins': np.random.poisson(40, n_samples),
-        'home_losses': np.random.poisson(35, n_samples),
-        'away_wins': np.random.poisson(40, n_samples),
-        'away_losses': np.random.poisson(35, n_samples),
-        'home_recent_losses': np.random.poisson(3, n_samples),
-        'away_recent_losses': np.random.poisson(3, n_samples),
-        'matchup_home_wins': np.random.poisson(2, n_samples),
-        'matchup_away_wins': np.random.poisson(2, n_samples),
-    }
-    
-    df = pd.DataFrame(features)
-    
-    # Add derived features
-    df['win_pct_diff'] = df['home_win_pct'] - df['away_win_pct']
-    df['recent_win_pct_diff'] = df['home_recent_win_pct'] - df['away_recent_win_pct']
-    df['matchup_total'] = df['matchup_home_wins'] + df['matchup_away_wins']
-    df['games_diff'] = (df['home_wins'] + df['home_losses']) - (df['away_wins'] + df['away_losses'])
-    df['recent_momentum'] = df['home_recent_win_pct'] - df['away_recent_win_pct']
-    df['matchup_home_advantage'] = np.where(
-        df['matchup_total'] > 0,
-        df['matchup_home_wins'] / df['matchup_total'],
-        0.5
-    )
-    
-    # Create target variable with some logic (home team advantage + win percentage advantage)
-    home_advantage = 0.1  # 10% home court advantage
-    prob_home_win = (
-        home_advantage + 
-        0.3 * df['win_pct_diff'] + 
-        0.2 * df['recent_win_pct_diff'] +
-        0.1 * (df['matchup_home_advantage'] - 0.5)
-    ).clip(0.1, 0.9)  # Keep probabilities reasonable
-    
-    # Generate binary outcomes based on probabilities
-    df['home_win'] = np.random.binomial(1, prob_home_win)
-    
-    return df
+    return pd.concat([frame for _, frame in synthetic_seasons(n_samples)], ignore_index=True)
 
 
 def _resolve_training_files(base_dir):
@@ -89,8 +53,16 @@ def _coalesce_columns(df, candidates, default=0):
     return pd.Series(default, index=df.index, dtype='float64')
 
 
-def build_training_dataset(df):
-    """Build model features in the exact schema expected by backend/model_utils.py."""
+def build_training_dataset(df, include_ratings=False, include_team_stats=False):
+    """
+    Build model features in the exact schema expected by backend/model_utils.py.
+
+    With ``include_ratings`` the pre-game Massey ratings (see ratings.py) are
+    appended as extra features, computed here unless ``df`` already has them.
+    With ``include_team_stats`` the previous season's offensive/defensive
+    ratings (see team_stats_store.py) are appended, joined from the stats
+    store unless ``df`` already has them.
+    """
     home_wins = _coalesce_columns(df, ['home_wins', 'Wins (Home)'], default=0)
     home_losses = _coalesce_columns(df, ['home_losses', 'Losses (Home)'], default=0)
     away_wins = _coalesce_columns(df, ['away_wins', 'Wins (Visitor)', 'visitor_wins'], default=0)
@@ -143,6 +115,18 @@ def build_training_dataset(df):
         'matchup_home_advantage': matchup_home_advantage,
     }).fillna(0)
 
+    if include_ratings:
+        if not set(RATING_FEATURES).issubset(df.columns):
+            df = add_rating_features(df)
+        for col in RATING_FEATURES:
+            X[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    if include_team_stats:
+        if not set(TEAM_STAT_FEATURES).issubset(df.columns):
+            df = add_team_stat_features(df, TeamStatsStore())
+        for col in TEAM_STAT_FEATURES:
+            X[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
     # Derive binary label if not already present.
     if 'home_win' in df.columns:
         y = pd.to_numeric(df['home_win'], errors='coerce').fillna(0).astype(int)
@@ -181,65 +165,72 @@ def _print_metrics(title, y_true, y_pred, y_prob):
         'home_win_rate_predicted': float(round(float(np.mean(y_pred)), 6)),
     }
 
-def train_model():
-    """Train the prediction model"""
-    print("🤖 Training NBA prediction model...")
-
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    season_files = _resolve_training_files(base_dir)
-
-    # Load and concatenate all available real seasons for broader generalization.
-    df = None
-    if season_files:
-        frames = []
-        for file_path in season_files:
-            try:
-                print(f"Loading data from {file_path}")
-                frame = pd.read_csv(file_path)
-                frame['__season_key'] = _extract_season_from_path(file_path)
-                frames.append(frame)
-            except Exception as e:
-                print(f"Failed to load {file_path}: {e}")
-        if frames:
-            df = pd.concat(frames, ignore_index=True)
 
-    # If no usable data is found, back off to synthetic training data.
-    if df is None or df.empty:
-        df = create_dummy_model()
+# Hyperparameter grid for logistic regression, searched with 5 shuffled folds.
+PARAM_GRID = {
+    'C': [0.01, 0.1, 1.0, 3.0, 10.0],
+    'class_weight': [None, 'balanced'],
+    'solver': ['lbfgs']
+}
 
-    X, y = build_training_dataset(df)
-    
-    print(f"Training with {len(X)} samples and {X.shape[1]} features")
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
-    
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Hyperparameter tuning for logistic regression.
-    param_grid = {
-        'C': [0.01, 0.1, 1.0, 3.0, 10.0],
-        'class_weight': [None, 'balanced'],
-        'solver': ['lbfgs']
-    }
 
+def _search_grid(X_train_scaled, y_train, folds):
+    """Cold-start GridSearchCV over PARAM_GRID; returns best params (no coefficient model)."""
     grid = GridSearchCV(
         LogisticRegression(max_iter=5000, random_state=42),
-        param_grid=param_grid,
+        param_grid=PARAM_GRID,
         scoring='roc_auc',
-        cv=StratifiedKFold(n_splits=5, shuffle=True, random_state=42),
+        cv=folds,
         n_jobs=-1,
         refit=True,
     )
     grid.fit(X_train_scaled, y_train)
-    best_params = grid.best_params_
+    return grid.best_params_, None
+
+
+def _search_path(X_train_scaled, y_train, folds):
+    """
+    Search PARAM_GRID with one warm-started regularization path per class weight.
+
+    LogisticRegressionCV walks the C grid on each fold starting from the
+    previous C's solution, then refits the best C on all rows, so the refit
+    doubles as the coefficient model. Ties break like GridSearchCV: lowest C
+    first, then class_weight order.
+    """
+    Cs = PARAM_GRID['C']
+    mean_scores = np.empty((len(Cs), len(PARAM_GRID['class_weight'])))
+    path_models = []
+    for j, class_weight in enumerate(PARAM_GRID['class_weight']):
+        with warnings.catch_warnings():
+            # Newer scikit-learn warns about upcoming LogisticRegressionCV attribute changes
+            warnings.simplefilter('ignore', FutureWarning)
+            path = LogisticRegressionCV(
+                Cs=Cs,
+                cv=folds,
+                scoring='roc_auc',
+                solver=PARAM_GRID['solver'][0],
+                class_weight=class_weight,
+                max_iter=5000,
+                random_state=42,
+                refit=True,
+            )
+            path.fit(X_train_scaled, y_train)
+        scores = path.scores_
+        scores = scores[path.classes_[1]] if isinstance(scores, dict) else scores
+        mean_scores[:, j] = np.asarray(scores).reshape(len(folds), len(Cs)).mean(axis=0)
+        path_models.append(path)
+
+    best_c, best_weight = np.unravel_index(np.argmax(mean_scores), mean_scores.shape)
+    best_params = {
+        'C': Cs[best_c],
+        'class_weight': PARAM_GRID['class_weight'][best_weight],
+        'solver': PARAM_GRID['solver'][0],
+    }
+    return best_params, path_models[best_weight]
 
-    # Fit a calibrated logistic regression model to improve probability reliability.
+
+def _calibrated_logit(best_params, cv=5):
+    """Sigmoid-calibrated logistic regression with the searched params."""
     base_logit = LogisticRegression(
         C=best_params['C'],
         class_weight=best_params['class_weight'],
@@ -247,113 +238,377 @@ def train_model():
         max_iter=5000,
         random_state=42,
     )
-
-    model = CalibratedClassifierCV(
+    return CalibratedClassifierCV(
         estimator=base_logit,
         method='sigmoid',
-        cv=5,
+        cv=cv,
     )
-    model.fit(X_train_scaled, y_train)
+
+
+def _print_search(model_search):
+    print(f"\n🔎 Model family search ({model_search['elapsed_seconds']:.0f}s of {model_search['budget_seconds']:.0f}s budget)")
+    print(f"{'family':<26}{'candidates':>11}{'val acc':>10}{'p99 ms':>9}")
+    for candidate in model_search['candidates']:
+        if 'skipped' in candidate:
+            print(f"{candidate['family']:<26}  skipped: {candidate['skipped']}")
+            continue
+        print(f"{candidate['family']:<26}{candidate.get('n_candidates', '-'):>11}"
+              f"{candidate['validation_accuracy']:>10.3f}{candidate['p99_ms']:>9.2f}")
+    print(f"Winner: {model_search['winner']}")
+
+
+def fit_models(X, y, seasons=None, fast=False, search_budget=None, n_jobs=-1, profiler=None):
+    """
+    Search, fit and evaluate the calibrated model on a built training set.
+
+    ``seasons`` labels each row with its season ('2023-2024'); with two or
+    more seasons the latest one is also held out and evaluated. Features are
+    row-wise, so the holdout rows are a slice of ``X``.
+
+    The default mode runs the original cold-start pipeline: a 50-fit grid
+    search, the calibrated model and a separate coefficient model. ``fast``
+    searches with warm-started regularization paths and takes coefficients
+    from the path's refit instead of fitting them again. Calibration and the
+    time split are fitted as in the default mode, on their own folds, so
+    both modes give the same params and, within solver tolerance, the same
+    model.
+
+    With ``search_budget`` (seconds) the calibrated logistic model then
+    competes with other model families in a time-budgeted successive-halving
+    search (see model_search.py). The search chooses on a validation split
+    of the training rows and p99 latency, and its winner is the returned
+    model, so the random split metrics stay a clean test of it.
+
+    Returns:
+        dict: model, model_family, scaler, coef_model, best_params, both
+        metric dicts and the test split, the family search report (or None)
+        under ``model_search``, plus per-stage wall times under ``timings``.
+        Stages are recorded on ``profiler`` (a StageProfiler) when given.
+    """
+    profiler = profiler or StageProfiler()
+
+    with profiler.stage('prepare'):
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
+
+        # Scale features
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+
+        search_cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+        if fast:
+            # The path search reads per-fold scores, so it needs the split materialized
+            search_cv = list(search_cv.split(X_train_scaled, y_train))
+
+    # Hyperparameter tuning for logistic regression.
+    with profiler.stage('search'):
+        if fast:
+            best_params, coef_model = _search_path(X_train_scaled, y_train, search_cv)
+        else:
+            best_params, coef_model = _search_grid(X_train_scaled, y_train, search_cv)
+
+    # Fit a calibrated logistic regression model to improve probability reliability.
+    with profiler.stage('calibrate'):
+        model = _calibrated_logit(best_params)
+        model.fit(X_train_scaled, y_train)
 
     # Fit an interpretable baseline model with the same params for coefficient reporting.
-    coef_model = LogisticRegression(
-        C=best_params['C'],
-        class_weight=best_params['class_weight'],
-        solver=best_params['solver'],
-        max_iter=5000,
-        random_state=42,
-    )
-    coef_model.fit(X_train_scaled, y_train)
-    
+    with profiler.stage('coefficients'):
+        if coef_model is None:
+            coef_model = LogisticRegression(
+                C=best_params['C'],
+                class_weight=best_params['class_weight'],
+                solver=best_params['solver'],
+                max_iter=5000,
+                random_state=42,
+            )
+            coef_model.fit(X_train_scaled, y_train)
+
+    model_family = 'logistic'
+    model_search = None
+    if search_budget:
+        with profiler.stage('family_search'):
+            model_search = search_model_families(
+                X_train_scaled, y_train,
+                budget_seconds=search_budget, n_jobs=n_jobs, baseline=(model_family, model),
+            )
+            model, model_family = model_search.pop('model'), model_search['winner']
+        _print_search(model_search)
+
+    # best_params stay the logistic baseline's; model_params are the served family's
+    model_params = best_params
+    if model_family != 'logistic':
+        model_params = next(c['params'] for c in model_search['candidates'] if c['family'] == model_family)
+
     # Evaluate
-    y_pred = model.predict(X_test_scaled)
-    y_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
-    
+    with profiler.stage('evaluate'):
+        y_pred = model.predict(X_test_scaled)
+        y_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
+
     random_split_metrics = _print_metrics("Random Split Performance", y_test, y_pred, y_pred_proba)
-    print(f"Best Params: {best_params}")
+    if model_family == 'logistic':
+        print(f"Best Params: {best_params}")
+    else:
+        print(f"Serving {model_family} with params {model_params} (logistic baseline params: {best_params})")
     print(f"Home team win rate in test set: {y_test.mean():.3f}")
     print(f"Predicted home win rate: {y_pred.mean():.3f}")
 
     time_split_metrics = None
-    if '__season_key' in df.columns:
-        season_values = sorted([s for s in df['__season_key'].dropna().unique() if s])
-        if len(season_values) >= 2:
-            holdout_season = season_values[-1]
-            train_df = df[df['__season_key'] != holdout_season].copy()
-            holdout_df = df[df['__season_key'] == holdout_season].copy()
-
-            if not train_df.empty and not holdout_df.empty:
-                X_time_train, y_time_train = build_training_dataset(train_df)
-                X_time_test, y_time_test = build_training_dataset(holdout_df)
-
-                time_scaler = StandardScaler()
-                X_time_train_scaled = time_scaler.fit_transform(X_time_train)
-                X_time_test_scaled = time_scaler.transform(X_time_test)
-
-                time_base = LogisticRegression(
-                    C=best_params['C'],
-                    class_weight=best_params['class_weight'],
-                    solver=best_params['solver'],
-                    max_iter=5000,
-                    random_state=42,
-                )
-                time_model = CalibratedClassifierCV(
-                    estimator=time_base,
-                    method='sigmoid',
-                    cv=5,
-                )
-                time_model.fit(X_time_train_scaled, y_time_train)
-
-                time_pred = time_model.predict(X_time_test_scaled)
-                time_prob = time_model.predict_proba(X_time_test_scaled)[:, 1]
-
-                print(f"\n🕒 Time-Based Holdout Season: {holdout_season}")
-                time_split_metrics = _print_metrics(
-                    "Latest-Season Holdout Performance",
-                    y_time_test,
-                    time_pred,
-                    time_prob,
-                )
-    
+    with profiler.stage('time_split'):
+        if seasons is not None:
+            seasons = pd.Series(seasons, index=X.index)
+            season_values = sorted([s for s in seasons.dropna().unique() if s])
+            if len(season_values) >= 2:
+                holdout_season = season_values[-1]
+                holdout_mask = (seasons == holdout_season).to_numpy()
+
+                if holdout_mask.any() and not holdout_mask.all():
+                    X_time_train, y_time_train = X[~holdout_mask], y[~holdout_mask]
+                    X_time_test, y_time_test = X[holdout_mask], y[holdout_mask]
+
+                    time_scaler = StandardScaler()
+                    X_time_train_scaled = time_scaler.fit_transform(X_time_train)
+                    X_time_test_scaled = time_scaler.transform(X_time_test)
+
+                    time_model = _calibrated_logit(best_params) if model_family == 'logistic' else clone(model)
+                    time_model.fit(X_time_train_scaled, y_time_train)
+
+                    time_pred = time_model.predict(X_time_test_scaled)
+                    time_prob = time_model.predict_proba(X_time_test_scaled)[:, 1]
+
+                    print(f"\n🕒 Time-Based Holdout Season: {holdout_season}")
+                    time_split_metrics = _print_metrics(
+                        "Latest-Season Holdout Performance",
+                        y_time_test,
+                        time_pred,
+                        time_prob,
+                    )
+
+    return {
+        'model': model,
+        'model_family': model_family,
+        'scaler': scaler,
+        'coef_model': coef_model,
+        'best_params': best_params,
+        'model_params': model_params,
+        'random_split_metrics': random_split_metrics,
+        'time_split_metrics': time_split_metrics,
+        'X_test_scaled': X_test_scaled,
+        'model_search': model_search,
+        'timings': profiler.timings(),
+    }
+
+
+# model_metadata.json entries owned by backtest.py and online_model.py, kept across retrains.
+RETAINED_METADATA_KEYS = ('backtest', 'online')
+
+
+def write_model_metadata(metadata, metadata_path):
+    """Replace model_metadata.json atomically."""
+    tmp_path = f"{metadata_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, metadata_path)
+
+
+def update_model_metadata(updates, metadata_path):
+    """Merge ``updates`` into model_metadata.json atomically, keeping every other key."""
+    metadata = {}
+    if os.path.exists(metadata_path):
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    metadata.update(updates)
+    write_model_metadata(metadata, metadata_path)
+    return metadata
+
+
+def write_retrained_metadata(metadata, metadata_path):
+    """
+    Replace model_metadata.json after a retrain, carrying over RETAINED_METADATA_KEYS.
+
+    Backtest results and the online learner's block (with its ``previous_*``
+    rollback pointers) are written by other tools and survive a retrain.
+    """
+    previous = {}
+    if os.path.exists(metadata_path):
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    retained = {key: previous[key] for key in RETAINED_METADATA_KEYS if key in previous}
+    write_model_metadata({**retained, **metadata}, metadata_path)
+
+
+def save_model_artifacts(base_dir, model, scaler, feature_names):
+    """
+    Write model.pkl/scaler.pkl, timestamped copies of both and a bundle of them.
+
+    Returns:
+        dict: the model_metadata.json entries naming the files.
+    """
     # Save model and scaler
-    model_path = os.path.join(base_dir, 'model.pkl')
-    scaler_path = os.path.join(base_dir, 'scaler.pkl')
-    joblib.dump(model, model_path)
-    joblib.dump(scaler, scaler_path)
+    joblib.dump(model, os.path.join(base_dir, 'model.pkl'))
+    joblib.dump(scaler, os.path.join(base_dir, 'scaler.pkl'))
 
     # Save timestamped artifacts for reproducibility and rollback.
     version_tag = datetime.now().strftime('%Y_%m_%d_%H%M%S')
     versioned_model_name = f'model_{version_tag}.pkl'
     versioned_scaler_name = f'scaler_{version_tag}.pkl'
-    versioned_model_path = os.path.join(base_dir, versioned_model_name)
-    versioned_scaler_path = os.path.join(base_dir, versioned_scaler_name)
-    joblib.dump(model, versioned_model_path)
-    joblib.dump(scaler, versioned_scaler_path)
+    joblib.dump(model, os.path.join(base_dir, versioned_model_name))
+    joblib.dump(scaler, os.path.join(base_dir, versioned_scaler_name))
 
-    metadata = {
-        'created_at': datetime.now().isoformat(),
+    # Scaler, model and feature schema in one memory-mappable, checksummed file
+    bundle_file, bundle_sha256 = save_bundle(base_dir, model, scaler, feature_names,
+                                             name=f'model_bundle_{version_tag}.joblib')
+    return {
         'model_file': versioned_model_name,
         'scaler_file': versioned_scaler_name,
+        'bundle_file': bundle_file,
+        'bundle_sha256': bundle_sha256,
+        'bundle_format_version': BUNDLE_FORMAT_VERSION,
+    }
+
+
+def print_saved_artifacts(base_dir, files):
+    print(f"\n💾 Model saved:")
+    for name in ('model.pkl', 'scaler.pkl', files['model_file'], files['scaler_file'], files['bundle_file']):
+        print(f"- {name} ({os.path.getsize(os.path.join(base_dir, name))/1024:.1f} KB)")
+    print(f"- model_metadata.json")
+
+
+def load_training_frame(base_dir):
+    """Concatenate every season CSV under ``base_dir``/data, tagged with __season_key."""
+    season_files = _resolve_training_files(base_dir)
+
+    # Load and concatenate all available real seasons for broader generalization.
+    df = None
+    if season_files:
+        print(f"Loading {len(season_files)} season files from {os.path.dirname(season_files[0])}")
+        df = load_seasons(season_files, [_extract_season_from_path(path) for path in season_files],
+                          TRAINING_COLUMNS, skip_errors=True)
+
+    # If no usable data is found, back off to synthetic training data.
+    if df is None or df.empty:
+        df = create_dummy_model()
+
+    return df
+
+
+def prefetch_team_stats(season_files):
+    """Each season is joined with the season before it, so fetch those into the stats store."""
+    stats_store = TeamStatsStore()
+    for season in sorted({season_end_year(_extract_season_from_path(path)) - 1 for path in season_files}):
+        fetch_all_team_stats(season, store=stats_store)
+
+
+def load_training_matrices(base_dir, use_ratings=False, use_team_stats=False, feature_store=None, profiler=None):
+    """
+    Training features, labels and per-row season for every season CSV.
+
+    Season matrices come from the on-disk feature store, which only rebuilds
+    seasons whose CSV (or feature schema) changed. Without any CSVs the
+    synthetic dataset is built directly. Reading the store, reading the
+    stale CSVs, building their features and stacking the seasons are
+    separate stages on ``profiler`` when given.
+    """
+    # Imported here: feature_store builds on build_training_dataset above
+    from feature_store import FeatureStore, stack_seasons
+
+    profiler = profiler or StageProfiler()
+    season_files = _resolve_training_files(base_dir)
+    if not season_files:
+        with profiler.stage('generate_synthetic'):
+            df = create_dummy_model()
+        with profiler.stage('build_features'):
+            X, y = build_training_dataset(df, include_ratings=use_ratings, include_team_stats=use_team_stats)
+        return X, y, None
+
+    if use_team_stats:
+        with profiler.stage('prefetch_team_stats'):
+            prefetch_team_stats(season_files)
+
+    store = feature_store or FeatureStore()
+    with profiler.stage('feature_store'):
+        matrices = {path: store.lookup(path, use_ratings, use_team_stats) for path in season_files}
+    stale = [path for path, matrix in matrices.items() if matrix is None]
+    with profiler.stage('load_csv'):
+        frames = read_season_csvs(stale, TRAINING_COLUMNS)
+    with profiler.stage('build_features'):
+        for path, frame in zip(stale, frames):
+            matrices[path] = store.build(path, frame, use_ratings, use_team_stats)
+    print(f"Feature store: {store.hits} seasons loaded, {store.rebuilt} rebuilt")
+    with profiler.stage('stack_seasons'):
+        X, y, seasons = stack_seasons({_extract_season_from_path(path): matrix for path, matrix in matrices.items()})
+    return X, y, seasons
+
+
+def train_model(use_ratings=False, use_team_stats=False, fast=False, search_budget=None, n_jobs=-1,
+                cprofile_path=None):
+    """
+    Train the prediction model.
+
+    Every stage's wall time, CPU time and peak RSS go under ``profile`` in
+    model_metadata.json. With ``cprofile_path`` the stages also run under
+    cProfile and the slowest one's stats are written there.
+    """
+    print("🤖 Training NBA prediction model...")
+
+    profiler = StageProfiler(cprofile=bool(cprofile_path))
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    X, y, seasons = load_training_matrices(base_dir, use_ratings, use_team_stats, profiler=profiler)
+    
+    print(f"Training with {len(X)} samples and {X.shape[1]} features")
+    
+    fitted = fit_models(X, y, seasons, fast=fast, search_budget=search_budget, n_jobs=n_jobs,
+                        profiler=profiler)
+    model, scaler, coef_model = fitted['model'], fitted['scaler'], fitted['coef_model']
+    best_params = fitted['best_params']
+    random_split_metrics = fitted['random_split_metrics']
+    time_split_metrics = fitted['time_split_metrics']
+    
+    with profiler.stage('save_artifacts'):
+        files = save_model_artifacts(base_dir, model, scaler, X.columns)
+
+    profile = profiler.report()
+    if cprofile_path:
+        profiler.dump_slowest(cprofile_path)
+        profile['cprofile_file'] = os.path.abspath(cprofile_path)
+
+    metadata = {
+        'created_at': datetime.now().isoformat(),
+        **files,
         'feature_count': int(X.shape[1]),
+        'feature_names': list(X.columns),
         'samples': int(len(X)),
+        # The logistic baseline's params, which backtest.py and online_model.py refit
         'best_params': best_params,
+        'model_params': fitted['model_params'],
+        'training_mode': 'fast' if fast else 'standard',
+        'model_family': fitted['model_family'],
         'random_split_metrics': random_split_metrics,
         'time_split_metrics': time_split_metrics,
     }
-    metadata_path = os.path.join(base_dir, 'model_metadata.json')
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2)
+    if fitted['model_search'] is not None:
+        metadata['model_search'] = fitted['model_search']
+    metadata['profile'] = profile
+    write_retrained_metadata(metadata, os.path.join(base_dir, 'model_metadata.json'))
+    print_saved_artifacts(base_dir, files)
+    profiler.print_report()
+
+    print_coefficients(X.columns, coef_model, fitted['model_family'])
     
-    print(f"\n💾 Model saved:")
-    print(f"- model.pkl ({os.path.getsize(model_path)/1024:.1f} KB)")
-    print(f"- scaler.pkl ({os.path.getsize(scaler_path)/1024:.1f} KB)")
-    print(f"- {versioned_model_name} ({os.path.getsize(versioned_model_path)/1024:.1f} KB)")
-    print(f"- {versioned_scaler_name} ({os.path.getsize(versioned_scaler_path)/1024:.1f} KB)")
-    print(f"- model_metadata.json")
+    return model, scaler
+
+
+def print_coefficients(feature_names, coef_model, model_family='logistic'):
+    """Show coefficient magnitude to help interpret linear model behavior."""
+    if model_family != 'logistic':
+        print(f"\nℹ️ Serving {model_family}; logistic coefficients describe the baseline only and are not shown")
+        return
 
-    # Show coefficient magnitude to help interpret linear model behavior.
     coef_df = pd.DataFrame({
-        'feature': X.columns,
+        'feature': feature_names,
         'coefficient': coef_model.coef_[0],
         'abs_coefficient': np.abs(coef_model.coef_[0])
     }).sort_values('abs_coefficient', ascending=False)
@@ -361,12 +616,26 @@ def train_model():
     print("\n🎯 Top 10 Logistic Regression Coefficients (by magnitude):")
     for _, row in coef_df.head(10).iterrows():
         print(f"  {row['feature']}: {row['coefficient']:.4f}")
-    
-    return model, scaler
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the NBA game prediction model")
+    parser.add_argument('--with-ratings', action='store_true',
+                        help="Add pre-game Massey ratings as model features")
+    parser.add_argument('--with-team-stats', action='store_true',
+                        help="Add previous-season offensive/defensive ratings (fetched and cached) as features")
+    parser.add_argument('--fast', action='store_true',
+                        help="Search with warm-started regularization paths and reuse the path refit for coefficients")
+    parser.add_argument('--search-budget', type=float, metavar='SECONDS',
+                        help="Also search HistGradientBoosting and regularized logistic variants with "
+                             "successive halving in this many seconds, serving the winner")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Parallel fits in the family search (-1: all cores)")
+    parser.add_argument('--cprofile', metavar='PATH',
+                        help="Run each stage under cProfile and write the slowest stage's stats to PATH")
+    args = parser.parse_args()
+
     try:
-        train_model()
+        train_model(use_ratings=args.with_ratings, use_team_stats=args.with_team_stats, fast=args.fast,
+                    search_budget=args.search_budget, n_jobs=args.n_jobs, cprofile_path=args.cprofile)
         print("\n✅ Model training completed successfully!")
     except Exception as e:
         print(f"\n❌ Training failed: {str(e)}")
@@ -0,0 +1,110 @@
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import resource
+import sys
+import time
+
+
+def _reset_peak_rss():
+    """Reset the kernel's RSS high-water mark (Linux 4.0+); False where that isn't possible."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+class StageProfiler:
+    """
+    Wall time, CPU time and peak RSS for named pipeline stages.
+
+    Peak RSS is per stage where the kernel lets the high-water mark be reset
+    (``peak_rss_scope`` 'stage'); elsewhere it is the process peak so far.
+    CPU time is this process's, so joblib worker processes aren't included.
+    With ``cprofile`` every stage also runs under cProfile and the slowest
+    stage's stats are kept for ``dump_slowest``; the profiler's overhead
+    then shows in the timings too.
+    """
+
+    def __init__(self, cprofile=False):
+        self.cprofile = cprofile
+        self.stages = []
+        self.peak_rss_scope = 'stage' if _reset_peak_rss() else 'process'
+        self._profiles = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if self.peak_rss_scope == 'stage':
+            _reset_peak_rss()
+        profile = cProfile.Profile() if self.cprofile else None
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._profiles[name] = profile
+            self.stages.append({
+                'stage': name,
+                'wall_seconds': round(time.perf_counter() - wall, 4),
+                'cpu_seconds': round(time.process_time() - cpu, 4),
+                'peak_rss_mb': round(_peak_rss_mb(), 1),
+            })
+
+    def timings(self):
+        """Wall seconds per stage, the shape fit_models has always returned."""
+        return {record['stage']: record['wall_seconds'] for record in self.stages}
+
+    def slowest(self):
+        return max(self.stages, key=lambda record: record['wall_seconds'])['stage'] if self.stages else None
+
+    def dump_slowest(self, path, top=15):
+        """Write the slowest stage's cProfile stats to ``path`` and print its top functions."""
+        name = self.slowest()
+        profile = self._profiles.get(name)
+        if profile is None:
+            return None
+        profile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(top)
+        print(f"\n🔬 cProfile of the slowest stage ({name}), saved to {path}:")
+        print(out.getvalue())
+        return name
+
+    def report(self):
+        """The 'profile' entry for model_metadata.json."""
+        return {
+            'stages': self.stages,
+            'total_wall_seconds': round(sum(record['wall_seconds'] for record in self.stages), 4),
+            'total_cpu_seconds': round(sum(record['cpu_seconds'] for record in self.stages), 4),
+            'peak_rss_mb': max((record['peak_rss_mb'] for record in self.stages), default=None),
+            'peak_rss_scope': self.peak_rss_scope,
+            'slowest_stage': self.slowest(),
+            'cpu_count': os.cpu_count(),
+        }
+
+    def print_report(self):
+        print(f"\n⏱️ Training profile (peak RSS per {self.peak_rss_scope})")
+        print(f"{'stage':<24}{'wall s':>9}{'cpu s':>9}{'peak MiB':>10}")
+        for record in self.stages:
+            print(f"{record['stage']:<24}{record['wall_seconds']:9.3f}{record['cpu_seconds']:9.3f}"
+                  f"{record['peak_rss_mb']:10.1f}")